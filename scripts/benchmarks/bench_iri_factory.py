@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Benchmark: TTL instance IRIs, per-reference slugging vs ``IriFactory``.
+
+Replays the reference pattern of the Option-C TTL export (Shipment, Case,
+Flow, CaseEvent and Location IRIs, each entity referenced from several
+blocks) once with the uncached ``iri()`` helper and once with ``IriFactory``.
+References must be identical; the factory must run the slug regexes exactly
+once per distinct key segment.
+
+Usage:
+  python scripts/benchmarks/bench_iri_factory.py --shipments 20000 --cases 3 --events 6
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Iterator, Tuple
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(REPO_ROOT / "scripts" / "etl"))
+
+import iri_factory  # noqa: E402
+
+BASE = "https://example.com/hvdc"
+LOCATIONS = ["DSV Indoor", "DSV Outdoor", "MOSB", "AGI", "DAS", "MIR", "SHU", "Khalifa Port", "Mina Zayed"]
+
+
+def _refs(shipments: int, cases: int, events: int, seed: int) -> Iterator[Tuple[str, ...]]:
+    rnd = random.Random(seed)
+    for i in range(shipments):
+        code = f"HVDC-ADOPT-SCT-{i:05d}"
+        yield ("Shipment", code)
+        for c in range(1, cases + 1):
+            case_no = str(c)
+            # case block + shipment back-link, flow block + case link
+            yield ("Case", code, case_no)
+            yield ("Shipment", code)
+            yield ("Shipment", code)
+            yield ("Case", code, case_no)
+            yield ("Flow", code, case_no)
+            yield ("Case", code, case_no)
+            yield ("Flow", code, case_no)
+            for e in range(events):
+                yield ("CaseEvent", code, case_no, f"{rnd.getrandbits(80):020x}")
+                yield ("Case", code, case_no)
+                yield ("Location", rnd.choice(LOCATIONS))
+                yield ("Case", code, case_no)
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--shipments", type=int, default=20000)
+    ap.add_argument("--cases", type=int, default=3, help="cases per shipment")
+    ap.add_argument("--events", type=int, default=6, help="events per case")
+    ap.add_argument("--seed", type=int, default=5)
+    args = ap.parse_args()
+
+    keys = list(_refs(args.shipments, args.cases, args.events, args.seed))
+    distinct_keys = len(set(keys))
+    distinct_segments = len({p for k in keys for p in k})
+
+    t0 = time.perf_counter()
+    plain = [f"<{iri_factory.iri(BASE, *k)}>" for k in keys]
+    t_plain = time.perf_counter() - t0
+
+    factory = iri_factory.IriFactory(BASE, maxsize=len(keys) + 1)  # no evictions during the run
+    t0 = time.perf_counter()
+    cached = [factory.ref(*k) for k in keys]
+    t_cached = time.perf_counter() - t0
+
+    # second, untimed pass with an instrumented slug_token to count regex work
+    slug_calls = 0
+    slug = iri_factory.slug_token
+
+    def counting_slug(value):
+        nonlocal slug_calls
+        slug_calls += 1
+        return slug(value)
+
+    iri_factory.slug_token = counting_slug
+    try:
+        for k in keys:
+            iri_factory.iri(BASE, *k)
+        plain_calls, slug_calls = slug_calls, 0
+        counted = iri_factory.IriFactory(BASE, maxsize=len(keys) + 1)
+        for k in keys:
+            counted.ref(*k)
+        cached_calls = slug_calls
+    finally:
+        iri_factory.slug_token = slug
+
+    if plain != cached:
+        raise SystemExit("[FAIL] IriFactory references differ from iri()")
+    if cached_calls != distinct_segments or factory.slug_calls != distinct_segments:
+        raise SystemExit(f"[FAIL] slug calls {cached_calls} != distinct segments {distinct_segments}")
+
+    print(f"references={len(keys)} distinct IRIs={distinct_keys} distinct segments={distinct_segments}")
+    print(f"iri()       : {t_plain:.3f}s  slug calls={plain_calls}")
+    print(f"IriFactory  : {t_cached:.3f}s  slug calls={cached_calls}  hits={factory.hits} misses={factory.misses}")
+    print(f"speedup     : {t_plain / max(t_cached, 1e-9):.2f}x")
+
+
+if __name__ == "__main__":
+    main()
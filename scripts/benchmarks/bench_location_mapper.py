@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Benchmark: LocationMapper fuzzy fallback, linear scan vs indexed candidates.
+
+The linear path reproduces the former NAME_SUBSTRING / NAME_SIMILARITY loops
+of ``LocationMapper.map`` (scan every name, SequenceMatcher against every
+name). Results must be identical tuple-for-tuple.
+
+Usage:
+  python scripts/benchmarks/bench_location_mapper.py --names 3000 --texts 500
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import difflib
+import random
+import string
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Optional, Tuple
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(REPO_ROOT / "scripts" / "etl"))
+
+import status_etl as etl  # noqa: E402
+
+WORDS = ["dsv", "indoor", "outdoor", "yard", "warehouse", "storage", "port", "jetty", "laydown",
+         "mosb", "khalifa", "mina", "zayed", "kizad", "markaz", "hauler", "area", "block", "zone"]
+
+
+def _linear_map(mapper: "etl.LocationMapper", text: str) -> Tuple[Optional[str], str, float]:
+    k = etl._norm_loc_text(text)
+    if not k:
+        return (None, "UNMATCHED", 0.0)
+    for table, method in ((mapper.alias_norm_to_code, "ALIAS"), (mapper.code_norm_to_code, "CODE_EXACT"),
+                          (mapper.name_norm_to_code, "NAME_EXACT"), (mapper.node_norm_to_code, "NODE_EXACT")):
+        if k in table:
+            return (table[k], method, 1.0)
+    best_code = None
+    best_len = 0
+    for nn, code in mapper._name_candidates:
+        if nn and (nn in k or k in nn) and len(nn) > best_len:
+            best_len = len(nn)
+            best_code = code
+    if best_code:
+        return (best_code, "NAME_SUBSTRING", float(min(0.99, max(0.50, best_len / max(len(k), 1)))))
+    best_ratio = 0.0
+    best_code2 = None
+    for nn, code in mapper._name_candidates:
+        r = difflib.SequenceMatcher(None, k, nn).ratio()
+        if r > best_ratio:
+            best_ratio = r
+            best_code2 = code
+    if best_code2 and best_ratio >= 0.85:
+        return (best_code2, "NAME_SIMILARITY", float(best_ratio))
+    return (None, "UNMATCHED", 0.0)
+
+
+def _mutate(rnd: random.Random, s: str) -> str:
+    chars = list(s)
+    for _ in range(rnd.randint(0, 3)):
+        op = rnd.randint(0, 2)
+        pos = rnd.randrange(len(chars) + 1)
+        if op == 0:
+            chars.insert(pos, rnd.choice(string.ascii_lowercase))
+        elif op == 1 and pos < len(chars):
+            del chars[pos]
+        elif pos < len(chars):
+            chars[pos] = rnd.choice(string.ascii_lowercase)
+    return "".join(chars)
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--names", type=int, default=3000, help="locations.csv name 수")
+    ap.add_argument("--texts", type=int, default=500, help="distinct location_text 수")
+    ap.add_argument("--seed", type=int, default=3)
+    args = ap.parse_args()
+
+    rnd = random.Random(args.seed)
+    names = [" ".join(rnd.sample(WORDS, rnd.randint(2, 4))) + f" {i}" for i in range(args.names)]
+    texts = [_mutate(rnd, rnd.choice(names)) if i % 3 else " ".join(rnd.sample(WORDS, 3)) for i in range(args.texts)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        loc_csv = Path(tmp) / "locations.csv"
+        with loc_csv.open("w", newline="", encoding="utf-8") as f:
+            w = csv.writer(f)
+            w.writerow(["location_code", "name", "hvdc_node"])
+            for i, n in enumerate(names):
+                w.writerow([f"LOC_{i:05d}", n, ""])
+        t0 = time.perf_counter()
+        mapper = etl.LocationMapper(loc_csv)
+        t_build = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    linear = [_linear_map(mapper, t) for t in texts]
+    t_linear = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    indexed = [mapper.map(t) for t in texts]
+    t_indexed = time.perf_counter() - t0
+
+    if linear != indexed:
+        raise SystemExit("[FAIL] indexed LocationMapper differs from linear scan")
+
+    print(f"names={args.names} texts={args.texts} (index build {t_build:.3f}s)")
+    print(f"linear scan : {t_linear:.3f}s")
+    print(f"indexed     : {t_indexed:.3f}s")
+    print(f"speedup     : {t_linear / max(t_indexed, 1e-9):.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Benchmark: Option-C report stage, ``compute_report`` on a keyed flow index.
+
+The former ``agi_das_violation_cnt`` looked up each AGI/DAS case's flow with
+a linear ``next(f for f in flows ...)`` scan (O(cases x flows)). The legacy
+count is replayed on the first ``--legacy-cases`` cases only (the full
+quadratic run takes minutes) and must match ``compute_report`` on the same
+subset; ``compute_report`` itself is timed on all ``--cases``.
+
+Usage:
+  python scripts/benchmarks/bench_optionc_report.py --cases 100000 --legacy-cases 5000
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(REPO_ROOT / "scripts" / "etl"))
+
+import optionc_etl as etl  # noqa: E402
+
+from synthetic import hvdc_code  # noqa: E402
+
+FINAL_LOCATIONS = ["AGI", "DAS", "MIR", "SHU", "DSV Indoor", None]
+
+
+def _dataset(n_cases: int, events_per_case: int, seed: int) -> Tuple[List[Any], List[Any], List[Any]]:
+    rnd = random.Random(seed)
+    cases, flows, events = [], [], []
+    for i in range(n_cases):
+        code, case_no = hvdc_code(i // 3), str(i % 3 + 1)
+        cases.append(etl.CaseRow(code, case_no, final_location=rnd.choice(FINAL_LOCATIONS)))
+        if rnd.random() < 0.97:  # a few cases without a flow (counted as flow_code 0)
+            fc = rnd.randrange(0, 6)
+            flows.append(etl.FlowRow(code, case_no, fc, rnd.choice([fc, fc, None, 2]), fc, None, 1,
+                                     False, fc >= 2, None, None, None, None, fc == 5))
+        for _ in range(events_per_case):
+            events.append(etl.EventRecord(code, case_no, "WH_IN", "2024-01-01T00:00:00+04:00", 1,
+                                          "DSV_INDOOR", "DSV Indoor", "bench", None))
+    rnd.shuffle(flows)
+    return cases, flows, events
+
+
+def _legacy_agi_das(cases: List[Any], flows: List[Any]) -> int:
+    return sum(
+        1
+        for c in cases
+        if (c.final_location or "").upper() in ("AGI", "DAS")
+        and next(
+            (f.flow_code for f in flows if f.hvdc_code == c.hvdc_code and f.case_no == c.case_no),
+            0,
+        )
+        < 3
+    )
+
+
+def _report(cases: List[Any], flows: List[Any], events: List[Any]) -> Dict[str, Any]:
+    stats = {"all_rows": len(cases), "wh_rows": 0, "wh_matched": 0, "wh_unmatched": 0}
+    return etl.compute_report(
+        merge_stats=stats, all_invalid=0, all_unique=len(cases), wh_invalid=0, wh_unique=0,
+        merged_rows=len(cases), dedup_rows=len(cases), dup_cnt=0, shipments=[], cases=cases,
+        flows=flows, events=events, wh_cols=[], site_cols=[], customs_hvdc_keys=0,
+    )
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--cases", type=int, default=100_000)
+    ap.add_argument("--legacy-cases", type=int, default=5_000, help="subset replayed with the O(n^2) count")
+    ap.add_argument("--events", type=int, default=4, help="events per case")
+    ap.add_argument("--seed", type=int, default=19)
+    args = ap.parse_args()
+
+    cases, flows, events = _dataset(args.cases, args.events, args.seed)
+
+    t0 = time.perf_counter()
+    report = _report(cases, flows, events)
+    t_report = time.perf_counter() - t0
+
+    sub_cases = cases[: args.legacy_cases]
+    sub_keys = {(c.hvdc_code, c.case_no) for c in sub_cases}
+    sub_flows = [f for f in flows if (f.hvdc_code, f.case_no) in sub_keys]
+    t0 = time.perf_counter()
+    legacy = _legacy_agi_das(sub_cases, sub_flows)
+    t_legacy = time.perf_counter() - t0
+    indexed = _report(sub_cases, sub_flows, [])["agi_das_violation_cnt"]
+    if legacy != indexed:
+        raise SystemExit(f"[FAIL] agi_das_violation_cnt {indexed} != legacy {legacy}")
+
+    scale = (len(cases) * len(flows)) / max(len(sub_cases) * len(sub_flows), 1)
+    print(f"cases={len(cases)} flows={len(flows)} events={len(events)}")
+    print(f"compute_report (all metrics)   : {t_report:.3f}s  agi_das_violation_cnt={report['agi_das_violation_cnt']}")
+    print(f"legacy agi_das on {len(sub_cases)} cases: {t_legacy:.3f}s  (matches: {legacy})")
+    print(f"legacy agi_das extrapolated     : ~{t_legacy * scale:.0f}s for {len(cases)} cases")
+
+
+if __name__ == "__main__":
+    main()
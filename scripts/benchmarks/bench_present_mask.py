@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Benchmark: Flow Code presence detection, string-based vs dtype-aware ``_present_mask``.
+
+``_present_mask_str`` (the former implementation) stringifies and strips
+every cell of every warehouse/site column; ``_present_mask`` dispatches on
+dtype (numeric compares, object columns factorized once). The frame mixes
+the shapes seen in the HVDC JSON: int64 epoch-ms columns with 0 for "no
+visit", float columns with NaN, object columns with ISO dates and null
+tokens ("", "-", "N/A", ...), and object columns mixing epoch ints and text.
+Masks must be identical column-for-column.
+
+Usage:
+  python scripts/benchmarks/bench_present_mask.py --rows 500000 --cols 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(REPO_ROOT / "scripts" / "etl"))
+
+import flow_code_calculator as calc  # noqa: E402
+
+BASE_MS = 1_700_000_000_000
+NULL_TOKENS = ["", " ", "-", "N/A", "nan", "0", None]
+
+
+def _frame(rows: int, cols: int, seed: int) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    data = {}
+    dates = pd.date_range("2023-01-01", periods=730, freq="D").strftime("%Y-%m-%d").to_numpy(dtype=object)
+    for i in range(cols):
+        visited = rng.random(rows) < 0.35
+        epoch = BASE_MS + rng.integers(0, 400 * 86_400_000, rows)
+        kind = i % 5
+        if kind in (0, 1):  # int64 epoch-ms, 0 = not visited
+            data[f"int_{i}"] = np.where(visited, epoch, 0)
+        elif kind == 2:  # float epoch-ms with NaN
+            data[f"float_{i}"] = np.where(visited, epoch.astype("float64"), np.nan)
+        elif kind == 3:  # ISO dates / null tokens
+            tokens = np.array(NULL_TOKENS, dtype=object)[rng.integers(0, len(NULL_TOKENS), rows)]
+            data[f"date_{i}"] = np.where(visited, dates[rng.integers(0, len(dates), rows)], tokens)
+        else:  # mixed epoch ints and text
+            tokens = np.array(NULL_TOKENS, dtype=object)[rng.integers(0, len(NULL_TOKENS), rows)]
+            data[f"mixed_{i}"] = np.where(visited, epoch.astype(object), tokens)
+    return pd.DataFrame(data)
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rows", type=int, default=500_000)
+    ap.add_argument("--cols", type=int, default=20)
+    ap.add_argument("--seed", type=int, default=22)
+    args = ap.parse_args()
+
+    df = _frame(args.rows, args.cols, args.seed)
+    print(f"rows={len(df)} cols={len(df.columns)} dtypes={df.dtypes.astype(str).value_counts().to_dict()}")
+
+    timings = {}
+    masks = {}
+    for name, fn in (("str", calc._present_mask_str), ("dtype", calc._present_mask)):
+        t0 = time.perf_counter()
+        masks[name] = {c: fn(df[c]) for c in df.columns}
+        timings[name] = time.perf_counter() - t0
+
+    for c in df.columns:
+        if not masks["str"][c].equals(masks["dtype"][c]):
+            raise SystemExit(f"[FAIL] presence mask differs for column {c} ({df[c].dtype})")
+
+    present = sum(int(m.sum()) for m in masks["dtype"].values())
+    print(f"present cells={present}")
+    print(f"_present_mask_str : {timings['str']:.2f}s")
+    print(f"_present_mask     : {timings['dtype']:.2f}s")
+    print(f"speedup           : {timings['str'] / max(timings['dtype'], 1e-9):.1f}x")
+
+
+if __name__ == "__main__":
+    main()
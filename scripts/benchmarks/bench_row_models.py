@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Benchmark: memory per event for the ETL row models, ``__dict__`` vs ``__slots__``.
+
+Option-C builds one ``EventRecord`` per event (formerly an ``EventRow`` and
+an ``EventDebugRow``) and status_etl an ``EventOut``; shipments/cases/flows
+are one row per entity.
+Each model is instantiated ``--events`` times once as its slotted class and
+once as an otherwise identical ``__dict__``-backed twin (``make_dataclass``
+over the same fields). Field values are pre-built and shared, so the
+``tracemalloc`` delta is the per-instance container cost only.
+
+Usage:
+  python scripts/benchmarks/bench_row_models.py --events 1000000
+"""
+
+from __future__ import annotations
+
+import argparse
+import dataclasses
+import gc
+import sys
+import time
+import tracemalloc
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any, Callable, List, Tuple
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(REPO_ROOT / "scripts" / "etl"))
+
+import optionc_etl  # noqa: E402
+import status_etl  # noqa: E402
+
+from synthetic import hvdc_code  # noqa: E402
+
+EVENT_TYPES = ["WH_IN", "WH_OUT", "SITE_ARRIVAL", "MOSB_IN", "PORT_ETA"]
+FIELDS = ["DSV Indoor", "DSV Outdoor", "MOSB", "AGI", "DAS", "MIR", "SHU"]
+
+
+def _dict_twin(cls: type) -> type:
+    """Same fields/defaults as ``cls`` but a plain (``__dict__``) dataclass."""
+    return dataclasses.make_dataclass(
+        cls.__name__ + "Dict",
+        [(f.name, f.type, dataclasses.field(default=f.default)) if f.default is not dataclasses.MISSING
+         else (f.name, f.type) for f in dataclasses.fields(cls)],
+    )
+
+
+def _measure(factory: Callable[[int], Any], n: int) -> Tuple[float, float]:
+    """(bytes per instance, seconds) for ``n`` instances kept alive in a list."""
+    gc.collect()
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    rows: List[Any] = [None] * n  # preallocated: the list itself is not counted per row
+    base, _ = tracemalloc.get_traced_memory()
+    for i in range(n):
+        rows[i] = factory(i)
+    elapsed = time.perf_counter() - t0
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del rows
+    return (current - base) / n, elapsed
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--events", type=int, default=1_000_000)
+    ap.add_argument("--events-per-case", type=int, default=8)
+    args = ap.parse_args()
+
+    n = args.events
+    n_cases = max(1, n // args.events_per_case)
+    codes = [hvdc_code(i) for i in range(n_cases)]
+    case_nos = [str(c) for c in range(1, 4)]
+    day0 = date(2024, 1, 1)
+    isos = [f"{day0 + timedelta(days=d)}T00:00:00Z" for d in range(730)]
+    days = [day0 + timedelta(days=d) for d in range(730)]
+    epochs = [1_700_000_000_000 + d * 86_400_000 for d in range(730)]
+    raw = {"agg": "min", "count": 1}
+
+    def code(i: int) -> str:
+        return codes[(i // args.events_per_case) % n_cases]
+
+    def event_row(cls: type) -> Callable[[int], Any]:
+        return lambda i: cls(code(i), case_nos[i % 3], EVENT_TYPES[i % 5], isos[i % 730], i % 40,
+                             FIELDS[i % 7], "HVDC_WAREHOUSE", epochs[i % 730])
+
+    def event_debug_row(cls: type) -> Callable[[int], Any]:
+        return lambda i: cls(code(i), case_nos[i % 3], EVENT_TYPES[i % 5], isos[i % 730], FIELDS[i % 7],
+                             FIELDS[i % 7], "HVDC_WAREHOUSE", epochs[i % 730])
+
+    def event_record(cls: type) -> Callable[[int], Any]:
+        return lambda i: cls(code(i), case_nos[i % 3], EVENT_TYPES[i % 5], isos[i % 730], i % 40,
+                             FIELDS[i % 7], FIELDS[i % 7], "HVDC_WAREHOUSE", epochs[i % 730])
+
+    def event_out(cls: type) -> Callable[[int], Any]:
+        return lambda i: cls(code(i), code(i), "WH", FIELDS[i % 7], None, "EXACT", 1.0,
+                             days[i % 730], "warehouse_overlay(min)", raw)
+
+    def flow_row(cls: type) -> Callable[[int], Any]:
+        return lambda i: cls(code(i), case_nos[i % 3], 2, 2, None, None, 1, False, True,
+                             None, None, None, "SITE", False)
+
+    models = [
+        ("EventRow", optionc_etl.EventRow, event_row),
+        ("EventDebugRow", optionc_etl.EventDebugRow, event_debug_row),
+        ("EventRecord", optionc_etl.EventRecord, event_record),
+        ("EventOut", status_etl.EventOut, event_out),
+        ("FlowRow", optionc_etl.FlowRow, flow_row),
+    ]
+
+    print(f"instances per model={n}")
+    print(f"{'model':<14} {'dict B/row':>10} {'slots B/row':>11} {'saved':>7} {'dict s':>7} {'slots s':>7}")
+    pair_dict = record_slots = 0.0
+    for name, cls, make in models:
+        if "__dict__" in dir(cls) or not hasattr(cls, "__slots__"):
+            raise SystemExit(f"[FAIL] {name} is not slotted")
+        twin = _dict_twin(cls)
+        if dataclasses.astuple(make(twin)(7)) != dataclasses.astuple(make(cls)(7)):
+            raise SystemExit(f"[FAIL] {name} twin differs")
+        d_bytes, d_sec = _measure(make(twin), n)
+        s_bytes, s_sec = _measure(make(cls), n)
+        if name in ("EventRow", "EventDebugRow"):
+            pair_dict += d_bytes
+        elif name == "EventRecord":
+            record_slots = s_bytes
+        print(f"{name:<14} {d_bytes:>10.1f} {s_bytes:>11.1f} {1 - s_bytes / d_bytes:>6.0%} {d_sec:>7.2f} {s_sec:>7.2f}")
+
+    print(f"Option-C per event: EventRow + EventDebugRow (dict) {pair_dict:.1f} -> EventRecord (slots) "
+          f"{record_slots:.1f} bytes ({(pair_dict - record_slots) * n / 2**20:.1f} MiB saved at {n} events)")
+
+
+if __name__ == "__main__":
+    main()
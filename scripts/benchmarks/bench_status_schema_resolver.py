@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Benchmark: status_etl field extraction, per-call detect_key vs SchemaResolver.
+
+The legacy path reproduces the former shipment loop in ``status_etl.main()``
+(``detect_key`` rebuilding the normalized-key map for every field, twice for
+numeric/date fields). The resolver path is what ``main()`` uses now.
+
+Usage:
+  python scripts/benchmarks/bench_status_schema_resolver.py --rows 83000
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(REPO_ROOT / "scripts" / "etl"))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import status_etl as etl  # noqa: E402
+from synthetic import status_records  # noqa: E402
+
+
+def _legacy_extract(r: Dict[str, Any]) -> tuple:
+    nk = etl.norm_key
+    dk = etl.detect_key
+    hvdc_code = str(r.get(dk(r, etl.STATUS_HVDC_KEYS), "")).strip()
+    k = dk(r, etl.STATUS_NO_KEYS)
+    status_no = etl.parse_int_maybe(r.get(k)) if k else None
+    strs = tuple(
+        etl.get_str(r, keys)
+        for keys in (
+            etl.STATUS_VENDOR_KEYS,
+            etl.STATUS_BAND_KEYS,
+            list(map(nk, ["INCOTERMS"])),
+            list(map(nk, ["CURRENCY"])),
+            list(map(nk, ["POL"])),
+            list(map(nk, ["POD"])),
+            list(map(nk, ["B/L No.AWB No.", "B/L No.AWB No"])),
+            list(map(nk, ["VESSEL NAME/ FLIGHT No.", "VESSEL NAME/\\nFLIGHT No.", "VESSEL NAME/ FLIGHT No"])),
+            list(map(nk, ["SHIP MODE"])),
+        )
+    )
+    nums = []
+    for name, parse in (("PKG", etl.parse_int_maybe), ("QTY OF CNTR", etl.parse_int_maybe),
+                        ("CBM", etl.parse_num_maybe), ("GWT(KG)", etl.parse_num_maybe),
+                        ("ETD", etl.parse_date_iso_maybe), ("ETA", etl.parse_date_iso_maybe),
+                        ("ATA", etl.parse_date_iso_maybe)):
+        nums.append(parse(r.get(dk(r, [nk(name)]) or "")) if dk(r, [nk(name)]) else parse(r.get(name)))
+    return (hvdc_code, status_no) + strs + tuple(nums)
+
+
+def _resolver_extract(r: Dict[str, Any]) -> tuple:
+    hvdc_code = etl.get_status_hvdc_code(r)
+    v = etl.STATUS_RESOLVER.values(r)
+    strs = tuple(etl.clean_str(v[f]) for f in (
+        "vendor", "band", "incoterms", "currency", "pol", "pod", "bl_awb", "vessel", "ship_mode"))
+    return (
+        (hvdc_code, etl.parse_int_maybe(v["status_no"]))
+        + strs
+        + (
+            etl.parse_int_maybe(v["pkg"]),
+            etl.parse_int_maybe(v["qty_cntr"]),
+            etl.parse_num_maybe(v["cbm"]),
+            etl.parse_num_maybe(v["gwt_kg"]),
+            etl.parse_date_iso_maybe(v["etd"]),
+            etl.parse_date_iso_maybe(v["eta"]),
+            etl.parse_date_iso_maybe(v["ata"]),
+        )
+    )
+
+
+def _timed(fn, records: List[Dict[str, Any]]) -> tuple:
+    t0 = time.perf_counter()
+    out = [fn(r) for r in records]
+    return time.perf_counter() - t0, out
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rows", type=int, default=83000, help="Status record 수 (default: 83000)")
+    args = ap.parse_args()
+
+    records = status_records(args.rows)
+    t_legacy, legacy = _timed(_legacy_extract, records)
+    t_new, new = _timed(_resolver_extract, records)
+    if legacy != new:
+        raise SystemExit("[FAIL] resolver output differs from legacy detect_key output")
+
+    print(f"rows={args.rows}")
+    print(f"legacy detect_key : {t_legacy:.3f}s")
+    print(f"SchemaResolver    : {t_new:.3f}s")
+    print(f"speedup           : {t_legacy / max(t_new, 1e-9):.2f}x")
+
+
+if __name__ == "__main__":
+    main()
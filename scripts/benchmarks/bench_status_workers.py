@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Benchmark: status_etl --workers scaling (build step only, no output writing).
+
+``build_sharded`` runs in two pool phases: byte-range scans (each worker
+parses its own slice of the WH/Status files) and hvdc_code shards (merge the
+partial WH aggregates, build events). The parent only splits the files at
+record boundaries, forwards the pickled partial aggregates and assembles the
+result.
+
+Besides the wall-clock measured on this host, every task is also timed
+in-process. ``critical path`` = parent serial work + slowest scan task +
+slowest shard task + pool start-up, i.e. the wall-clock to expect with at
+least N free cores. Results must match the single-process ``build_shard``.
+The single-process time includes serializing every raw record once, which
+the CSV/TTL writers do in that mode and the workers do in the parallel one.
+
+Usage:
+  python scripts/benchmarks/bench_status_workers.py --status-rows 18000 --wh-rows 56000 --workers 1 2 4
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import pickle
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import List, Tuple
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(REPO_ROOT / "scripts" / "etl"))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import status_etl as etl  # noqa: E402
+from synthetic import status_records, wh_records  # noqa: E402
+
+CHUNK_ROWS = 5000
+
+
+def _noop(_: int) -> None:
+    return None
+
+
+def _pool_startup(workers: int) -> float:
+    t0 = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        list(pool.map(_noop, range(workers)))
+    return time.perf_counter() - t0
+
+
+def _timed_task(fn, task) -> Tuple[float, object]:
+    """worker 쪽 비용: task 역직렬화 + 실행 + 결과 직렬화"""
+    t0 = time.perf_counter()
+    task = pickle.loads(pickle.dumps(task, protocol=pickle.HIGHEST_PROTOCOL))
+    blob = pickle.dumps(fn(task), protocol=pickle.HIGHEST_PROTOCOL)
+    return time.perf_counter() - t0, blob
+
+
+def critical_path(status_path: Path, wh_path: Path, workers: int) -> Tuple[float, float, List[float], List[float]]:
+    """(critical path, parent serial, scan task times, shard task times) — 단계별 in-process 계측"""
+    t0 = time.perf_counter()
+    wh_ranges = etl.split_record_ranges(wh_path, workers)
+    status_ranges = etl.split_record_ranges(status_path, workers)
+    serial = time.perf_counter() - t0
+
+    scan_times, scans = [], []
+    for i in range(max(len(wh_ranges), len(status_ranges))):
+        task = (
+            wh_ranges[i] if i < len(wh_ranges) else None,
+            status_ranges[i] if i < len(status_ranges) else None,
+            workers, CHUNK_ROWS, None, False,
+        )
+        dt, blob = _timed_task(etl._scan_range_worker, task)
+        scan_times.append(dt)
+        t0 = time.perf_counter()
+        scans.append(pickle.loads(blob))
+        serial += time.perf_counter() - t0
+
+    shard_times, shards = [], []
+    for shard in range(workers):
+        task = ([scan.wh_parts[shard] for scan in scans], None, None, 0, False)
+        dt, blob = _timed_task(etl._event_shard_worker, task)
+        shard_times.append(dt)
+        t0 = time.perf_counter()
+        shards.append(pickle.loads(blob))
+        serial += time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    etl.merge_sharded(scans, shards)
+    serial += time.perf_counter() - t0
+    total = serial + max(scan_times) + max(shard_times) + _pool_startup(workers)
+    return total, serial, scan_times, shard_times
+
+
+def _same(a: etl.ShardResult, b: etl.ShardResult) -> bool:
+    """raw(단일 프로세스는 dict, 병렬은 직렬화된 문자열)는 직렬화 결과로 비교"""
+    raw = etl.RawJsonCache()
+    ship, ev = etl._row_fields(etl.ShipmentOut), etl._row_fields(etl.EventOut)
+    return (
+        [(idx, ship(sh), raw.text(sh.raw)) for idx, sh in a.shipments]
+        == [(idx, ship(sh), raw.text(sh.raw)) for idx, sh in b.shipments]
+        and [(ev(x), raw.text(x.raw)) for x in a.events] == [(ev(x), raw.text(x.raw)) for x in b.events]
+        and (a.status_in, a.status_dups, a.wh_in, a.wh_codes) == (b.status_in, b.status_dups, b.wh_in, b.wh_codes)
+    )
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--status-rows", type=int, default=18000)
+    ap.add_argument("--wh-rows", type=int, default=56000)
+    ap.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="bench_status_workers_") as tmp:
+        status_path = Path(tmp) / "status.json"
+        wh_path = Path(tmp) / "wh.json"
+        status = status_records(args.status_rows)
+        status_path.write_text(json.dumps(status, ensure_ascii=False), encoding="utf-8")
+        wh_path.write_text(json.dumps(wh_records(args.wh_rows, len(status)), ensure_ascii=False), encoding="utf-8")
+
+        t0 = time.perf_counter()
+        single = etl.build_shard(status_path, wh_path, etl.LocationMapper(None), CHUNK_ROWS)
+        raw = etl.RawJsonCache()
+        for _, sh in single.shipments:
+            raw.text(sh.raw)
+        for ev in single.events:
+            raw.text(ev.raw)
+        t_single = time.perf_counter() - t0
+
+        print(f"status rows={args.status_rows} wh rows={args.wh_rows} cores on this host={len(os.sched_getaffinity(0))}")
+        print(f"single process build_shard + raw JSON : {t_single:.2f}s")
+        print("workers | wall (this host) | critical path (>= N cores) | parent serial | slowest scan / shard task")
+        for n in args.workers:
+            t0 = time.perf_counter()
+            res = etl.build_sharded(status_path, wh_path, n, CHUNK_ROWS, None, None, 0)
+            wall = time.perf_counter() - t0
+            if not _same(res, single):
+                raise SystemExit(f"[FAIL] --workers {n} result differs from single-process build")
+            total, serial, scan_times, shard_times = critical_path(status_path, wh_path, n)
+            print(
+                f"{n:7d} | {wall:15.2f}s | {total:25.2f}s | {serial:12.2f}s | "
+                f"{max(scan_times):.2f}s / {max(shard_times):.2f}s"
+            )
+
+
+if __name__ == "__main__":
+    main()
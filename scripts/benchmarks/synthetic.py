@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Synthetic HVDC records for ETL micro-benchmarks.
+
+The shapes mirror the real sources closely enough to exercise the same code
+paths (key variants, comma numbers, ISO/epoch dates, sparse location columns)
+without shipping any project data.
+"""
+
+from __future__ import annotations
+
+import random
+from datetime import datetime, timezone
+from typing import Any, Dict, List
+
+STATUS_KEY_VARIANTS = ["SCT SHIP NO.", "SCT SHIP NO", "hvdc_code"]
+
+WH_LOCATION_COLS = [
+    "DSV Indoor",
+    "DSV Outdoor",
+    "DSV Al Markaz",
+    "DHL Warehouse",
+    "Hauler Indoor",
+    "DSV MZP",
+    "JDN MZD",
+    "AAA Storage",
+    "ZENER (WH)",
+    "MOSB",
+    "Shifting",
+]
+
+SITE_COLS = ["MIR", "SHU", "DAS", "AGI"]
+
+BASE_MS = 1_700_000_000_000
+
+
+def hvdc_code(i: int) -> str:
+    return f"HVDC-ADOPT-{('HE', 'SIM', 'PPL')[i % 3]}-{i:05d}"
+
+
+def status_records(n: int, seed: int = 7) -> List[Dict[str, Any]]:
+    """HVDC_all_status.json 형태(3가지 키 변형 shape)"""
+    rnd = random.Random(seed)
+    out: List[Dict[str, Any]] = []
+    for i in range(1, n + 1):
+        r: Dict[str, Any] = {"No": str(i), STATUS_KEY_VARIANTS[i % 3]: hvdc_code(i)}
+        r.update({
+            "MR#": "E02",
+            "COMMERCIAL INVOICE No.": hvdc_code(i),
+            "VENDOR": rnd.choice(["Hitachi", "Siemens", "Prysmian"]),
+            "CATEGORY": "Elec",
+            "INCOTERMS": "CIF",
+            "CURRENCY": "EUR",
+            "COE": "FRANCE",
+            "POL": "Le Havre",
+            "POD": "Mina Zayed",
+            "B/L No.AWB No.": f"BL{i:06d}",
+            "VESSEL NAME/\nFLIGHT No.": "BBC ASIA",
+            "SHIPPING LINE": "BBC",
+            "FORWARDER": "Allied Sea freight Line",
+            "SHIP MODE": "B",
+            "PKG": str(rnd.randint(1, 40)),
+            "QTY OF CNTR": "0",
+            "GWT(KG)": "659,580.00",
+            "CBM": "1,290.89",
+            "ETD": "2023-11-12",
+            "ATD": "2023-11-12",
+            "ETA": "2023-11-30",
+            "ATA": "2023-12-01",
+            "SHU": "",
+            "MIR": "O",
+            "DAS": "",
+            "AGI": "O",
+            "DSV Indoor Indoor": "",
+            "JDN MZD": "2023-12-05",
+            "MOSB": "",
+            "REMARK": "",
+        })
+        out.append(r)
+    return out
+
+
+def wh_records(n: int, n_codes: int, seed: int = 11) -> List[Dict[str, Any]]:
+    """hvdc_warehouse_status.json 형태(케이스 단위, ISO/epoch(ms) 혼재)"""
+    rnd = random.Random(seed)
+    out: List[Dict[str, Any]] = []
+    for j in range(n):
+        code = hvdc_code(rnd.randint(1, n_codes))
+        t = BASE_MS + rnd.randint(0, 10**10)
+        r: Dict[str, Any] = {
+            "no.": j + 1,
+            "HVDC CODE": code,
+            "Case No.": f"C{j:07d}",
+            "Site": rnd.choice(SITE_COLS),
+            "Pkg": 1,
+            "Description": "Bottom Shield",
+            "CBM": 25.09,
+            "Vendor": "HITACHI",
+            "POL": rnd.choice(["Gothenburg", "Le Havre"]),
+            "POD": rnd.choice(["Khalifa port", "Mina Zayed"]),
+            "ETD/ATD": t - 10**9,
+            "ETA/ATA": t - 5 * 10**8,
+            "Status_Current": rnd.choice(["site", "warehouse", "Pre Arrival"]),
+            "Status_Location_Date": t,
+            "Final_Location": rnd.choice(["AGI", "DAS", "MIR", "SHU", "DSV Indoor"]),
+        }
+        for col in rnd.sample(WH_LOCATION_COLS, rnd.randint(0, 4)):
+            ms = t + rnd.randint(-10**9, 10**9)
+            if j % 2:
+                r[col] = ms
+            else:
+                r[col] = datetime.fromtimestamp(ms / 1000, tz=timezone.utc).strftime("%Y-%m-%d")
+        for col in rnd.sample(SITE_COLS, rnd.randint(0, 1)):
+            r[col] = t + 5 * 10**9
+        out.append(r)
+    return out
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+ETL 테이블 Parquet / Arrow IPC 입출력 (--columnar parquet|arrow, --input-format)
+
+- Supabase 로딩 기준은 CSV 유지; columnar 파일은 CSV 옆에 typed로 추가 출력
+- dataclass_columns: row dataclass → (name, type) 컬럼
+- write_table: dict row를 batch 단위로 Parquet/Arrow 파일에 기록
+- read_table / read_text_rows: pyarrow.Table 또는 CSV와 같은 문자열 row로 읽기(Arrow IPC는 mmap)
+- 컬럼 타입: str / int(int64) / float(float64) / bool / date(date32), None(비문자열 컬럼의 NaN·'' 포함)은 null
+- pyarrow는 columnar 형식을 요청할 때만 필요
+"""
+
+from __future__ import annotations
+
+import dataclasses
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Mapping, Sequence, Tuple
+
+try:
+    import pyarrow as pa  # optional: --columnar / --input-format
+    import pyarrow.compute as pc
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pc = None
+    pq = None
+
+COLUMNAR_FORMATS = ("parquet", "arrow")
+SUFFIXES = {"parquet": ".parquet", "arrow": ".arrow"}
+
+Column = Tuple[str, str]
+
+
+def require_pyarrow(fmt: str) -> None:
+    if fmt not in COLUMNAR_FORMATS:
+        raise ValueError(f"unknown columnar format: {fmt!r} (expected one of {COLUMNAR_FORMATS})")
+    if pa is None:
+        raise RuntimeError(f"{fmt} output/input requires pyarrow (pip install pyarrow)")
+
+
+def columnar_path(path: Path, fmt: str) -> Path:
+    """``out/flows.csv`` or ``out/flows`` -> ``out/flows.parquet`` / ``out/flows.arrow``"""
+    return path.with_suffix(SUFFIXES[fmt])
+
+
+def dataclass_columns(cls: type) -> List[Column]:
+    """Row dataclass -> columns; Optional[X] is nullable X, anything else non-scalar is text."""
+    cols: List[Column] = []
+    for f in dataclasses.fields(cls):
+        t = f.type if isinstance(f.type, str) else getattr(f.type, "__name__", str(f.type))
+        if t.startswith("Optional[") and t.endswith("]"):
+            t = t[len("Optional["):-1]
+        cols.append((f.name, t if t in ("int", "float", "bool", "date") else "str"))
+    return cols
+
+
+def _arrow_type(kind: str) -> Any:
+    return {
+        "str": pa.string(),
+        "int": pa.int64(),
+        "float": pa.float64(),
+        "bool": pa.bool_(),
+        "date": pa.date32(),
+    }[kind]
+
+
+def _coerce(kind: str, v: Any) -> Any:
+    """Row value -> value of the column type ('' / NaN -> null; numpy scalars -> Python)."""
+    if v is None or (isinstance(v, str) and v == "" and kind != "str"):
+        return None
+    if kind == "str":
+        return v if isinstance(v, str) else str(v)
+    if kind == "date":
+        return v
+    if v != v:  # NaN
+        return None
+    if kind == "int":
+        return int(v)
+    if kind == "float":
+        return float(v)
+    return bool(v)
+
+
+def _batch(schema: Any, columns: Sequence[Column], buf: List[List[Any]]) -> Any:
+    arrays = [pa.array(values, type=_arrow_type(kind)) for (_, kind), values in zip(columns, buf)]
+    return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+
+def write_table(
+    path: Path,
+    columns: Sequence[Column],
+    rows: Iterable[Mapping[str, Any]],
+    fmt: str,
+    batch_rows: int = 65536,
+) -> Path:
+    """
+    Write dict rows (keys = column names) as ``path`` with the format suffix and
+    return the written path. Rows are converted ``batch_rows`` at a time, so the
+    input can be a generator. Parquet uses zstd; Arrow IPC is uncompressed so
+    readers can memory-map it.
+    """
+    require_pyarrow(fmt)
+    out = columnar_path(path, fmt)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    schema = pa.schema([pa.field(name, _arrow_type(kind)) for name, kind in columns])
+    names = [name for name, _ in columns]
+
+    def batches() -> Iterable[Any]:
+        buf: List[List[Any]] = [[] for _ in names]
+        n = 0
+        for r in rows:
+            for i, name in enumerate(names):
+                buf[i].append(_coerce(columns[i][1], r.get(name)))
+            n += 1
+            if n >= batch_rows:
+                yield _batch(schema, columns, buf)
+                buf = [[] for _ in names]
+                n = 0
+        if n:
+            yield _batch(schema, columns, buf)
+
+    if fmt == "parquet":
+        with pq.ParquetWriter(str(out), schema, compression="zstd") as writer:
+            for b in batches():
+                writer.write_table(pa.Table.from_batches([b], schema=schema))
+    else:
+        with pa.OSFile(str(out), "wb") as sink:
+            with pa.ipc.new_file(sink, schema) as writer:
+                for b in batches():
+                    writer.write_batch(b)
+    return out
+
+
+def read_table(path: Path) -> Any:
+    """Columnar file -> ``pyarrow.Table`` (format from suffix; Arrow IPC is memory-mapped)."""
+    if pa is None:
+        raise RuntimeError(f"reading {path.name} requires pyarrow (pip install pyarrow)")
+    if path.suffix == SUFFIXES["parquet"]:
+        return pq.read_table(str(path), memory_map=True)
+    if path.suffix == SUFFIXES["arrow"]:
+        return pa.ipc.open_file(pa.memory_map(str(path), "r")).read_all()
+    raise ValueError(f"not a columnar table: {path}")
+
+
+def read_text_rows(path: Path) -> List[Dict[str, str]]:
+    """
+    Columnar file -> rows whose values are CSV-style text ('' for null,
+    'true'/'false', ISO dates; numbers via Arrow's string cast, e.g. 1.5 /
+    659580), for readers written against ``csv.DictReader``. Columns are
+    cast in Arrow before rows are materialized.
+    """
+    table = read_table(path)
+    cols = []
+    for col in table.columns:
+        if not pa.types.is_string(col.type):
+            col = pc.cast(col, pa.string())
+        cols.append(pc.fill_null(col, "").to_pylist())
+    names = table.column_names
+    return [dict(zip(names, values)) for values in zip(*cols)]
@@ -7,7 +7,8 @@ Supabase CSV(SSOT Status + Option-C Case) -> RDF/Turtle instance data export
 - Ontology schema: hvdc_ops_ontology.ttl
 - SHACL shapes:   hvdc_ops_shapes.ttl
 
-Inputs (auto-detect by filename):
+Inputs (auto-detect by filename; --input-format parquet|arrow reads the ETL
+--columnar tables with the same names instead, e.g. shipments_status.parquet):
 1) Status layer (Untitled-4 output)
    - shipments.csv OR shipments_status.csv
    - logistics_events.csv OR events_status.csv
@@ -48,6 +49,12 @@ from datetime import datetime, date, timezone
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
+# TTL 인스턴스 IRI (같은 폴더에 iri_factory.py 필요)
+from iri_factory import IriFactory  # type: ignore
+
+# Parquet/Arrow 입력 형식 (--input-format parquet|arrow 시에만 같은 폴더의 columnar_io.py + pyarrow 필요)
+COLUMNAR_FORMATS = ("parquet", "arrow")
+
 # -----------------------------
 # Helpers
 # -----------------------------
@@ -56,9 +63,18 @@ def _read_csv(path: Path) -> List[dict]:
         r = csv.DictReader(f)
         return list(r)
 
-def _pick_existing(dir_path: Path, candidates: List[str]) -> Optional[Path]:
+def _read_rows(path: Path) -> List[dict]:
+    """CSV 또는 ETL --columnar 출력(Parquet/Arrow) → CSV와 같은 문자열 row"""
+    if path.suffix == ".csv":
+        return _read_csv(path)
+    from columnar_io import read_text_rows  # type: ignore
+    return read_text_rows(path)
+
+def _pick_existing(dir_path: Path, candidates: List[str], input_format: str = "csv") -> Optional[Path]:
     for name in candidates:
         p = dir_path / name
+        if input_format != "csv":
+            p = p.with_suffix(f".{input_format}")
         if p.exists():
             return p
     return None
@@ -117,15 +133,6 @@ def _as_datetime(v: str) -> Optional[str]:
 def _ttl_escape(s: str) -> str:
     return str(s).replace("\\", "\\\\").replace('"', '\\"')
 
-def _iri(base: str, *parts: str) -> str:
-    # conservative URL-safe slug (not full percent-encoding; enough for stable IDs)
-    def slug(x: str) -> str:
-        x = str(x).strip()
-        x = re.sub(r"\s+", "_", x)
-        x = re.sub(r"[^0-9A-Za-z._\-]+", "-", x)
-        return x[:180] if len(x) > 180 else x
-    return base.rstrip("/") + "/" + "/".join(slug(p) for p in parts)
-
 def _hash_id(*vals: str) -> str:
     h = hashlib.sha256("||".join([str(v) for v in vals]).encode("utf-8")).hexdigest()
     return h[:20]
@@ -163,29 +170,31 @@ def export_instances(
     schema_ttl: Optional[Path],
     shapes_ttl: Optional[Path],
     base_iri: str,
+    input_format: str = "csv",
 ) -> None:
     # Status files
-    shipments_path = _pick_existing(status_dir, ["shipments_status.csv", "shipments.csv"])
-    events_status_path = _pick_existing(status_dir, ["events_status.csv", "logistics_events.csv"])
+    fmt = input_format
+    shipments_path = _pick_existing(status_dir, ["shipments_status.csv", "shipments.csv"], fmt)
+    events_status_path = _pick_existing(status_dir, ["events_status.csv", "logistics_events.csv"], fmt)
 
     if not shipments_path or not events_status_path:
-        raise SystemExit(f"[FAIL] status_dir에서 shipments/events CSV를 찾지 못했습니다: {status_dir}")
+        raise SystemExit(f"[FAIL] status_dir에서 shipments/events {fmt} 파일을 찾지 못했습니다: {status_dir}")
 
-    shipments = _read_csv(shipments_path)
-    status_events = _read_csv(events_status_path)
+    shipments = _read_rows(shipments_path)
+    status_events = _read_rows(events_status_path)
 
     # Case files (optional)
     cases = flows = locations = events_case = None
     if case_dir:
-        cases_p = _pick_existing(case_dir, ["cases.csv"])
-        flows_p = _pick_existing(case_dir, ["flows.csv"])
-        loc_p   = _pick_existing(case_dir, ["locations.csv"])
-        ev_p    = _pick_existing(case_dir, ["events_case.csv", "events.csv"])
+        cases_p = _pick_existing(case_dir, ["cases.csv"], fmt)
+        flows_p = _pick_existing(case_dir, ["flows.csv"], fmt)
+        loc_p   = _pick_existing(case_dir, ["locations.csv"], fmt)
+        ev_p    = _pick_existing(case_dir, ["events_case.csv", "events.csv"], fmt)
         if all([cases_p, flows_p, loc_p, ev_p]):
-            cases = _read_csv(cases_p)
-            flows = _read_csv(flows_p)
-            locations = _read_csv(loc_p)
-            events_case = _read_csv(ev_p)
+            cases = _read_rows(cases_p)
+            flows = _read_rows(flows_p)
+            locations = _read_rows(loc_p)
+            events_case = _read_rows(ev_p)
         else:
             # allow missing case layer
             cases = flows = locations = events_case = None
@@ -218,6 +227,7 @@ def export_instances(
 
     # TTL output
     t = TTL()
+    iri = IriFactory(base_iri)
     t.add(f"@prefix hvdc: <{base_iri.rstrip('/') + '#'}> .")
     t.add("@prefix xsd:  <http://www.w3.org/2001/XMLSchema#> .")
     t.add("")
@@ -232,7 +242,7 @@ def export_instances(
             lcode = (r.get("location_code") or "").strip()
             if not lcode:
                 continue
-            loc_iri = f"<{_iri(base_iri, 'Location', lcode)}>"
+            loc_iri = iri.ref("Location", lcode)
             props: List[Tuple[str,str]] = [
                 ("hvdc:locationCode", f"\"{_ttl_escape(lcode)}\""),
                 ("hvdc:locationName", f"\"{_ttl_escape((r.get('name') or '').strip())}\""),
@@ -255,7 +265,7 @@ def export_instances(
         code = (sh.get("hvdc_code") or "").strip()
         if not code:
             continue
-        ship_iri = f"<{_iri(base_iri, 'Shipment', code)}>"
+        ship_iri = iri.ref("Shipment", code)
         props: List[Tuple[str,str]] = [
             ("hvdc:hvdcCode", f"\"{_ttl_escape(code)}\""),
         ]
@@ -303,7 +313,7 @@ def export_instances(
                 case_no = (cr.get("case_no") or "").strip()
                 if not case_no: 
                     continue
-                case_iri = f"<{_iri(base_iri, 'Case', code, case_no)}>"
+                case_iri = iri.ref("Case", code, case_no)
                 t.triple(ship_iri, "hvdc:hasCase", case_iri)
 
         t.add("")
@@ -314,8 +324,8 @@ def export_instances(
         code = (ev.get("hvdc_code") or "").strip()
         if not eid or not code:
             continue
-        ev_iri = f"<{_iri(base_iri, 'StatusEvent', eid)}>"
-        ship_iri = f"<{_iri(base_iri, 'Shipment', code)}>"
+        ev_iri = iri.ref("StatusEvent", eid)
+        ship_iri = iri.ref("Shipment", code)
         props: List[Tuple[str,str]] = [
             ("hvdc:eventId", f"\"{_ttl_escape(eid)}\""),
             ("hvdc:eventType", f"\"{_ttl_escape((ev.get('event_type') or '').strip())}\""),
@@ -341,8 +351,8 @@ def export_instances(
             case_no = (cr.get("case_no") or "").strip()
             if not code or not case_no:
                 continue
-            case_iri = f"<{_iri(base_iri, 'Case', code, case_no)}>"
-            ship_iri = f"<{_iri(base_iri, 'Shipment', code)}>"
+            case_iri = iri.ref("Case", code, case_no)
+            ship_iri = iri.ref("Shipment", code)
             props: List[Tuple[str,str]] = [
                 ("hvdc:caseNo", f"\"{_ttl_escape(case_no)}\""),
                 ("hvdc:belongsToShipment", ship_iri),
@@ -371,7 +381,7 @@ def export_instances(
             # Flow per case
             fr = flow_by_key.get((code, case_no))
             if fr:
-                flow_iri = f"<{_iri(base_iri, 'Flow', code, case_no)}>"
+                flow_iri = iri.ref("Flow", code, case_no)
                 fprops: List[Tuple[str,str]] = []
                 fc = _as_int(fr.get("flow_code",""))
                 if fc is not None:
@@ -430,9 +440,9 @@ def export_instances(
 
             # deterministic IRI from natural key
             hid = _hash_id(code, case_no, et, dt, lcode, sf, ss)
-            ev_iri = f"<{_iri(base_iri, 'CaseEvent', code, case_no, hid)}>"
-            case_iri = f"<{_iri(base_iri, 'Case', code, case_no)}>"
-            loc_iri = f"<{_iri(base_iri, 'Location', lcode)}>"
+            ev_iri = iri.ref("CaseEvent", code, case_no, hid)
+            case_iri = iri.ref("Case", code, case_no)
+            loc_iri = iri.ref("Location", lcode)
             props: List[Tuple[str,str]] = [
                 ("hvdc:eventId", f"\"{_ttl_escape(hid)}\""),
                 ("hvdc:eventType", f"\"{_ttl_escape(et)}\""),
@@ -478,7 +488,19 @@ def main() -> None:
         help="출력 TTL 경로 (default: ../hvdc_output/ontology/hvdc_ops_data.ttl)",
     )
     ap.add_argument("--base-iri", default="https://example.com/hvdc", help="Instance base IRI (기본: https://example.com/hvdc)")
+    ap.add_argument(
+        "--input-format",
+        choices=("csv",) + COLUMNAR_FORMATS,
+        default="csv",
+        help="입력 테이블 형식: csv(기본) 또는 ETL --columnar 출력(parquet/arrow, pyarrow 필요)",
+    )
     args = ap.parse_args()
+    if args.input_format != "csv":
+        from columnar_io import require_pyarrow  # type: ignore
+        try:
+            require_pyarrow(args.input_format)
+        except RuntimeError as e:
+            ap.error(str(e))
 
     status_dir = Path(args.status_dir)
     case_dir = Path(args.case_dir) if args.case_dir.strip() else None
@@ -493,6 +515,7 @@ def main() -> None:
         schema_ttl=schema_ttl,
         shapes_ttl=shapes_ttl,
         base_iri=args.base_iri,
+        input_format=args.input_format,
     )
 
     print("DONE")
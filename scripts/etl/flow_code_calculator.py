@@ -3,6 +3,10 @@
 Flow Code v3.5 calculator used by the HVDC Option‑C ETL scripts.
 
 This module provides:
+- ``flow_code_v35_kernel``: NumPy classifier over a boolean presence matrix
+- ``flow_code_v35_arrays``: presence matrix + kernel for a DataFrame, no copy
+- ``flow_code_v35_incremental``: same, reusing rows whose presence bitmask and
+  final location match a previous run's state
 - ``calculate_flow_code_v35``: classify flows 0–5 based on warehouse/MOSB/site legs
 - ``normalize_column_names``: lightweight, backwards‑compatible column normalizer
 
@@ -12,7 +16,7 @@ folder can run without depending on the wider project package structure.
 
 from __future__ import annotations
 
-from typing import Iterable, List
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
 
 import numpy as np
 import pandas as pd
@@ -51,8 +55,23 @@ NULL_STRINGS = {
     "n/a",
 }
 
+AGI_DAS_OVERRIDE_REASON = "AGI/DAS requires MOSB leg"
 
-def normalize_column_names(df: pd.DataFrame) -> pd.DataFrame:
+# Tag of the state written by ``flow_code_v35_incremental``; bump when the
+# classification or the state layout changes so older states are ignored.
+FLOW_STATE_VERSION = "flow_code_v3.5/1"
+
+FLOW_DESCRIPTIONS = {
+    0: "Flow 0: Pre Arrival",
+    1: "Flow 1: Port → Site",
+    2: "Flow 2: Port → WH → Site",
+    3: "Flow 3: Port → MOSB → Site",
+    4: "Flow 4: Port → WH → MOSB → Site",
+    5: "Flow 5: Mixed / Waiting / Incomplete",
+}
+
+
+def normalize_column_names(df: pd.DataFrame, copy: bool = True) -> pd.DataFrame:
     """
     Return ``df`` with column names normalized.
 
@@ -64,17 +83,68 @@ def normalize_column_names(df: pd.DataFrame) -> pd.DataFrame:
     the ETL stable and predictable we now treat it as a thin compatibility
     layer. If future inputs introduce variant column spellings, this is the
     single place to centralize that mapping.
+
+    With ``copy=False`` the frame itself is returned (nothing is renamed), for
+    callers that built ``df`` themselves and only append columns to it.
     """
     # For now we simply return the original frame; callers rely on the raw
     # JSON field names. Keeping a copy avoids accidental mutation surprises.
-    return df.copy()
+    return df.copy() if copy else df
 
 
-def _present_mask(s: pd.Series) -> pd.Series:
+def _present_mask_str(s: pd.Series) -> pd.Series:
+    """Reference presence test: not null and ``str(value).strip()`` not in ``NULL_STRINGS``."""
     s_str = s.astype(str).str.strip()
     return s.notna() & ~s_str.isin(NULL_STRINGS)
 
 
+def _is_zero(v: object) -> bool:
+    try:
+        return not isinstance(v, str) and bool(v == 0)
+    except (TypeError, ValueError):
+        return False
+
+
+def _present_mask(s: pd.Series) -> pd.Series:
+    """
+    Same result as ``_present_mask_str`` without stringifying every cell.
+
+    - bool: always present (``"True"`` / ``"False"`` are not null strings)
+    - int: ``!= 0``; float: not NaN and (``!= 0`` or ``-0.0``, which prints as ``"-0.0"``)
+    - datetime: not NaT
+    - object / string: factorize once and test only the distinct values;
+      cells equal to zero (``0``, ``0.0``, ``False``, ``-0.0`` hash alike but
+      print differently) are re-checked one by one
+    - anything else falls back to ``_present_mask_str``
+    """
+    dtype = s.dtype
+    if pd.api.types.is_bool_dtype(dtype):
+        return s.notna()
+    if pd.api.types.is_integer_dtype(dtype):
+        return (s != 0).fillna(False).astype(bool) & s.notna()
+    if pd.api.types.is_float_dtype(dtype):
+        v = s.to_numpy(dtype="float64", na_value=np.nan)
+        return pd.Series(~np.isnan(v) & ((v != 0) | np.signbit(v)), index=s.index)
+    if pd.api.types.is_datetime64_any_dtype(dtype):
+        return s.notna()
+    if not (pd.api.types.is_object_dtype(dtype) or pd.api.types.is_string_dtype(dtype)):
+        return _present_mask_str(s)
+
+    try:
+        codes, uniques = pd.factorize(s, use_na_sentinel=True)
+    except TypeError:  # unhashable cells (lists/dicts)
+        return _present_mask_str(s)
+    uniq = list(uniques)
+    present_u = np.array([str(u).strip() not in NULL_STRINGS for u in uniq] + [False], dtype=bool)
+    mask = present_u[codes]  # code -1 (NA) -> trailing False
+    zero_codes = [i for i, u in enumerate(uniq) if _is_zero(u)]
+    if zero_codes:
+        values = s.to_numpy(dtype=object)
+        for pos in np.flatnonzero(np.isin(codes, zero_codes)):
+            mask[pos] = str(values[pos]).strip() not in NULL_STRINGS
+    return pd.Series(mask, index=s.index)
+
+
 def _count_present(df: pd.DataFrame, cols: Iterable[str]) -> pd.Series:
     cols = [c for c in cols if c in df.columns]
     if not cols:
@@ -85,11 +155,224 @@ def _count_present(df: pd.DataFrame, cols: Iterable[str]) -> pd.Series:
     return cnt
 
 
+def presence_matrix(df: pd.DataFrame, columns: Sequence[str]) -> np.ndarray:
+    """
+    Boolean ``(len(df), len(columns))`` matrix of ``_present_mask`` per column.
+
+    Columns missing from ``df`` are all ``False``; a column listed twice is
+    tested once and fills both positions.
+    """
+    out = np.zeros((len(df), len(columns)), dtype=bool, order="F")
+    seen = {}
+    for j, col in enumerate(columns):
+        if col in seen:
+            out[:, j] = out[:, seen[col]]
+        elif col in df.columns:
+            out[:, j] = _present_mask(df[col]).to_numpy(dtype=bool)
+        seen.setdefault(col, j)
+    return out
+
+
+def final_location_keys(final_location: pd.Series) -> np.ndarray:
+    """``str(value).strip().upper()`` per row (object array, NA -> ``""``), each distinct value converted once."""
+    try:
+        codes, uniques = pd.factorize(final_location, use_na_sentinel=True)
+    except TypeError:  # unhashable cells
+        return final_location.astype(str).str.strip().str.upper().to_numpy(dtype=object)
+    keys = [str(u).strip().upper() for u in uniques]
+    return np.array(keys + [""], dtype=object)[codes]  # code -1 (NA) -> trailing ""
+
+
+def needs_mosb_leg(final_location: pd.Series) -> np.ndarray:
+    """Final location is AGI or DAS (after ``final_location_keys`` normalization)."""
+    return np.isin(final_location_keys(final_location), ["AGI", "DAS"])
+
+
+def flow_code_v35_kernel(
+    presence: np.ndarray,
+    is_warehouse: np.ndarray,
+    is_mosb: np.ndarray,
+    is_site: np.ndarray,
+    need_mosb: Optional[np.ndarray] = None,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Flow Code v3.5 on a boolean presence matrix (rows × location columns).
+
+    ``is_warehouse`` / ``is_mosb`` / ``is_site`` are boolean masks over the
+    matrix columns (warehouses exclude MOSB); ``need_mosb`` flags rows whose
+    final location is AGI/DAS. Returns ``(flow_code, flow_code_orig,
+    override_reason)``: two int64 arrays and an object array holding
+    ``AGI_DAS_OVERRIDE_REASON`` where the override applied, else ``None``.
+    """
+    presence = np.asarray(presence, dtype=bool)
+    wh_cnt = np.count_nonzero(presence[:, np.asarray(is_warehouse, dtype=bool)], axis=1)
+    has_mosb = presence[:, np.asarray(is_mosb, dtype=bool)].any(axis=1)
+    has_site = presence[:, np.asarray(is_site, dtype=bool)].any(axis=1)
+
+    # 1: Port → Site, 2: Port → WH → Site, 3: Port → MOSB → Site, 4: Port → WH → MOSB → Site
+    flow = np.where(has_site, np.where(has_mosb, 3, 1) + (wh_cnt >= 1), 0).astype(np.int64)
+    # 5: Mixed / Incomplete (MOSB without site, or several warehouses without site)
+    flow[~has_site & (has_mosb | (wh_cnt >= 2))] = 5
+
+    reason = np.full(len(flow), None, dtype=object)
+    if need_mosb is None:
+        return flow, flow.copy(), reason
+    forced = np.asarray(need_mosb, dtype=bool) & (flow < 3)
+    reason[forced] = AGI_DAS_OVERRIDE_REASON
+    return np.where(forced, 3, flow), flow, reason
+
+
+def flow_code_v35_arrays(
+    df: pd.DataFrame,
+    warehouse_columns: List[str],
+    site_columns: List[str],
+    final_location_col: str = "Final_Location",
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    ``flow_code_v35_kernel`` applied to ``df`` without copying or modifying it.
+
+    The presence matrix is laid out as warehouse columns (MOSB excluded),
+    ``MOSB``, then site columns; the AGI/DAS override applies only when
+    ``final_location_col`` exists.
+    """
+    columns, is_warehouse, is_mosb, is_site = flow_code_v35_layout(warehouse_columns, site_columns)
+    need_mosb = (
+        needs_mosb_leg(df[final_location_col]) if final_location_col in df.columns else None
+    )
+    return flow_code_v35_kernel(
+        presence_matrix(df, columns), is_warehouse, is_mosb, is_site, need_mosb
+    )
+
+
+def flow_code_v35_layout(
+    warehouse_columns: Sequence[str], site_columns: Sequence[str]
+) -> Tuple[List[str], np.ndarray, np.ndarray, np.ndarray]:
+    """Presence matrix columns and their warehouse / MOSB / site role masks."""
+    wh_cols_excl_mosb = [c for c in warehouse_columns if c != "MOSB"]
+    columns = wh_cols_excl_mosb + ["MOSB"] + list(site_columns)
+    roles = np.repeat(np.arange(3), [len(wh_cols_excl_mosb), 1, len(site_columns)])
+    return columns, roles == 0, roles == 1, roles == 2
+
+
+def presence_bitmask(presence: np.ndarray) -> np.ndarray:
+    """Row bitmask of a presence matrix as ``(rows, ceil(columns / 64))`` uint64 words."""
+    packed = np.packbits(presence, axis=1, bitorder="little")
+    words = np.zeros((len(presence), -(-packed.shape[1] // 8) * 8), dtype=np.uint8)
+    words[:, : packed.shape[1]] = packed
+    return words.view("<u8")
+
+
+def _flow_state_arrays(
+    previous: Optional[Dict[str, Any]], layout: Dict[str, List[str]], words: int
+) -> Optional[Tuple[pd.Index, np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]]:
+    """
+    Column arrays of an earlier ``flow_code_v35_incremental`` state, or
+    ``None`` when it cannot be reused: another version or layout, a missing
+    or malformed column, duplicate keys, or columns whose lengths do not
+    match ``keys`` (e.g. a truncated state file).
+    """
+    if not isinstance(previous, dict) or previous.get("version") != FLOW_STATE_VERSION:
+        return None
+    if previous.get("layout") != layout:
+        return None
+    try:
+        keys = pd.Index(previous["keys"], dtype=object)
+        if not keys.is_unique:
+            return None
+        bitmask = np.asarray(previous["bitmask"], dtype=np.uint64)
+        columns = [
+            np.asarray(previous[name], dtype=dtype)
+            for name, dtype in (
+                ("final_location", object),
+                ("flow_code", np.int64),
+                ("flow_code_orig", np.int64),
+                ("override_reason", object),
+            )
+        ]
+    except (KeyError, TypeError, ValueError, OverflowError):
+        return None
+    n = len(keys)
+    if bitmask.shape != (n * words,) or any(col.shape != (n,) for col in columns):
+        return None
+    return (keys, bitmask.reshape(n, words), *columns)
+
+
+def flow_code_v35_incremental(
+    df: pd.DataFrame,
+    warehouse_columns: List[str],
+    site_columns: List[str],
+    keys: Sequence[Optional[str]],
+    previous: Optional[Dict[str, Any]] = None,
+    final_location_col: str = "Final_Location",
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, Dict[str, Any], np.ndarray]:
+    """
+    ``flow_code_v35_arrays`` that reuses the results of an earlier run.
+
+    ``keys`` identify rows across runs (``None`` rows are always classified
+    and not stored). ``previous`` is the state returned by an earlier call,
+    kept column-wise (JSON-serializable lists): per key the
+    ``presence_bitmask`` words, the ``final_location_keys`` value and the
+    three results. A row is classified again only if its key is new or its
+    bitmask or final location changed; a state for another column layout,
+    or one that is truncated or malformed, is ignored. Columns are sorted
+    within each role (the code depends only on per-role counts), so the state
+    survives a reordering of ``warehouse_columns`` / ``site_columns``.
+
+    Returns ``(flow_code, flow_code_orig, override_reason, state, recomputed)``
+    where ``recomputed`` marks the rows classified by this call.
+    """
+    site_columns = sorted(site_columns)
+    columns, is_warehouse, is_mosb, is_site = flow_code_v35_layout(sorted(warehouse_columns), site_columns)
+    layout = {"warehouse": columns[: int(is_warehouse.sum())], "site": site_columns}
+    presence = presence_matrix(df, columns)
+    bits = presence_bitmask(presence)
+    has_loc = final_location_col in df.columns
+    loc = final_location_keys(df[final_location_col]) if has_loc else np.full(len(df), "", dtype=object)
+    key_index = pd.Index(list(keys), dtype=object)
+
+    flow = np.zeros(len(df), dtype=np.int64)
+    flow_orig = np.zeros(len(df), dtype=np.int64)
+    reason = np.full(len(df), None, dtype=object)
+    recomputed = np.ones(len(df), dtype=bool)
+    prev = _flow_state_arrays(previous, layout, bits.shape[1])
+    if prev is not None:
+        prev_keys, prev_bits, prev_loc, prev_flow, prev_orig, prev_reason = prev
+        pos = prev_keys.get_indexer(key_index)
+        rows = np.flatnonzero(pos >= 0)
+        pos = pos[rows]
+        same = (prev_bits[pos] == bits[rows]).all(axis=1) & (prev_loc[pos] == loc[rows])
+        rows, pos = rows[same], pos[same]
+        flow[rows] = prev_flow[pos]
+        flow_orig[rows] = prev_orig[pos]
+        reason[rows] = prev_reason[pos]
+        recomputed[rows] = False
+
+    if recomputed.any():
+        need_mosb = np.isin(loc[recomputed], ["AGI", "DAS"]) if has_loc else None
+        flow[recomputed], flow_orig[recomputed], reason[recomputed] = flow_code_v35_kernel(
+            presence[recomputed], is_warehouse, is_mosb, is_site, need_mosb
+        )
+
+    keep = ~(key_index.isna() | key_index.duplicated(keep="last"))
+    state = {
+        "version": FLOW_STATE_VERSION,
+        "layout": layout,
+        "keys": key_index[keep].tolist(),
+        "bitmask": bits[keep].ravel().tolist(),  # row-major words, reshaped on load
+        "final_location": loc[keep].tolist(),
+        "flow_code": flow[keep].tolist(),
+        "flow_code_orig": flow_orig[keep].tolist(),
+        "override_reason": reason[keep].tolist(),
+    }
+    return flow, flow_orig, reason, state, recomputed
+
+
 def calculate_flow_code_v35(
     df: pd.DataFrame,
     warehouse_columns: List[str],
     site_columns: List[str],
     final_location_col: str = "Final_Location",
+    columns_only: bool = False,
 ) -> pd.DataFrame:
     """
     Compute Flow Code v3.5 for each row and attach flow metadata.
@@ -99,56 +382,29 @@ def calculate_flow_code_v35(
     - ``FLOW_CODE_ORIG`` (int)
     - ``FLOW_OVERRIDE_REASON`` (str)
     - ``FLOW_DESCRIPTION`` (str)
-    """
-    df = df.copy()
 
-    wh_cols_excl_mosb = [c for c in warehouse_columns if c != "MOSB"]
-    wh_cnt = _count_present(df, wh_cols_excl_mosb)
-    has_mosb = (
-        _present_mask(df["MOSB"]) if "MOSB" in df.columns else pd.Series(False, index=df.index)
+    By default a copy of ``df`` with the columns appended is returned. With
+    ``columns_only=True`` only the four flow columns are returned (same
+    index as ``df``) and ``df`` is not copied, so wide frames are not
+    duplicated just to append them; ``df.join(...)`` or column assignment
+    attaches them where needed. Callers that only need the codes can use
+    ``flow_code_v35_arrays`` directly.
+    """
+    flow, flow_orig, reason = flow_code_v35_arrays(
+        df, warehouse_columns, site_columns, final_location_col
     )
-    has_site = _count_present(df, site_columns) > 0
-
-    flow = pd.Series(0, index=df.index, dtype="int64")
-
-    # 1: Port → Site (site only)
-    flow = np.where(has_site & ~has_mosb & (wh_cnt == 0), 1, flow)
-    # 2: Port → WH → Site (warehouse + site)
-    flow = np.where(has_site & ~has_mosb & (wh_cnt >= 1), 2, flow)
-    # 3: Port → MOSB → Site (mosb + site)
-    flow = np.where(has_site & has_mosb & (wh_cnt == 0), 3, flow)
-    # 4: Port → WH → MOSB → Site (warehouse + mosb + site)
-    flow = np.where(has_site & has_mosb & (wh_cnt >= 1), 4, flow)
-
-    # 5: Mixed / Incomplete
-    flow = np.where(~has_site & has_mosb, 5, flow)
-    flow = np.where(~has_site & ~has_mosb & (wh_cnt >= 2), 5, flow)
-
-    flow_series = pd.Series(flow, index=df.index).astype(int)
-    df["FLOW_CODE_ORIG"] = flow_series
-
-    override_reason = pd.Series([None] * len(df), index=df.index, dtype="object")
-    flow_over = flow_series.copy()
-
-    if final_location_col in df.columns:
-        loc = df[final_location_col].astype(str).str.strip().str.upper()
-        need_mosb = loc.isin(["AGI", "DAS"])
-        forced = need_mosb & (flow_over < 3)
-        flow_over = np.where(forced, 3, flow_over)
-        override_reason = np.where(forced, "AGI/DAS requires MOSB leg", override_reason)
-
-    df["FLOW_CODE"] = pd.Series(flow_over, index=df.index).astype(int)
-    df["FLOW_OVERRIDE_REASON"] = override_reason
-
-    desc = {
-        0: "Flow 0: Pre Arrival",
-        1: "Flow 1: Port → Site",
-        2: "Flow 2: Port → WH → Site",
-        3: "Flow 3: Port → MOSB → Site",
-        4: "Flow 4: Port → WH → MOSB → Site",
-        5: "Flow 5: Mixed / Waiting / Incomplete",
-    }
-    df["FLOW_DESCRIPTION"] = df["FLOW_CODE"].map(desc)
-
+    flow_code = pd.Series(flow, index=df.index)
+    flow_cols = pd.DataFrame(
+        {
+            "FLOW_CODE_ORIG": pd.Series(flow_orig, index=df.index),
+            "FLOW_CODE": flow_code,
+            "FLOW_OVERRIDE_REASON": pd.Series(reason, index=df.index),
+            "FLOW_DESCRIPTION": flow_code.map(FLOW_DESCRIPTIONS),
+        }
+    )
+    if columns_only:
+        return flow_cols
+    df = df.copy()
+    for col in flow_cols.columns:
+        df[col] = flow_cols[col]
     return df
-
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+OPS TTL 인스턴스 IRI 생성 (status_etl / optionc_etl / export_hvdc_ops_ttl 공통)
+
+- IRI 형식: {base_iri}/{Class}/{slug(키)}/... (예: /Shipment/{hvdc_code}, /Case/{hvdc_code}/{case_no})
+- slug_token: path segment 1개용 URL-safe slug
+- iri: base + path parts → IRI (캐시 없음)
+- IriFactory: (class, 자연키) 기준 <IRI> 메모이즈 — 같은 Shipment IRI를 case/event/has* 링크마다 재계산하지 않음
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Any, Dict, Tuple
+
+_WS_RE = re.compile(r"\s+")
+_UNSAFE_RE = re.compile(r"[^0-9A-Za-z._\-]+")
+
+
+def slug_token(value: Any) -> str:
+    """Conservative URL-safe slug (not full percent-encoding; enough for stable IDs)."""
+    s = _UNSAFE_RE.sub("-", _WS_RE.sub("_", str(value).strip()))
+    return s[:180] if len(s) > 180 else s
+
+
+def iri(base_iri: str, *parts: Any) -> str:
+    return base_iri.rstrip("/") + "/" + "/".join(slug_token(p) for p in parts)
+
+
+class IriFactory:
+    """
+    Memoized instance IRI references for one ``base_iri``.
+
+    ``ref("Shipment", code)`` returns ``"<{base}/Shipment/{slug(code)}>"``.
+    Both the per-segment slugs and the final references are cached; each cache
+    is cleared when it reaches ``maxsize`` entries to keep memory bounded on
+    very large exports.
+    """
+
+    def __init__(self, base_iri: str, maxsize: int = 1 << 18):
+        self.base = base_iri.rstrip("/")
+        self.maxsize = maxsize
+        self._refs: Dict[Tuple[str, ...], str] = {}
+        self._slugs: Dict[str, str] = {}
+        self.slug_calls = 0  # slug_token (regex) executions
+        self.hits = 0
+        self.misses = 0
+
+    def _slug(self, part: str) -> str:
+        s = self._slugs.get(part)
+        if s is None:
+            s = slug_token(part)
+            self.slug_calls += 1
+            if len(self._slugs) >= self.maxsize:
+                self._slugs.clear()
+            self._slugs[part] = s
+        return s
+
+    def ref(self, cls: str, *key: Any) -> str:
+        # key parts are compared as text: 1, 1.0 and True hash alike but slug differently
+        k = (cls, *map(str, key))
+        r = self._refs.get(k)
+        if r is not None:
+            self.hits += 1
+            return r
+        self.misses += 1
+        r = "<" + self.base + "/" + "/".join(self._slug(p) for p in k) + ">"
+        if len(self._refs) >= self.maxsize:
+            self._refs.clear()
+        self._refs[k] = r
+        return r
+
+    def iri(self, cls: str, *key: Any) -> str:
+        """Bare IRI (without angle brackets)."""
+        return self.ref(cls, *key)[1:-1]
@@ -19,6 +19,7 @@ HVDC Option C ETL (ALL + WH + Inference) → Supabase CSV + TTL(Optional)
 - (추가) shipments_case.csv / events_case.csv / events_case_debug.csv (대시보드 alias)
 - report.json / report.md
 - hvdc_ops_data.ttl (옵션: --export-ttl)
+- shipments/cases/flows/locations/events/events_debug .parquet|.arrow (옵션: --columnar, pyarrow 필요)
 
 주의:
 - 입력 JSON의 시간 값은 Unix epoch(ms)로 가정.
@@ -32,8 +33,10 @@ import csv
 import json
 import hashlib
 import re
-from dataclasses import asdict, dataclass
+from dataclasses import asdict, dataclass, fields
 from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from operator import attrgetter
 from pathlib import Path
 from typing import Any, Dict, Iterable, List, Optional, Tuple
 
@@ -41,10 +44,20 @@ import pandas as pd
 import numpy as np
 
 # Flow Code v3.5 (0~5) 계산기 (같은 폴더에 flow_code_calculator.py 필요)
-from flow_code_calculator import calculate_flow_code_v35, normalize_column_names  # type: ignore
+from flow_code_calculator import (  # type: ignore
+    flow_code_v35_arrays,
+    flow_code_v35_incremental,
+    normalize_column_names,
+)
+# 대시보드 alias 출력 (같은 폴더에 output_alias.py 필요)
+from output_alias import ALIAS_MODES, open_output  # type: ignore
+
+# Parquet/Arrow 출력 형식 (--columnar 사용 시에만 같은 폴더의 columnar_io.py + pyarrow 필요)
+COLUMNAR_FORMATS = ("parquet", "arrow")
 
 
 DUBAI_TZ = timezone(timedelta(hours=4))
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
 
 # ---------- Domain config ----------
 SITE_COLS = ["MIR", "SHU", "DAS", "AGI"]  # JSON 컬럼(현장)
@@ -89,7 +102,8 @@ FLOW_DESC = {
 
 
 # ---------- Data classes ----------
-@dataclass
+# slots=True: one instance per row (one EventRecord per event), no per-instance __dict__
+@dataclass(slots=True)
 class ShipmentRow:
     hvdc_code: str
     shipment_invoice_no: Optional[str] = None
@@ -103,7 +117,7 @@ class ShipmentRow:
     price: Optional[float] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class CaseRow:
     hvdc_code: str
     case_no: str
@@ -123,7 +137,7 @@ class CaseRow:
     vendor: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class FlowRow:
     hvdc_code: str
     case_no: str
@@ -141,7 +155,7 @@ class FlowRow:
     requires_review: bool
 
 
-@dataclass
+@dataclass(slots=True)
 class LocationRow:
     location_id: int
     location_code: str
@@ -154,7 +168,7 @@ class LocationRow:
     active: bool = True
 
 
-@dataclass
+@dataclass(slots=True)
 class EventRow:
     hvdc_code: str
     case_no: str
@@ -166,7 +180,7 @@ class EventRow:
     raw_epoch_ms: Optional[int] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class EventDebugRow:
     hvdc_code: str
     case_no: str
@@ -178,6 +192,31 @@ class EventDebugRow:
     raw_epoch_ms: Optional[int] = None
 
 
+@dataclass(slots=True)
+class EventRecord:
+    """이벤트 1건(location_id + location_code). events.csv / events_debug.csv 는 쓰기 시점에 투영"""
+    hvdc_code: str
+    case_no: str
+    event_type: str
+    event_time_iso: str
+    location_id: int
+    location_code: str
+    source_field: str
+    source_system: str
+    raw_epoch_ms: Optional[int] = None
+
+
+EVENT_COLUMNS = tuple(f.name for f in fields(EventRow))
+EVENT_DEBUG_COLUMNS = tuple(f.name for f in fields(EventDebugRow))
+
+
+def project_events(events: Iterable[EventRecord], columns: Tuple[str, ...]) -> Iterable[Dict[str, Any]]:
+    """EventRecord -> EventRow / EventDebugRow 열(dict) 투영"""
+    get = attrgetter(*columns)
+    for e in events:
+        yield dict(zip(columns, get(e)))
+
+
 # ---------- Utilities ----------
 def _as_str_or_none(v: Any) -> Optional[str]:
     if v in (None, ""):
@@ -218,6 +257,7 @@ def _epoch_ms_to_iso(ms: int, tz: timezone = DUBAI_TZ) -> str:
     return dt.isoformat()
 
 
+@lru_cache(maxsize=1 << 16)  # 통관 날짜 문자열은 반복이 많고 pd.to_datetime 단건 호출이 비쌈
 def _date_str_to_iso(date_str: str, tz: timezone = DUBAI_TZ) -> Optional[str]:
     try:
         dt = pd.to_datetime(date_str, errors="coerce")
@@ -276,6 +316,29 @@ def _extract_ids(record: Dict[str, Any]) -> Tuple[str, str]:
     return hvdc_code, case_key
 
 
+# 레코드 식별키 캐시: attach_ids()가 r["_ids"]에 (hvdc_code, case_key) 또는 None(키 없음)을 1회 저장
+IDS_KEY = "_ids"
+
+
+def attach_ids(records: Iterable[Dict[str, Any]]) -> int:
+    """각 레코드에 _extract_ids 결과를 r["_ids"]로 저장. 식별 실패 건수 반환"""
+    invalid = 0
+    for r in records:
+        try:
+            r[IDS_KEY] = _extract_ids(r)
+        except Exception:
+            r[IDS_KEY] = None
+            invalid += 1
+    return invalid
+
+
+def _record_ids(record: Dict[str, Any]) -> Optional[Tuple[str, str]]:
+    """캐시된 (hvdc_code, case_key); attach_ids를 거치지 않은 레코드는 여기서 1회 계산"""
+    if IDS_KEY not in record:
+        attach_ids((record,))
+    return record[IDS_KEY]
+
+
 def load_json_records(path: Path) -> List[Dict[str, Any]]:
     with path.open("r", encoding="utf-8") as f:
         data = json.load(f)
@@ -288,44 +351,72 @@ def compute_row_last_ms(record: Dict[str, Any]) -> int:
     """dedup 기준: 해당 레코드가 보유한 모든 epoch(ms) 중 최대값"""
     max_ms = 0
     for v in record.values():
-        if _is_epoch_ms(v):
+        t = type(v)
+        if t is int:  # JSON epoch(ms) 대부분: 예외 경로 없이 비교
+            if v > max_ms and v >= 100_000_000_000:
+                max_ms = v
+        elif t is str and len(v) < 12:  # 12자리 미만 문자열은 epoch(ms)가 될 수 없음
+            continue
+        elif v is not None and _is_epoch_ms(v):
             max_ms = max(max_ms, int(v))
     return max_ms
 
 
-def pick_best_record(a: Dict[str, Any], b: Dict[str, Any]) -> Dict[str, Any]:
+_I64_MAX = np.iinfo(np.int64).max
+
+
+def dedup_rank(record: Dict[str, Any]) -> Tuple[int, int, int]:
     """
-    동일 키 중 최신 스냅샷 선택:
-    - row_last_ms가 큰 레코드 우선
-    - 동률이면 Status_Location_Date가 큰 레코드 우선
+    동일 키 중 최신 스냅샷 선택 기준(클수록 우선):
+    - row_last_ms
+    - 동률이면 Status_Location_Date
     - 그래도 동률이면 source 우선순위: WH > ALL (가정)
+    int64 범위를 넘는 값은 상한으로 자름(벡터 비교용)
     """
-    a_ms = compute_row_last_ms(a)
-    b_ms = compute_row_last_ms(b)
-    if a_ms != b_ms:
-        return a if a_ms > b_ms else b
-
-    a_sd = (
-        int(a.get("Status_Location_Date") or 0)
-        if _is_epoch_ms(a.get("Status_Location_Date"))
-        else 0
-    )
-    b_sd = (
-        int(b.get("Status_Location_Date") or 0)
-        if _is_epoch_ms(b.get("Status_Location_Date"))
-        else 0
+    sd = record.get("Status_Location_Date")
+    return (
+        min(compute_row_last_ms(record), _I64_MAX),
+        min(int(sd or 0), _I64_MAX) if _is_epoch_ms(sd) else 0,
+        1 if str(record.get("_source") or "") == "WH" else 0,
     )
-    if a_sd != b_sd:
-        return a if a_sd > b_sd else b
 
-    a_src = str(a.get("_source") or "")
-    b_src = str(b.get("_source") or "")
-    if a_src != b_src:
-        if b_src == "WH":
-            return b
-        if a_src == "WH":
-            return a
-    return a
+
+def pick_best_record(a: Dict[str, Any], b: Dict[str, Any]) -> Dict[str, Any]:
+    """동일 키 두 레코드 중 dedup_rank가 큰 쪽(동률이면 a)"""
+    return b if dedup_rank(b) > dedup_rank(a) else a
+
+
+def best_per_key(
+    records: List[Dict[str, Any]], keys: List[Tuple[str, str]]
+) -> Dict[Tuple[str, str], Dict[str, Any]]:
+    """
+    키별 최선 레코드(= pick_best_record 순차 적용 결과), 키의 첫 등장 순서.
+    중복 키에 속한 레코드만 dedup_rank를 1회씩 계산하고
+    (키, rank 내림차순, 입력 순서) 정렬로 키별 argmax를 한 번에 구함.
+    """
+    first: Dict[Tuple[str, str], int] = {}
+    dup_idx: List[int] = []
+    for i, k in enumerate(keys):
+        if first.setdefault(k, i) != i:
+            dup_idx.append(i)
+    best = {k: records[i] for k, i in first.items()}
+    if not dup_idx:
+        return best
+
+    cand = sorted(set(dup_idx).union(first[keys[i]] for i in dup_idx))  # 입력 순서
+    group_of: Dict[Tuple[str, str], int] = {}
+    gid = np.fromiter(
+        (group_of.setdefault(keys[i], len(group_of)) for i in cand), dtype=np.int64, count=len(cand)
+    )
+    rank = np.array([dedup_rank(records[i]) for i in cand], dtype=np.int64).reshape(len(cand), 3)
+    order = np.lexsort((np.arange(len(cand)), -rank[:, 2], -rank[:, 1], -rank[:, 0], gid))
+    g_sorted = gid[order]
+    head = np.ones(len(cand), dtype=bool)
+    head[1:] = g_sorted[1:] != g_sorted[:-1]
+    group_keys = list(group_of)
+    for g, j in zip(g_sorted[head].tolist(), order[head].tolist()):
+        best[group_keys[g]] = records[cand[j]]
+    return best
 
 
 def left_merge_all_wh(
@@ -347,21 +438,22 @@ def left_merge_all_wh(
 
     if wh_records:
         stats["wh_rows"] = len(wh_records)
+        valid: List[Dict[str, Any]] = []
+        keys: List[Tuple[str, str]] = []
         for r in wh_records:
             r["_source"] = "WH"
-            try:
-                k = _extract_ids(r)
-            except Exception:
+            k = _record_ids(r)
+            if k is None:
                 continue
-            prev = wh_index.get(k)
-            wh_index[k] = pick_best_record(prev, r) if prev else r
+            valid.append(r)
+            keys.append(k)
+        wh_index = best_per_key(valid, keys)
 
     merged: List[Dict[str, Any]] = []
     for r in all_records:
         r["_source"] = "ALL"
-        try:
-            k = _extract_ids(r)
-        except Exception:
+        k = _record_ids(r)
+        if k is None:
             continue
         wh = wh_index.get(k)
         if wh is not None:
@@ -385,21 +477,18 @@ def dedup_by_case_key(
     records: List[Dict[str, Any]],
 ) -> Tuple[List[Dict[str, Any]], int]:
     """(hvdc_code, case_no) 유니크 보장"""
-    by_key: Dict[Tuple[str, str], Dict[str, Any]] = {}
-    dup = 0
+    valid: List[Dict[str, Any]] = []
+    keys: List[Tuple[str, str]] = []
     for r in records:
-        try:
-            k = _extract_ids(r)
-        except Exception:
+        k = _record_ids(r)
+        if k is None:
             continue
-        prev = by_key.get(k)
-        if prev is None:
-            by_key[k] = r
-        else:
-            dup += 1
-            by_key[k] = pick_best_record(prev, r)
+        valid.append(r)
+        keys.append(k)
+    by_key = best_per_key(valid, keys)
+    dup = len(valid) - len(by_key)
     out = list(by_key.values())
-    out.sort(key=lambda x: (_extract_ids(x)[0], _extract_ids(x)[1]))
+    out.sort(key=lambda x: x[IDS_KEY])
     return out, dup
 
 
@@ -407,10 +496,10 @@ def dedup_by_case_key(
 def build_shipments(records: Iterable[Dict[str, Any]]) -> List[ShipmentRow]:
     shipments: Dict[str, ShipmentRow] = {}
     for r in records:
-        try:
-            hvdc_code, _ = _extract_ids(r)
-        except Exception:
+        ids = _record_ids(r)
+        if ids is None:
             continue
+        hvdc_code = ids[0]
         s = shipments.get(hvdc_code)
         if s is None:
             s = ShipmentRow(hvdc_code=hvdc_code)
@@ -446,10 +535,10 @@ def build_shipments(records: Iterable[Dict[str, Any]]) -> List[ShipmentRow]:
 def build_cases(records: Iterable[Dict[str, Any]]) -> List[CaseRow]:
     out: List[CaseRow] = []
     for r in records:
-        try:
-            hvdc_code, case_no = _extract_ids(r)
-        except Exception:
+        ids = _record_ids(r)
+        if ids is None:
             continue
+        hvdc_code, case_no = ids
         out.append(
             CaseRow(
                 hvdc_code=hvdc_code,
@@ -563,8 +652,11 @@ def iter_events(
     site_cols: List[str],
     locations: Dict[str, LocationRow],
     customs_join: Optional[Dict[str, Any]] = None,
-) -> Iterable[Tuple[EventRow, EventDebugRow]]:
-    hvdc_code, case_no = _extract_ids(record)
+) -> Iterable[EventRecord]:
+    ids = _record_ids(record)
+    if ids is None:
+        return
+    hvdc_code, case_no = ids
 
     for fld in ("ETD/ATD", "ETA/ATA"):
         raw = _to_int(record.get(fld))
@@ -584,12 +676,7 @@ def iter_events(
         etype = _infer_port_event_type(record, fld)
         iso = _epoch_ms_to_iso(raw)
         lid = locations[loc_code].location_id
-        yield (
-            EventRow(hvdc_code, case_no, etype, iso, lid, fld, source_system, raw),
-            EventDebugRow(
-                hvdc_code, case_no, etype, iso, loc_code, fld, source_system, raw
-            ),
-        )
+        yield EventRecord(hvdc_code, case_no, etype, iso, lid, loc_code, fld, source_system, raw)
 
     for col in wh_cols:
         raw = _to_int(record.get(col))
@@ -607,12 +694,7 @@ def iter_events(
             continue
         iso = _epoch_ms_to_iso(raw)
         lid = locations[loc_code].location_id
-        yield (
-            EventRow(hvdc_code, case_no, etype, iso, lid, col, source_system, raw),
-            EventDebugRow(
-                hvdc_code, case_no, etype, iso, loc_code, col, source_system, raw
-            ),
-        )
+        yield EventRecord(hvdc_code, case_no, etype, iso, lid, loc_code, col, source_system, raw)
 
     for col in site_cols:
         raw = _to_int(record.get(col))
@@ -623,204 +705,171 @@ def iter_events(
             continue
         iso = _epoch_ms_to_iso(raw)
         lid = locations[loc_code].location_id
-        yield (
-            EventRow(
-                hvdc_code, case_no, "SITE_ARRIVAL", iso, lid, col, source_system, raw
-            ),
-            EventDebugRow(
-                hvdc_code,
-                case_no,
-                "SITE_ARRIVAL",
-                iso,
-                loc_code,
-                col,
-                source_system,
-                raw,
-            ),
+        yield EventRecord(
+            hvdc_code, case_no, "SITE_ARRIVAL", iso, lid, loc_code, col, source_system, raw
         )
 
     if customs_join:
-        att = _as_str_or_none(customs_join.get("Attestation Date"))
-        if att:
-            iso = _date_str_to_iso(att)
-            if iso and "EDAS" in locations:
-                lid = locations["EDAS"].location_id
-                yield (
-                    EventRow(
-                        hvdc_code,
-                        case_no,
-                        "CUSTOMS_START",
-                        iso,
-                        lid,
-                        "Attestation Date",
-                        "hvdc_status_json",
-                        None,
-                    ),
-                    EventDebugRow(
-                        hvdc_code,
-                        case_no,
-                        "CUSTOMS_START",
-                        iso,
-                        "EDAS",
-                        "Attestation Date",
-                        "hvdc_status_json",
-                        None,
-                    ),
-                )
-        cs = _as_str_or_none(customs_join.get("Customs Start"))
-        if cs:
-            iso = _date_str_to_iso(cs)
-            if iso and "CUSTOMS_UAE" in locations:
-                lid = locations["CUSTOMS_UAE"].location_id
-                yield (
-                    EventRow(
-                        hvdc_code,
-                        case_no,
-                        "CUSTOMS_FORMAL_START",
-                        iso,
-                        lid,
-                        "Customs Start",
-                        "hvdc_status_json",
-                        None,
-                    ),
-                    EventDebugRow(
-                        hvdc_code,
-                        case_no,
-                        "CUSTOMS_FORMAL_START",
-                        iso,
-                        "CUSTOMS_UAE",
-                        "Customs Start",
-                        "hvdc_status_json",
-                        None,
-                    ),
-                )
-        cc = _as_str_or_none(customs_join.get("Customs Close"))
-        if cc:
-            iso = _date_str_to_iso(cc)
-            if iso and "CUSTOMS_UAE" in locations:
-                lid = locations["CUSTOMS_UAE"].location_id
-                yield (
-                    EventRow(
-                        hvdc_code,
-                        case_no,
-                        "CUSTOMS_END",
-                        iso,
-                        lid,
-                        "Customs Close",
-                        "hvdc_status_json",
-                        None,
-                    ),
-                    EventDebugRow(
-                        hvdc_code,
-                        case_no,
-                        "CUSTOMS_END",
-                        iso,
-                        "CUSTOMS_UAE",
-                        "Customs Close",
-                        "hvdc_status_json",
-                        None,
-                    ),
-                )
-        do = _as_str_or_none(customs_join.get("DO Collection"))
-        if do:
-            iso = _date_str_to_iso(do)
-            if iso and "PORT_AGENT" in locations:
-                lid = locations["PORT_AGENT"].location_id
-                yield (
-                    EventRow(
-                        hvdc_code,
-                        case_no,
-                        "DO_COLLECTION",
-                        iso,
-                        lid,
-                        "DO Collection",
-                        "hvdc_status_json",
-                        None,
-                    ),
-                    EventDebugRow(
-                        hvdc_code,
-                        case_no,
-                        "DO_COLLECTION",
-                        iso,
-                        "PORT_AGENT",
-                        "DO Collection",
-                        "hvdc_status_json",
-                        None,
-                    ),
+        # (source field, event_type, location_code)
+        for fld, etype, loc_code in (
+            ("Attestation Date", "CUSTOMS_START", "EDAS"),
+            ("Customs Start", "CUSTOMS_FORMAL_START", "CUSTOMS_UAE"),
+            ("Customs Close", "CUSTOMS_END", "CUSTOMS_UAE"),
+            ("DO Collection", "DO_COLLECTION", "PORT_AGENT"),
+        ):
+            val = _as_str_or_none(customs_join.get(fld))
+            if not val:
+                continue
+            iso = _date_str_to_iso(val)
+            if iso and loc_code in locations:
+                yield EventRecord(
+                    hvdc_code,
+                    case_no,
+                    etype,
+                    iso,
+                    locations[loc_code].location_id,
+                    loc_code,
+                    fld,
+                    "hvdc_status_json",
+                    None,
                 )
 
 
+def _event_epoch_ms(e: EventRecord) -> int:
+    """이벤트 시각(epoch ms): 원천 epoch가 있으면 그대로, 없으면(통관 날짜) ISO에서 환산"""
+    if e.raw_epoch_ms is not None:
+        return e.raw_epoch_ms
+    return (datetime.fromisoformat(e.event_time_iso) - _EPOCH) // timedelta(milliseconds=1)
+
+
 def derive_out_events(
-    events_debug: List[EventDebugRow], locations: Dict[str, LocationRow]
-) -> List[Tuple[EventRow, EventDebugRow]]:
-    """WH_OUT_DERIVED / MOSB_OUT_DERIVED 생성(시간순 다음 이벤트)"""
-    out: List[Tuple[EventRow, EventDebugRow]] = []
-    by_case: Dict[Tuple[str, int], List[EventDebugRow]] = {}
-    for e in events_debug:
+    events: List[EventRecord], locations: Dict[str, LocationRow]
+) -> List[EventRecord]:
+    """
+    WH_OUT_DERIVED / MOSB_OUT_DERIVED 생성(시간순 다음 이벤트).
+    케이스별 epoch 정렬 후 역방향 1회 스윕으로, 각 WH_IN/MOSB_IN보다 늦은 첫
+    '다른 위치 또는 SITE_ARRIVAL' 이벤트 시각을 출고 시각으로 사용(O(n log n)).
+    """
+    out: List[EventRecord] = []
+    by_case: Dict[Tuple[str, int], List[EventRecord]] = {}
+    for e in events:
         by_case.setdefault((e.hvdc_code, e.case_no), []).append(e)
 
     for (hvdc_code, case_no), evs in by_case.items():
-        evs_sorted = sorted(evs, key=lambda x: x.event_time_iso)
-        for i, e in enumerate(evs_sorted):
+        if not any(e.event_type in ("WH_IN", "MOSB_IN") for e in evs):
+            continue
+        n = len(evs)
+        ts = [_event_epoch_ms(e) for e in evs]
+        order = sorted(range(n), key=ts.__getitem__)
+        evs = [evs[k] for k in order]
+        ts = [ts[k] for k in order]
+
+        # later[j]: j보다 늦은 시각의 첫 이벤트, leave[j]: j 이후 첫 (SITE_ARRIVAL 또는 j와 다른 위치) 이벤트
+        later = [n] * n
+        leave = [n] * n
+        for j in range(n - 2, -1, -1):
+            nxt = evs[j + 1]
+            later[j] = j + 1 if ts[j + 1] > ts[j] else later[j + 1]
+            if nxt.event_type == "SITE_ARRIVAL" or nxt.location_code != evs[j].location_code:
+                leave[j] = j + 1
+            else:
+                leave[j] = leave[j + 1]
+
+        for i, e in enumerate(evs):
             if e.event_type not in ("WH_IN", "MOSB_IN"):
                 continue
-            next_time = None
-            for j in range(i + 1, len(evs_sorted)):
-                e2 = evs_sorted[j]
-                if e2.event_time_iso <= e.event_time_iso:
-                    continue
-                if (
-                    e2.location_code != e.location_code
-                    or e2.event_type == "SITE_ARRIVAL"
-                ):
-                    next_time = e2.event_time_iso
-                    break
-            if not next_time:
+            k = later[i]
+            if k == n:
                 continue
+            nxt = evs[k]
+            if nxt.event_type != "SITE_ARRIVAL" and nxt.location_code == e.location_code:
+                k = leave[k]
+                if k == n:
+                    continue
 
             etype = "WH_OUT_DERIVED" if e.event_type == "WH_IN" else "MOSB_OUT_DERIVED"
             loc_code = e.location_code
             if loc_code not in locations:
                 continue
-            lid = locations[loc_code].location_id
             out.append(
-                (
-                    EventRow(
-                        hvdc_code,
-                        case_no,
-                        etype,
-                        next_time,
-                        lid,
-                        e.source_field,
-                        "derived",
-                        None,
-                    ),
-                    EventDebugRow(
-                        hvdc_code,
-                        case_no,
-                        etype,
-                        next_time,
-                        loc_code,
-                        e.source_field,
-                        "derived",
-                        None,
-                    ),
+                EventRecord(
+                    hvdc_code,
+                    case_no,
+                    etype,
+                    evs[k].event_time_iso,
+                    locations[loc_code].location_id,
+                    loc_code,
+                    e.source_field,
+                    "derived",
+                    None,
                 )
             )
     return out
 
 
+# build_flows_option_c 가 읽는 병합 레코드 필드(wh_cols/site_cols 외; MOSB는 계산기가 항상 확인)
+FLOW_INPUT_FIELDS = (
+    "MOSB",
+    "Status_Current",
+    "Status_Storage",
+    "Status_Location",
+    "ETA/ATA",
+    "_FLOW_CODE_SOURCE",
+    "Final_Location",
+)
+
+
+@dataclass(slots=True)
+class FlowState:
+    """
+    Flow 증분 재계산 상태.
+    previous: 이전 실행 상태(케이스별 presence 비트마스크/Final_Location/결과), current: 이번 실행 상태
+    """
+    previous: Optional[Dict[str, Any]] = None
+    current: Optional[Dict[str, Any]] = None
+    recomputed: int = 0
+    reused: int = 0
+
+
+def load_flow_state(path: Path) -> FlowState:
+    """상태 파일이 없거나 읽을 수 없으면 빈 상태(전체 재계산)"""
+    try:
+        previous = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        previous = None
+    return FlowState(previous=previous if isinstance(previous, dict) else None)
+
+
+def save_flow_state(path: Path, state: FlowState) -> None:
+    """임시 파일에 쓴 뒤 replace (중간에 실패해도 이전 상태 파일 유지)"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(json.dumps(state.current or {}, ensure_ascii=False), encoding="utf-8")
+    tmp.replace(path)
+
+
 def build_flows_option_c(
     merged_records: List[Dict[str, Any]],
     wh_cols: List[str],  # Flow 계산용(WAREHOUSE+MOSB만)
     site_cols: List[str],
     customs_by_hvdc: Dict[str, Dict[str, Any]],
+    flow_state: Optional[FlowState] = None,
 ) -> List[FlowRow]:
-    """Option C: Flow v3.5 재계산 + 오버라이드/리뷰 플래그"""
-    df = pd.DataFrame(merged_records)
-    if df.empty:
+    """
+    Option C: Flow v3.5 재계산 + 오버라이드/리뷰 플래그.
+    FlowRow 열은 모두 컬럼 단위(Series/ndarray)로 계산하고 마지막에 한 번만 행으로 만든다.
+    flow_state 가 주어지면 presence 비트마스크/Final_Location 이 이전 실행과 같은 케이스는
+    Flow 코드를 재사용하고, 이번 상태와 재계산/재사용 건수를 flow_state 에 기록한다.
+    """
+    ids = [_record_ids(r) for r in merged_records]
+    if not any(merged_records):
         return []
-    df = normalize_column_names(df)
+    # Flow 계산에 쓰는 열만 프레임으로 만든다(원본 JSON 열 전체를 복제하지 않음).
+    # 레코드에 없는 열은 만들지 않아 `c in df.columns` 판정은 그대로 유지된다.
+    present = set().union(*merged_records)
+    wanted = dict.fromkeys([*FLOW_INPUT_FIELDS, *wh_cols, *site_cols])
+    df = pd.DataFrame(merged_records, columns=[c for c in wanted if c in present])
+    df = normalize_column_names(df, copy=False)  # 방금 만든 프레임: 복사 없이 열만 추가
 
     # ETA/ATA 단일 ms → ATA 보조 생성(가정): Pre Arrival이면 ATA=NaN, 그 외는 ATA=ETA/ATA
     status_series = df.get("Status_Current")
@@ -848,118 +897,218 @@ def build_flows_option_c(
 
     df["ATA"] = ata_col
 
-    df_calc = calculate_flow_code_v35(
-        df, warehouse_columns=wh_cols, site_columns=site_cols
-    )
+    # 계산기 커널은 프레임을 복사하지 않고 (FLOW_CODE, FLOW_CODE_ORIG, 사유) 배열만 반환
+    if flow_state is None:
+        fc, fc_derived, calc_reason = flow_code_v35_arrays(
+            df, warehouse_columns=wh_cols, site_columns=site_cols
+        )
+    else:
+        # (hvdc_code, case_no) → JSON 배열 문자열: 값에 어떤 구분자가 있어도 키 충돌 없음
+        case_keys = [json.dumps(k, ensure_ascii=False) if k else None for k in ids]
+        fc, fc_derived, calc_reason, flow_state.current, recomputed = flow_code_v35_incremental(
+            df, wh_cols, site_cols, case_keys, flow_state.previous
+        )
+        flow_state.recomputed = int(recomputed.sum())
+        flow_state.reused = len(recomputed) - flow_state.recomputed
 
     # warehouse_count(정의: MOSB 제외 WAREHOUSE 컬럼 notna 개수)
-    wh_cnt = pd.Series(0, index=df_calc.index, dtype="int64")
+    wh_cnt = pd.Series(0, index=df.index, dtype="int64")
     for c in wh_cols:
         if c == "MOSB":
             continue
-        if c in df_calc.columns:
-            wh_cnt = wh_cnt + pd.to_numeric(df_calc[c], errors="coerce").notna().astype(
+        if c in df.columns:
+            wh_cnt = wh_cnt + pd.to_numeric(df[c], errors="coerce").notna().astype(
                 int
             )
 
-    has_mosb = pd.Series(False, index=df_calc.index)
-    if "MOSB" in df_calc.columns:
-        has_mosb = pd.to_numeric(df_calc["MOSB"], errors="coerce").notna()
+    has_mosb = pd.Series(False, index=df.index)
+    if "MOSB" in df.columns:
+        has_mosb = pd.to_numeric(df["MOSB"], errors="coerce").notna()
 
-    has_site = pd.Series(False, index=df_calc.index)
+    has_site = pd.Series(False, index=df.index)
     for c in site_cols:
-        if c in df_calc.columns:
-            has_site = has_site | pd.to_numeric(df_calc[c], errors="coerce").notna()
-
-    flow_source = pd.Series(np.nan, index=df_calc.index)
-    if "_FLOW_CODE_SOURCE" in df_calc.columns:
-        flow_source = pd.to_numeric(df_calc["_FLOW_CODE_SOURCE"], errors="coerce")
-
-    out: List[FlowRow] = []
-    for i, row in df_calc.iterrows():
-        # dict로 변환 후 _extract_ids 재사용하여 TEXT case_key 확보
-        rec = row.to_dict()
-        try:
-            hvdc_code, case_key = _extract_ids(rec)
-        except Exception:
-            continue
-
-        fc = int(row.get("FLOW_CODE") or 0)
-        derived_pre = (
-            int(row.get("FLOW_CODE_ORIG"))
-            if pd.notna(row.get("FLOW_CODE_ORIG"))
-            else None
-        )
-        src = (
-            int(flow_source.iloc[i])
-            if i < len(flow_source) and pd.notna(flow_source.iloc[i])
-            else None
-        )
-
-        override_reason = None
-        if row.get("FLOW_OVERRIDE_REASON") not in (None, "", np.nan):
-            override_reason = str(row.get("FLOW_OVERRIDE_REASON"))
-        if src is not None and src != fc and not override_reason:
-            override_reason = "FLOW_RECALC_MISMATCH"
+        if c in df.columns:
+            has_site = has_site | pd.to_numeric(df[c], errors="coerce").notna()
+
+    flow_source = pd.Series(np.nan, index=df.index)
+    if "_FLOW_CODE_SOURCE" in df.columns:
+        flow_source = pd.to_numeric(df["_FLOW_CODE_SOURCE"], errors="coerce")
+
+    has_src = flow_source.notna().to_numpy()
+    src = np.where(has_src, flow_source.fillna(0).to_numpy(), 0).astype(np.int64)
+
+    # 계산기 사유 우선, 없고 원천 FLOW_CODE와 다르면 FLOW_RECALC_MISMATCH
+    no_reason = np.array([v is None for v in calc_reason], dtype=bool)
+    mismatch = has_src & (src != fc) & no_reason
+    reason = np.where(mismatch, "FLOW_RECALC_MISMATCH", calc_reason)
+
+    # last_status: Status_Current → Status_Storage → Status_Location 중 첫 값
+    last_status = np.full(len(df), None, dtype=object)
+    for c in ("Status_Location", "Status_Storage", "Status_Current"):
+        if c in df.columns:
+            col = np.array(_none_if_na(df[c]), dtype=object)
+            present = np.array([bool(v) for v in col], dtype=bool)
+            last_status = np.where(present, col, last_status)
+
+    # customs: hvdc_code 기준 left merge(통관 날짜 ISO 변환은 코드당 1회)
+    keys = pd.DataFrame(
+        {"hvdc_code": [k[0] if k else None for k in ids]}, index=df.index
+    )
+    customs = _customs_flow_columns(customs_by_hvdc, keys["hvdc_code"].dropna().unique())
+    keys = keys.merge(customs, on="hvdc_code", how="left").set_axis(df.index)
+
+    columns = {
+        "hvdc_code": keys["hvdc_code"].tolist(),
+        "case_no": [k[1] if k else None for k in ids],
+        "flow_code": fc.tolist(),
+        "flow_code_original": [int(v) if ok else None for v, ok in zip(src.tolist(), has_src.tolist())],
+        "flow_code_derived": fc_derived.tolist(),
+        "override_reason": reason.tolist(),
+        "warehouse_count": wh_cnt.astype(np.int64).tolist(),
+        "has_mosb_leg": has_mosb.astype(bool).tolist(),
+        "has_site_arrival": has_site.astype(bool).tolist(),
+        "customs_code": _none_if_na(keys["customs_code"]),
+        "customs_start_iso": _none_if_na(keys["customs_start_iso"]),
+        "customs_end_iso": _none_if_na(keys["customs_end_iso"]),
+        "last_status": [_as_str_or_none(v) for v in last_status.tolist()],
+        "requires_review": (fc == 5).tolist(),
+    }
+    out = [
+        FlowRow(*vals)
+        for vals, k in zip(zip(*(columns[f.name] for f in fields(FlowRow))), ids)
+        if k is not None
+    ]
+    out.sort(key=lambda x: (x.hvdc_code, x.case_no))
+    return out
 
-        requires_review = bool(fc == 5)
 
-        cjoin = customs_by_hvdc.get(hvdc_code, {})
-        customs_code = _as_str_or_none(
-            cjoin.get("Custom Code") or cjoin.get("Customs Code")
-        )
-        customs_start_iso = (
-            _date_str_to_iso(str(cjoin.get("Attestation Date")))
-            if cjoin.get("Attestation Date")
-            else None
-        )
-        customs_end_iso = (
-            _date_str_to_iso(str(cjoin.get("Customs Close")))
-            if cjoin.get("Customs Close")
-            else None
-        )
+def _none_if_na(s: pd.Series) -> List[Any]:
+    """Series -> list (NaN/None/NaT -> None)"""
+    values = s.tolist()
+    return [None if m else v for v, m in zip(values, s.isna().tolist())]
 
-        last_status = _as_str_or_none(
-            row.get("Status_Current")
-            or row.get("Status_Storage")
-            or row.get("Status_Location")
-        )
 
-        out.append(
-            FlowRow(
-                hvdc_code=hvdc_code,
-                case_no=case_key,
-                flow_code=fc,
-                flow_code_original=src,
-                flow_code_derived=derived_pre,
-                override_reason=override_reason,
-                warehouse_count=int(wh_cnt.iloc[i]) if i < len(wh_cnt) else None,
-                has_mosb_leg=bool(has_mosb.iloc[i]) if i < len(has_mosb) else False,
-                has_site_arrival=bool(has_site.iloc[i]) if i < len(has_site) else False,
-                customs_code=customs_code,
-                customs_start_iso=customs_start_iso,
-                customs_end_iso=customs_end_iso,
-                last_status=last_status,
-                requires_review=requires_review,
-            )
+def _customs_flow_columns(
+    customs_by_hvdc: Dict[str, Dict[str, Any]], hvdc_codes: Iterable[str]
+) -> pd.DataFrame:
+    """FlowRow 통관 열(customs_code / customs_start_iso / customs_end_iso), hvdc_code당 1행"""
+    rows = []
+    for code in hvdc_codes:
+        cjoin = customs_by_hvdc.get(code)
+        if cjoin is None:
+            continue
+        rows.append(
+            {
+                "hvdc_code": code,
+                "customs_code": _as_str_or_none(
+                    cjoin.get("Custom Code") or cjoin.get("Customs Code")
+                ),
+                "customs_start_iso": (
+                    _date_str_to_iso(str(cjoin.get("Attestation Date")))
+                    if cjoin.get("Attestation Date")
+                    else None
+                ),
+                "customs_end_iso": (
+                    _date_str_to_iso(str(cjoin.get("Customs Close")))
+                    if cjoin.get("Customs Close")
+                    else None
+                ),
+            }
         )
-    out.sort(key=lambda x: (x.hvdc_code, x.case_no))
-    return out
+    return pd.DataFrame(
+        rows, columns=["hvdc_code", "customs_code", "customs_start_iso", "customs_end_iso"]
+    )
 
 
-def write_csv(path: Path, rows: Iterable[dict]) -> None:
+def write_csv(path: Path, rows: Iterable[dict], aliases: Iterable[Path] = (), alias_mode: str = "link") -> None:
     data = list(rows)
     path.parent.mkdir(parents=True, exist_ok=True)
-    if not data:
-        path.write_text("", encoding="utf-8")
-        return
-    with path.open("w", encoding="utf-8", newline="") as f:
+    with open_output(path, list(aliases), mode=alias_mode) as f:
+        if not data:
+            return
         w = csv.DictWriter(f, fieldnames=list(data[0].keys()))
         w.writeheader()
         for r in data:
             w.writerow({k: ("" if v is None else v) for k, v in r.items()})
 
 
+def compute_report(
+    *,
+    merge_stats: Dict[str, int],
+    all_invalid: int,
+    all_unique: int,
+    wh_invalid: int,
+    wh_unique: int,
+    merged_rows: int,
+    dedup_rows: int,
+    dup_cnt: int,
+    shipments: List[ShipmentRow],
+    cases: List[CaseRow],
+    flows: List[FlowRow],
+    events: List[EventRecord],
+    wh_cols: List[str],
+    site_cols: List[str],
+    customs_hvdc_keys: int,
+    flow_state: Optional[FlowState] = None,
+) -> Dict[str, Any]:
+    """report.json / report.md 지표 계산(케이스/플로우 조인은 키 인덱스로 O(cases + flows))"""
+    case_keys = {(c.hvdc_code, c.case_no) for c in cases}
+    ev_missing = sum(1 for e in events if (e.hvdc_code, e.case_no) not in case_keys)
+    flow_missing = sum(1 for f in flows if (f.hvdc_code, f.case_no) not in case_keys)
+
+    flow_mismatch = sum(
+        1
+        for f in flows
+        if f.flow_code_original is not None and f.flow_code_original != f.flow_code
+    )
+    flow5 = sum(1 for f in flows if f.flow_code == 5)
+
+    # 케이스별 flow_code(같은 키가 여러 번이면 첫 번째), 없으면 0
+    flow_code_by_key: Dict[Tuple[str, str], int] = {}
+    for f in flows:
+        flow_code_by_key.setdefault((f.hvdc_code, f.case_no), f.flow_code)
+    agi_das_violation = sum(
+        1
+        for c in cases
+        if (c.final_location or "").upper() in ("AGI", "DAS")
+        and flow_code_by_key.get((c.hvdc_code, c.case_no), 0) < 3
+    )
+
+    return {
+        "all_rows": merge_stats["all_rows"],
+        "all_invalid_rows": all_invalid,
+        "all_unique_case_keys": all_unique,
+        "wh_rows": merge_stats["wh_rows"],
+        "wh_unique_case_keys": wh_unique,
+        "wh_invalid_rows": wh_invalid,
+        "wh_matched": merge_stats["wh_matched"],
+        "wh_unmatched": merge_stats["wh_unmatched"],
+        "merged_rows": merged_rows,
+        "dedup_rows": dedup_rows,
+        "dedup_duplicates_removed": dup_cnt,
+        "shipments": len(shipments),
+        "cases": len(cases),
+        "ssot_cases_minus_all_unique": len(cases) - all_unique,
+        "flows": len(flows),
+        "events": len(events),
+        "events_missing_case_fk": ev_missing,
+        "flows_missing_case_fk": flow_missing,
+        "flow_mismatch_cnt": flow_mismatch,
+        "flow_mismatch_pct": round((flow_mismatch / max(len(flows), 1)) * 100.0, 2),
+        "flow5_cnt": flow5,
+        "agi_das_violation_cnt": agi_das_violation,
+        "detected_wh_cols": wh_cols,
+        "detected_site_cols": site_cols,
+        "customs_hvdc_keys": customs_hvdc_keys,
+        # 증분 Flow 재계산(--flow-state)일 때만 기록
+        **(
+            {"flow_recomputed_rows": flow_state.recomputed, "flow_reused_rows": flow_state.reused}
+            if flow_state is not None
+            else {}
+        ),
+    }
+
+
 def write_report(output_dir: Path, report: Dict[str, Any]) -> None:
     (output_dir / "report.json").write_text(
         json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8"
@@ -976,7 +1125,7 @@ def export_ttl_stub(
     output_ttl: Path,
     cases: List[CaseRow],
     flows: List[FlowRow],
-    events_dbg: List[EventDebugRow],
+    events: List[EventRecord],
 ) -> None:
     """최소 TTL export (rdflib 필요)."""
     try:
@@ -1007,7 +1156,7 @@ def export_ttl_stub(
         if f.override_reason:
             g.add((case_uri, HVDC.hasFlowOverrideReason, Literal(f.override_reason)))
 
-    for i, e in enumerate(events_dbg, start=1):
+    for i, e in enumerate(events, start=1):
         ev_uri = URIRef(f"{HVDC}event/{e.hvdc_code}/{e.case_no}/{i}")
         case_uri = URIRef(f"{HVDC}case/{e.hvdc_code}/{e.case_no}")
         g.add((ev_uri, RDF.type, HVDC.TransportEvent))
@@ -1064,30 +1213,24 @@ def run_etl(
     ontology_ttl: Optional[Path] = None,
     shapes_ttl: Optional[Path] = None,
     ttl_name: str = "hvdc_ops_data.ttl",
+    alias_mode: str = "link",
+    columnar: Optional[str] = None,
+    flow_state_path: Optional[Path] = None,
 ) -> None:
+    if columnar:
+        from columnar_io import dataclass_columns, require_pyarrow, write_table  # type: ignore
+        require_pyarrow(columnar)
     all_records = load_json_records(all_path)
     wh_records = load_json_records(wh_path) if wh_path else None
 
-    # SSOT Gate 기준치 계산(ALL unique key)
-    all_valid_keys = []
-    all_invalid = 0
-    for r in all_records:
-        try:
-            all_valid_keys.append(_extract_ids(r))
-        except Exception:
-            all_invalid += 1
-    all_unique = len(set(all_valid_keys))
+    # SSOT Gate 기준치 계산(ALL unique key); 식별키는 여기서 1회 계산해 레코드에 보관
+    all_invalid = attach_ids(all_records)
+    all_unique = len({r[IDS_KEY] for r in all_records} - {None})
 
     wh_unique = 0
     if wh_records:
-        wh_valid_keys = []
-        wh_invalid = 0
-        for r in wh_records:
-            try:
-                wh_valid_keys.append(_extract_ids(r))
-            except Exception:
-                wh_invalid += 1
-        wh_unique = len(set(wh_valid_keys))
+        wh_invalid = attach_ids(wh_records)
+        wh_unique = len({r[IDS_KEY] for r in wh_records} - {None})
     else:
         wh_invalid = 0
 
@@ -1109,111 +1252,76 @@ def run_etl(
 
     locations = build_locations(merged_dedup, wh_cols=wh_cols, site_cols=site_cols)
 
-    events: List[EventRow] = []
-    events_dbg: List[EventDebugRow] = []
+    events: List[EventRecord] = []
     for r in merged_dedup:
         source_system = str(all_path.name)
-        try:
-            hvdc_code, _ = _extract_ids(r)
-        except Exception:
-            continue
-        cjoin = customs_by_hvdc.get(hvdc_code)
-        for e, ed in iter_events(
-            r, source_system, wh_cols, site_cols, locations, customs_join=cjoin
-        ):
-            events.append(e)
-            events_dbg.append(ed)
-
-    derived = derive_out_events(events_dbg, locations)
-    for e, ed in derived:
-        events.append(e)
-        events_dbg.append(ed)
+        cjoin = customs_by_hvdc.get(r[IDS_KEY][0])
+        events.extend(
+            iter_events(r, source_system, wh_cols, site_cols, locations, customs_join=cjoin)
+        )
 
+    events.extend(derive_out_events(events, locations))
     events.sort(key=lambda x: (x.hvdc_code, x.case_no, x.event_time_iso, x.event_type))
-    events_dbg.sort(
-        key=lambda x: (x.hvdc_code, x.case_no, x.event_time_iso, x.event_type)
-    )
 
     # 원천 FLOW_CODE 보존
     for r in merged_dedup:
         r["_FLOW_CODE_SOURCE"] = r.get("FLOW_CODE")
 
+    flow_state = load_flow_state(flow_state_path) if flow_state_path else None
     flows = build_flows_option_c(
         merged_dedup,
         wh_cols=wh_flow_cols,
         site_cols=site_cols,
         customs_by_hvdc=customs_by_hvdc,
+        flow_state=flow_state,
     )
 
-    case_keys = {(c.hvdc_code, c.case_no) for c in cases}
-    ev_missing = sum(1 for e in events if (e.hvdc_code, e.case_no) not in case_keys)
-    flow_missing = sum(1 for f in flows if (f.hvdc_code, f.case_no) not in case_keys)
-
-    flow_mismatch = sum(
-        1
-        for f in flows
-        if f.flow_code_original is not None and f.flow_code_original != f.flow_code
-    )
-    flow5 = sum(1 for f in flows if f.flow_code == 5)
-    agi_das_violation = sum(
-        1
-        for c in cases
-        if (c.final_location or "").upper() in ("AGI", "DAS")
-        and next(
-            (
-                f.flow_code
-                for f in flows
-                if f.hvdc_code == c.hvdc_code and f.case_no == c.case_no
-            ),
-            0,
-        )
-        < 3
+    report = compute_report(
+        merge_stats=merge_stats,
+        all_invalid=all_invalid,
+        all_unique=all_unique,
+        wh_invalid=wh_invalid,
+        wh_unique=wh_unique,
+        merged_rows=len(merged),
+        dedup_rows=len(merged_dedup),
+        dup_cnt=dup_cnt,
+        shipments=shipments,
+        cases=cases,
+        flows=flows,
+        events=events,
+        wh_cols=wh_cols,
+        site_cols=site_cols,
+        customs_hvdc_keys=len(customs_by_hvdc),
+        flow_state=flow_state,
     )
 
-    report = {
-        "all_rows": merge_stats["all_rows"],
-        "all_invalid_rows": all_invalid,
-        "all_unique_case_keys": all_unique,
-        "wh_rows": merge_stats["wh_rows"],
-        "wh_unique_case_keys": wh_unique,
-        "wh_invalid_rows": wh_invalid,
-        "wh_matched": merge_stats["wh_matched"],
-        "wh_unmatched": merge_stats["wh_unmatched"],
-        "merged_rows": len(merged),
-        "dedup_rows": len(merged_dedup),
-        "dedup_duplicates_removed": dup_cnt,
-        "shipments": len(shipments),
-        "cases": len(cases),
-        "ssot_cases_minus_all_unique": len(cases) - all_unique,
-        "flows": len(flows),
-        "events": len(events),
-        "events_missing_case_fk": ev_missing,
-        "flows_missing_case_fk": flow_missing,
-        "flow_mismatch_cnt": flow_mismatch,
-        "flow_mismatch_pct": round((flow_mismatch / max(len(flows), 1)) * 100.0, 2),
-        "flow5_cnt": flow5,
-        "agi_das_violation_cnt": agi_das_violation,
-        "detected_wh_cols": wh_cols,
-        "detected_site_cols": site_cols,
-        "customs_hvdc_keys": len(customs_by_hvdc),
-    }
-
     output_dir.mkdir(parents=True, exist_ok=True)
+    if flow_state_path and flow_state is not None:
+        save_flow_state(flow_state_path, flow_state)
 
-    write_csv(output_dir / "shipments.csv", (asdict(x) for x in shipments))
+    # Dashboard-friendly aliases (same content): shipments_case / events_case / events_case_debug
+    write_csv(output_dir / "shipments.csv", (asdict(x) for x in shipments),
+              aliases=[output_dir / "shipments_case.csv"], alias_mode=alias_mode)
     write_csv(output_dir / "cases.csv", (asdict(x) for x in cases))
     write_csv(output_dir / "flows.csv", (asdict(x) for x in flows))
     write_csv(output_dir / "locations.csv", (asdict(x) for x in locations.values()))
-    write_csv(output_dir / "events.csv", (asdict(x) for x in events))
-    write_csv(output_dir / "events_debug.csv", (asdict(x) for x in events_dbg))
-
-    # Dashboard-friendly aliases (same content)
-    try:
-        (output_dir / "shipments_case.csv").write_text((output_dir / "shipments.csv").read_text(encoding="utf-8"), encoding="utf-8")
-        (output_dir / "events_case.csv").write_text((output_dir / "events.csv").read_text(encoding="utf-8"), encoding="utf-8")
-        (output_dir / "events_case_debug.csv").write_text((output_dir / "events_debug.csv").read_text(encoding="utf-8"), encoding="utf-8")
-    except Exception:
-        pass
+    write_csv(output_dir / "events.csv", project_events(events, EVENT_COLUMNS),
+              aliases=[output_dir / "events_case.csv"], alias_mode=alias_mode)
+    write_csv(output_dir / "events_debug.csv", project_events(events, EVENT_DEBUG_COLUMNS),
+              aliases=[output_dir / "events_case_debug.csv"], alias_mode=alias_mode)
+    if columnar:
+        for name, row_cls, items in (
+            ("shipments", ShipmentRow, shipments),
+            ("cases", CaseRow, cases),
+            ("flows", FlowRow, flows),
+            ("locations", LocationRow, locations.values()),
+        ):
+            write_table(output_dir / name, dataclass_columns(row_cls), (asdict(x) for x in items), columnar)
+        for name, row_cls, columns in (
+            ("events", EventRow, EVENT_COLUMNS),
+            ("events_debug", EventDebugRow, EVENT_DEBUG_COLUMNS),
+        ):
+            write_table(output_dir / name, dataclass_columns(row_cls), project_events(events, columns), columnar)
 
     write_report(output_dir, report)
 
@@ -1226,7 +1334,6 @@ def run_etl(
             flows=flows,
             locations=locations,
             events=events,
-            events_dbg=events_dbg,
             ontology_ttl=ontology_ttl,
             shapes_ttl=shapes_ttl,
         )
@@ -1235,16 +1342,6 @@ def run_etl(
 # - instance IRIs follow: {base_iri}/Shipment/{hvdc_code}, {base_iri}/Case/{hvdc_code}/{case_no}, ...
 # - predicates follow hvdc_ops_ontology.ttl
 # ==========================
-def _slug_token(value: str) -> str:
-    s = str(value).strip()
-    s = re.sub(r"\s+", "_", s)
-    s = re.sub(r"[^0-9A-Za-z._\-]+", "-", s)
-    return s[:180] if len(s) > 180 else s
-
-def _iri(base_iri: str, *parts: str) -> str:
-    base = base_iri.rstrip("/")
-    return base + "/" + "/".join(_slug_token(p) for p in parts)
-
 def _hash20(*vals: str) -> str:
     h = hashlib.sha256("||".join([str(v) for v in vals]).encode("utf-8")).hexdigest()
     return h[:20]
@@ -1277,8 +1374,7 @@ def export_ops_ttl_option_c(
     cases: List[CaseRow],
     flows: List[FlowRow],
     locations: Dict[str, LocationRow],
-    events: List[EventRow],
-    events_dbg: List[EventDebugRow],
+    events: List[EventRecord],
     ontology_ttl: Optional[Path] = None,
     shapes_ttl: Optional[Path] = None,
 ) -> None:
@@ -1291,11 +1387,12 @@ def export_ops_ttl_option_c(
       - Flow instances + hasFlow links
       - CaseEvent instances + hasEvent links
     """
+    # TTL 인스턴스 IRI (--export-ttl 시에만 같은 폴더의 iri_factory.py 필요)
+    from iri_factory import IriFactory  # type: ignore
+
     out_ttl.parent.mkdir(parents=True, exist_ok=True)
     hvdc_ns = base_iri.rstrip("/") + "#"
-
-    # reverse map for location_id -> location_code
-    locid_to_code = {v.location_id: v.location_code for v in locations.values()}
+    iri = IriFactory(base_iri)
 
     lines: List[str] = []
     lines.append(f"@prefix hvdc: <{hvdc_ns}> .")
@@ -1307,7 +1404,7 @@ def export_ops_ttl_option_c(
     # Locations
     for code in sorted(locations.keys()):
         l = locations[code]
-        loc_iri = f"<{_iri(base_iri, 'Location', l.location_code)}>"
+        loc_iri = iri.ref("Location", l.location_code)
         lines.append(f"{loc_iri} a hvdc:Location ;")
         lines.append(f'  hvdc:locationId "{int(l.location_id)}"^^xsd:integer ;')
         lines.append(f'  hvdc:locationCode "{_ttl_escape(l.location_code)}" ;')
@@ -1323,7 +1420,7 @@ def export_ops_ttl_option_c(
 
     # Shipments
     for s in sorted(shipments, key=lambda x: x.hvdc_code):
-        ship_iri = f"<{_iri(base_iri, 'Shipment', s.hvdc_code)}>"
+        ship_iri = iri.ref("Shipment", s.hvdc_code)
         lines.append(f"{ship_iri} a hvdc:Shipment ;")
         lines.append(f'  hvdc:hvdcCode "{_ttl_escape(s.hvdc_code)}" ;')
         if s.vendor:
@@ -1350,8 +1447,8 @@ def export_ops_ttl_option_c(
 
     # Cases + link to shipment
     for c in cases:
-        case_iri = f"<{_iri(base_iri, 'Case', c.hvdc_code, c.case_no)}>"
-        ship_iri = f"<{_iri(base_iri, 'Shipment', c.hvdc_code)}>"
+        case_iri = iri.ref("Case", c.hvdc_code, c.case_no)
+        ship_iri = iri.ref("Shipment", c.hvdc_code)
         lines.append(f"{case_iri} a hvdc:Case ;")
         lines.append(f'  hvdc:hvdcCode "{_ttl_escape(c.hvdc_code)}" ;')
         lines.append(f'  hvdc:caseNo "{_ttl_escape(c.case_no)}" ;')
@@ -1385,8 +1482,8 @@ def export_ops_ttl_option_c(
         f = flow_index.get((c.hvdc_code, c.case_no))
         if not f:
             continue
-        case_iri = f"<{_iri(base_iri, 'Case', c.hvdc_code, c.case_no)}>"
-        flow_iri = f"<{_iri(base_iri, 'Flow', c.hvdc_code, c.case_no)}>"
+        case_iri = iri.ref("Case", c.hvdc_code, c.case_no)
+        flow_iri = iri.ref("Flow", c.hvdc_code, c.case_no)
         lines.append(f"{flow_iri} a hvdc:Flow ;")
         lines.append(f'  hvdc:hvdcCode "{_ttl_escape(f.hvdc_code)}" ;')
         lines.append(f'  hvdc:caseNo "{_ttl_escape(f.case_no)}" ;')
@@ -1416,14 +1513,12 @@ def export_ops_ttl_option_c(
 
     # Events (CaseEvent)
     for e in events:
-        loc_code = locid_to_code.get(int(e.location_id))
-        if not loc_code:
-            continue
+        loc_code = e.location_code
         # deterministic id from natural key
-        hid = _hash20(e.hvdc_code, str(e.case_no), e.event_type, e.event_time_iso, loc_code, e.source_field, e.source_system)
-        ev_iri = f"<{_iri(base_iri, 'CaseEvent', e.hvdc_code, str(e.case_no), hid)}>"
-        case_iri = f"<{_iri(base_iri, 'Case', e.hvdc_code, str(e.case_no))}>"
-        loc_iri = f"<{_iri(base_iri, 'Location', loc_code)}>"
+        hid = _hash20(e.hvdc_code, e.case_no, e.event_type, e.event_time_iso, loc_code, e.source_field, e.source_system)
+        ev_iri = iri.ref("CaseEvent", e.hvdc_code, str(e.case_no), hid)
+        case_iri = iri.ref("Case", e.hvdc_code, str(e.case_no))
+        loc_iri = iri.ref("Location", loc_code)
         lines.append(f"{ev_iri} a hvdc:CaseEvent ;")
         lines.append(f'  hvdc:eventId "{hid}" ;')
         lines.append(f'  hvdc:eventType "{_ttl_escape(e.event_type)}" ;')
@@ -1480,11 +1575,36 @@ def build_arg_parser() -> argparse.ArgumentParser:
     p.add_argument("--ontology-ttl", default="", help="Path to hvdc_ops_ontology.ttl to copy next to output TTL (optional).")
     p.add_argument("--shapes-ttl", default="", help="Path to hvdc_ops_shapes.ttl to copy next to output TTL (optional).")
     p.add_argument("--ttl-name", default="hvdc_ops_data.ttl", help="TTL filename under output-dir when --export-ttl.")
+    p.add_argument(
+        "--alias-mode",
+        choices=ALIAS_MODES,
+        default="link",
+        help="How dashboard alias CSVs are written: link (hardlink, copy fallback), copy, or tee.",
+    )
+    p.add_argument(
+        "--columnar",
+        choices=COLUMNAR_FORMATS,
+        default=None,
+        help="Also write typed Parquet / Arrow IPC tables next to the CSVs (requires pyarrow).",
+    )
+    p.add_argument(
+        "--flow-state",
+        default="",
+        help="Per-case flow state JSON (presence bitmask + final location + flow result). "
+        "Read if present, rewritten after the run; only changed cases are reclassified.",
+    )
     return p
 
 
 def main() -> None:
-    args = build_arg_parser().parse_args()
+    parser = build_arg_parser()
+    args = parser.parse_args()
+    if args.columnar:
+        from columnar_io import require_pyarrow  # type: ignore
+        try:
+            require_pyarrow(args.columnar)
+        except RuntimeError as e:
+            parser.error(str(e))
     all_path = Path(args.all).expanduser().resolve()
     wh_path = Path(args.wh).expanduser().resolve() if args.wh else None
     customs_path = Path(args.customs).expanduser().resolve() if args.customs else None
@@ -1503,6 +1623,9 @@ def main() -> None:
         ontology_ttl=ontology_ttl,
         shapes_ttl=shapes_ttl,
         ttl_name=str(args.ttl_name),
+        alias_mode=str(args.alias_mode),
+        columnar=args.columnar,
+        flow_state_path=Path(args.flow_state).expanduser().resolve() if args.flow_state else None,
     )
 
 
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+호환용 alias 출력 (shipments_status.csv → shipments.csv, events.csv → events_case.csv 등)
+
+- open_output: 출력 파일을 쓰고 close 시 alias 게시 (임시 파일 → os.replace로 교체)
+- publish_alias: 이미 쓴 src의 alias로 dst 교체
+- alias 모드: link(기본, hardlink; 불가 시 copy) / copy(shutil.copyfile) / tee(한 번에 src+alias 기록)
+- alias는 항상 src와 byte 동일
+"""
+
+from __future__ import annotations
+
+import os
+import shutil
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, List, Sequence, TextIO
+
+ALIAS_MODES = ("link", "copy", "tee")
+
+
+class _TeeWriter:
+    """Minimal text sink that forwards ``write`` to several open files."""
+
+    def __init__(self, files: Sequence[TextIO]):
+        self._files = list(files)
+
+    def write(self, s: str) -> int:
+        for f in self._files:
+            f.write(s)
+        return len(s)
+
+
+def publish_alias(src: Path, dst: Path, mode: str = "link") -> str:
+    """
+    Replace ``dst`` with an alias of ``src`` and return the method used
+    (``"link"`` or ``"copy"``). The alias is created next to ``dst`` and
+    renamed into place, so readers never see a partially written file.
+    """
+    if mode not in ALIAS_MODES:
+        raise ValueError(f"unknown alias mode: {mode!r} (expected one of {ALIAS_MODES})")
+    dst.parent.mkdir(parents=True, exist_ok=True)
+    if mode == "link" and dst.exists() and os.path.samefile(src, dst):
+        # already hardlinked by a previous run (rename() onto the same inode is a no-op)
+        return "link"
+    tmp = dst.with_name(f".{dst.name}.alias-tmp")
+    if tmp.exists():
+        tmp.unlink()
+    method = "copy"
+    if mode == "link":
+        try:
+            os.link(src, tmp)
+            method = "link"
+        except OSError:
+            pass
+    if method == "copy":
+        shutil.copyfile(src, tmp)
+    os.replace(tmp, dst)
+    return method
+
+
+def _output_tmp(path: Path) -> Path:
+    return path.with_name(f".{path.name}.output-tmp")
+
+
+@contextmanager
+def open_output(
+    path: Path,
+    aliases: Sequence[Path] = (),
+    mode: str = "link",
+    encoding: str = "utf-8",
+    newline: str = "",
+) -> Iterator[TextIO]:
+    """
+    Open ``path`` for text writing; on successful close every path in
+    ``aliases`` holds the same bytes. In ``tee`` mode the aliases are written
+    alongside ``path``; otherwise they are published from the finished file.
+    Output goes to a temp file renamed over ``path`` on close, so an alias
+    hardlinked by a previous run is never truncated through the shared inode.
+    """
+    if mode not in ALIAS_MODES:
+        raise ValueError(f"unknown alias mode: {mode!r} (expected one of {ALIAS_MODES})")
+    path.parent.mkdir(parents=True, exist_ok=True)
+    targets = [path, *aliases] if mode == "tee" else [path]
+    tmps = [_output_tmp(p) for p in targets]
+    files: List[TextIO] = []
+    try:
+        for tmp in tmps:
+            tmp.parent.mkdir(parents=True, exist_ok=True)
+            files.append(tmp.open("w", encoding=encoding, newline=newline))
+        yield files[0] if len(files) == 1 else _TeeWriter(files)  # type: ignore[misc]
+    except BaseException:
+        for f in files:
+            f.close()
+        for tmp in tmps:
+            tmp.unlink(missing_ok=True)
+        raise
+    for f in files:
+        f.close()
+    # rename onto the target: a hardlinked alias from a previous run keeps the old inode
+    for tmp, target in zip(tmps, targets):
+        os.replace(tmp, target)
+    if mode != "tee":
+        for alias in aliases:
+            publish_alias(path, alias, mode)
@@ -21,11 +21,19 @@ HVDC Status(SSOT) + Warehouse(Overlay) → Supabase CSV(status.*) + OPS TTL + QA
 - out/supabase/events_status.csv
 - out/supabase/shipments.csv              (호환용 복제본)
 - out/supabase/logistics_events.csv        (호환용 복제본)
-- out/ontology/hvdc_ops_status.ttl         (OPS TTL, 기본 ON)
-- out/ontology/hvdc.ttl                    (legacy TTL, 기본 ON)
+- out/ontology/hvdc_ops_status.ttl         (OPS TTL, 기본 ON; --ttl-gzip 시 .ttl.gz)
+- out/ontology/hvdc.ttl                    (legacy TTL, 기본 ON; --ttl-gzip 시 .ttl.gz)
 - out/report/qa_report.md
 - out/report/orphan_wh.json
 
+출력(옵션: --columnar parquet|arrow 사용 시, pyarrow 필요)
+- out/supabase/shipments_status.parquet|.arrow / events_status.parquet|.arrow (typed)
+
+출력(옵션: --incremental 사용 시)
+- out/state/status_state.json              (hvdc_code별 content hash; --state-file로 변경)
+- out/supabase/delta/shipments_status_upsert.csv / events_status_upsert.csv
+- out/supabase/delta/shipments_status_delete.csv / events_status_delete.csv
+
 출력(옵션: --case-locations 사용 시)
 - out/report/status_locations_distinct.csv
 - out/report/location_match_map.csv
@@ -42,12 +50,36 @@ from __future__ import annotations
 import argparse
 import csv
 import difflib
+import gzip
+import hashlib
+import heapq
+import io
 import json
+import pickle
 import re
-from dataclasses import dataclass
+import zlib
+from collections import Counter, OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, fields
 from datetime import date, datetime, timezone
+from operator import attrgetter, itemgetter
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Optional, Tuple
+from typing import Any, Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+import numpy as np
+
+try:
+    import orjson  # optional: --fast-json
+except ImportError:
+    orjson = None
+
+# 호환용 alias 출력(같은 폴더에 output_alias.py 필요)
+from output_alias import ALIAS_MODES, open_output  # type: ignore
+# TTL 인스턴스 IRI (같은 폴더에 iri_factory.py 필요)
+from iri_factory import IriFactory  # type: ignore
+
+# Parquet/Arrow 출력 형식 (--columnar 사용 시에만 같은 폴더의 columnar_io.py + pyarrow 필요)
+COLUMNAR_FORMATS = ("parquet", "arrow")
 
 
 # -----------------------------
@@ -87,6 +119,166 @@ def load_json_any(path: Path) -> Any:
         raise ValueError(f"JSON 파싱 실패: {path} err={e}") from e
 
 
+def _is_jsonl(path: Path) -> bool:
+    """load_json_any와 동일 규칙: 처음 3줄(선행 공백 줄 제외)이 모두 { 로 시작하면 JSONL"""
+    head: List[str] = []
+    with path.open("r", encoding="utf-8", errors="replace") as f:
+        while len(head) < 3:
+            ln = f.readline(4096)
+            if not ln:
+                break
+            # 한 줄짜리 대용량 JSON도 줄 전체를 메모리에 올리지 않도록 앞부분만 보관
+            rest, blank = ln, not ln.strip()
+            while rest and not rest.endswith("\n"):
+                rest = f.readline(1 << 20)
+                blank = blank and not rest.strip()
+            if not head and blank:
+                continue
+            head.append(ln)
+    if not head:
+        raise ValueError(f"빈 파일: {path}")
+    return len(head) > 1 and all(ln.strip().startswith("{") for ln in head)
+
+
+def _iter_jsonl(path: Path) -> Iterator[Any]:
+    with path.open("r", encoding="utf-8", errors="replace") as f:
+        yield from _iter_jsonl_lines(f, path)
+
+
+def _iter_jsonl_lines(f: TextIO, path: Path, first_line: int = 1) -> Iterator[Any]:
+    """열린 JSONL stream 줄 단위 파싱 (first_line: 오류 메시지용 파일 기준 시작 줄 번호)"""
+    for i, ln in enumerate(f, first_line):
+        ln = ln.strip()
+        if not ln:
+            continue
+        try:
+            yield json.loads(ln)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"JSONL 파싱 실패: {path} line={i} err={e}") from e
+
+
+# 버퍼 끝에서 잘린 값이 raw_decode 에 주는 오류: 값 시작 위치를 가리키는 리터럴/숫자 조각
+_JSON_TAIL_PREFIXES = ("true", "false", "null", "NaN", "Infinity", "-Infinity")
+
+
+def _json_truncated(buf: str, e: json.JSONDecodeError) -> bool:
+    """raw_decode 오류가 버퍼 끝에서 값이 잘려서 난 것인지(보충 후 재시도 대상) 판정"""
+    if e.pos >= len(buf) - 1 or e.msg.startswith("Unterminated string"):
+        return True
+    if "escape" in e.msg and len(buf) - e.pos <= 6:  # \uXXXX 가 잘림
+        return True
+    tail = buf[e.pos:].rstrip()
+    if any(lit.startswith(tail) for lit in _JSON_TAIL_PREFIXES):
+        return True
+    # 1e / 1e+ / 1. 처럼 지수·소수부에서 잘린 숫자
+    return bool(re.fullmatch(r"[.eE][-+]?", tail))
+
+
+def _iter_json_array(
+    f: TextIO, path: Path, buf: str, chunk_size: int, offset: int = 0
+) -> Iterator[Any]:
+    """
+    최상위 JSON 배열을 원소 단위로 증분 파싱(buf는 '[' 다음부터, offset은 buf[0]의 파일 내 문자 위치)
+    - 버퍼 끝에서 잘린 값만 보충 후 재파싱(보충량은 버퍼 크기만큼 늘려 긴 값도 선형 비용)
+    - 그 밖의 문법 오류는 즉시 파일 기준 문자 위치와 함께 ValueError
+    """
+    decoder = json.JSONDecoder()
+    pos = 0
+    eof = False
+    expect_value = True
+    first = True
+
+    def refill(grow: bool) -> None:
+        nonlocal buf, pos, offset, eof
+        more = f.read(max(chunk_size, len(buf) - pos) if grow else chunk_size)
+        eof = not more
+        offset += pos
+        buf = buf[pos:] + more
+        pos = 0
+
+    while True:
+        while pos < len(buf) and buf[pos] in " \t\r\n":
+            pos += 1
+        if pos >= len(buf):
+            # 버퍼 소진: 다음 chunk 보충
+            if eof:
+                raise ValueError(f"JSON 파싱 실패: {path} err=배열이 닫히지 않았습니다")
+            refill(grow=False)
+            continue
+        ch = buf[pos]
+        if ch == "]" and (first or not expect_value):
+            return
+        if not expect_value:
+            if ch != ",":
+                raise ValueError(
+                    f"JSON 파싱 실패: {path} char={offset + pos} err=배열 구분자 ',' 누락"
+                )
+            pos += 1
+            expect_value = True
+            continue
+        try:
+            obj, end = decoder.raw_decode(buf, pos)
+        except json.JSONDecodeError as e:
+            if eof or not _json_truncated(buf, e):
+                raise ValueError(
+                    f"JSON 파싱 실패: {path} char={offset + e.pos} err={e.msg}"
+                ) from e
+            refill(grow=True)
+            continue
+        if end >= len(buf) and not eof:
+            # 숫자 등 경계에서 잘렸을 수 있는 값은 보충 후 재파싱
+            refill(grow=True)
+            continue
+        yield obj
+        pos = end
+        expect_value = False
+        first = False
+
+
+def iter_chunks(items: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    """items를 size개 단위 list로 묶어 순회"""
+    chunk: List[Any] = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def iter_json_records(path: Path, chunk_size: int = 1 << 20) -> Iterator[Dict[str, Any]]:
+    """
+    JSON/JSONL 레코드 스트리밍 reader (to_records(load_json_any(path))와 동일 결과)
+    - JSONL: 줄 단위 파싱
+    - JSON 배열: 원소 단위 증분 파싱(파일 전체를 메모리에 올리지 않음)
+    - JSON 객체: records/rows/data/... 래퍼 지원을 위해 전체 로드 후 to_records
+    """
+    if _is_jsonl(path):
+        for x in _iter_jsonl(path):
+            if not isinstance(x, dict):
+                raise ValueError("리스트 내부가 dict가 아닙니다.")
+            yield x
+        return
+
+    with path.open("r", encoding="utf-8", errors="replace") as f:
+        buf = f.read(chunk_size)
+        skipped = 0
+        while buf and not buf.strip():
+            skipped += len(buf)
+            buf = f.read(chunk_size)
+        lead = buf.lstrip()
+        if lead.startswith("["):
+            start = skipped + len(buf) - len(lead) + 1
+            for x in _iter_json_array(f, path, lead[1:], chunk_size, offset=start):
+                if not isinstance(x, dict):
+                    raise ValueError("리스트 내부가 dict가 아닙니다.")
+                yield x
+            return
+
+    yield from to_records(load_json_any(path))
+
+
 def to_records(obj: Any) -> List[Dict[str, Any]]:
     if isinstance(obj, list):
         if not all(isinstance(x, dict) for x in obj):
@@ -108,6 +300,45 @@ def detect_key(record: Dict[str, Any], candidates_norm: List[str]) -> Optional[s
     return None
 
 
+class SchemaResolver:
+    """
+    레코드 키 구성(shape)별 논리 필드 → 원본 키 해석 캐시
+    - fields: 논리 필드명 -> 정규화된 후보 키 목록(detect_key와 동일한 우선순위)
+    - 동일 shape(키 순서 포함)의 레코드는 norm_key 계산 없이 캐시된 결과 재사용
+    - shape 캐시 miss(희소 키 WH row 등)에도 키별 norm_key는 1회만 계산
+    """
+
+    def __init__(self, fields: Dict[str, List[str]], max_shapes: int = 4096):
+        self.fields = fields
+        self.max_shapes = max_shapes
+        self._cache: Dict[Tuple[str, ...], Dict[str, Optional[str]]] = {}
+        self._norm: Dict[str, str] = {}
+
+    def resolve(self, record: Dict[str, Any]) -> Dict[str, Optional[str]]:
+        shape = tuple(record.keys())
+        keys = self._cache.get(shape)
+        if keys is None:
+            m = {}
+            for k in shape:
+                nk = self._norm.get(k)
+                if nk is None:
+                    if len(self._norm) >= self.max_shapes * 16:
+                        self._norm.clear()
+                    nk = self._norm[k] = norm_key(k)
+                m[nk] = k
+            keys = {}
+            for name, candidates_norm in self.fields.items():
+                keys[name] = next((m[c] for c in candidates_norm if c in m), None)
+            if len(self._cache) >= self.max_shapes:
+                self._cache.clear()
+            self._cache[shape] = keys
+        return keys
+
+    def values(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        """논리 필드명 -> 값(키 미탐지 시 None)"""
+        return {name: (record.get(k) if k else None) for name, k in self.resolve(record).items()}
+
+
 def parse_int_maybe(v: Any) -> Optional[int]:
     if v is None:
         return None
@@ -165,9 +396,16 @@ def parse_epoch_ms_date(v: Any) -> Optional[date]:
         return None
 
 
-def write_csv(path: Path, headers: List[str], rows: Iterable[Dict[str, Any]]) -> None:
+def write_csv(
+    path: Path,
+    headers: List[str],
+    rows: Iterable[Dict[str, Any]],
+    aliases: Iterable[Path] = (),
+    alias_mode: str = "link",
+) -> None:
+    """aliases: 같은 내용의 호환용 파일 경로(output_alias.open_output 참고)"""
     ensure_dir(path.parent)
-    with path.open("w", newline="", encoding="utf-8") as f:
+    with open_output(path, list(aliases), mode=alias_mode) as f:
         w = csv.DictWriter(f, fieldnames=headers, extrasaction="ignore")
         w.writeheader()
         for r in rows:
@@ -178,16 +416,46 @@ def ttl_escape(s: str) -> str:
     return str(s).replace("\\", "\\\\").replace('"', '\\"')
 
 
-def _slug_token(value: str) -> str:
-    s = str(value).strip()
-    s = re.sub(r"\s+", "_", s)
-    s = re.sub(r"[^0-9A-Za-z._\\-]+", "-", s)
-    return s[:180] if len(s) > 180 else s
+class RawJsonText(str):
+    """이미 직렬화된 raw JSON (증분 실행에서 이전 snapshot 재사용분; 다시 직렬화하지 않음)"""
+
 
+def _raw_json_text(raw: Any) -> str:
+    return raw if isinstance(raw, str) else json.dumps(raw, ensure_ascii=False)
 
-def _iri(base_iri: str, *parts: str) -> str:
-    base = base_iri.rstrip("/")
-    return base + "/" + "/".join(_slug_token(p) for p in parts)
+
+class RawJsonCache:
+    """
+    raw dict → JSON 문자열을 레코드당 1회만 직렬화하여 CSV/TTL writer 간 공유
+    - key: id(raw) (raw 참조를 함께 보관하여 id 재사용 방지)
+    - fast=True: orjson 설치 시 orjson 사용(구분자 공백 없음 등 출력 형식이 stdlib json과 다름)
+    - 이미 직렬화된 raw(RawJsonText/병렬 worker가 넘긴 str; 입력 레코드는 항상 dict)는 그대로 반환
+    """
+
+    def __init__(self, fast: bool = False):
+        self.fast = bool(fast and orjson is not None)
+        self._cache: Dict[int, Tuple[Any, str]] = {}
+
+    def dumps(self, raw: Any) -> str:
+        if isinstance(raw, str):
+            return raw
+        hit = self._cache.get(id(raw))
+        if hit is not None:
+            return hit[1]
+        text = self.text(raw)
+        self._cache[id(raw)] = (raw, text)
+        return text
+
+    def text(self, raw: Any) -> str:
+        """캐시 없이 직렬화 (shard worker: 레코드를 보관하지 않고 문자열만 부모로 전달)"""
+        if isinstance(raw, str):
+            return raw
+        if self.fast:
+            return orjson.dumps(raw).decode("utf-8")
+        return json.dumps(raw, ensure_ascii=False)
+
+    def clear(self) -> None:
+        self._cache.clear()
 
 
 # -----------------------------
@@ -200,6 +468,31 @@ STATUS_BAND_KEYS = list(map(norm_key, ["BAND", "Band", "BRAND", "Brand", "Maker"
 
 WH_HVDC_KEYS = list(map(norm_key, ["HVDC CODE", "hvdc_code", "SCT SHIP NO.", "SCT SHIP NO"]))
 
+# shipments_status 컬럼 -> Status 원본 키 후보
+STATUS_FIELDS: Dict[str, List[str]] = {
+    "hvdc_code": STATUS_HVDC_KEYS,
+    "status_no": STATUS_NO_KEYS,
+    "vendor": STATUS_VENDOR_KEYS,
+    "band": STATUS_BAND_KEYS,
+    "incoterms": list(map(norm_key, ["INCOTERMS"])),
+    "currency": list(map(norm_key, ["CURRENCY"])),
+    "pol": list(map(norm_key, ["POL"])),
+    "pod": list(map(norm_key, ["POD"])),
+    "bl_awb": list(map(norm_key, ["B/L No.AWB No.", "B/L No.AWB No"])),
+    "vessel": list(map(norm_key, ["VESSEL NAME/ FLIGHT No.", "VESSEL NAME/\\nFLIGHT No.", "VESSEL NAME/ FLIGHT No"])),
+    "ship_mode": list(map(norm_key, ["SHIP MODE"])),
+    "pkg": list(map(norm_key, ["PKG"])),
+    "qty_cntr": list(map(norm_key, ["QTY OF CNTR"])),
+    "cbm": list(map(norm_key, ["CBM"])),
+    "gwt_kg": list(map(norm_key, ["GWT(KG)"])),
+    "etd": list(map(norm_key, ["ETD"])),
+    "eta": list(map(norm_key, ["ETA"])),
+    "ata": list(map(norm_key, ["ATA"])),
+}
+
+STATUS_RESOLVER = SchemaResolver(STATUS_FIELDS)
+WH_RESOLVER = SchemaResolver({"hvdc_code": WH_HVDC_KEYS})
+
 # Status/WH에서 메타(이벤트 후보에서 제외)
 META_KEYS = set(map(norm_key, [
     "No", "no.", "S No", "SNO", "S_No", "SCT SHIP NO.", "SCT SHIP NO", "HVDC CODE", "hvdc_code",
@@ -236,17 +529,72 @@ def _norm_loc_text(s: str) -> str:
     return s
 
 
+def _trigrams(s: str) -> Counter:
+    return Counter(s[i:i + 3] for i in range(len(s) - 2))
+
+
+class _AhoCorasick:
+    """다중 패턴 substring 탐색 automaton (text에 포함된 모든 패턴 id 반환)"""
+
+    def __init__(self, patterns: List[str]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[int]] = [[]]
+        for pid, pat in enumerate(patterns):
+            node = 0
+            for ch in pat:
+                nxt = self._goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[node][ch] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append([])
+                node = nxt
+            self._out[node].append(pid)
+
+        # BFS로 failure link 구성 + output 병합
+        queue = list(self._goto[0].values())
+        for node in queue:
+            for ch, nxt in self._goto[node].items():
+                f = self._fail[node]
+                while f and ch not in self._goto[f]:
+                    f = self._fail[f]
+                cand = self._goto[f].get(ch, 0)
+                self._fail[nxt] = cand if cand != nxt else 0
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+                queue.append(nxt)
+
+    def find_all(self, text: str) -> set:
+        found: set = set()
+        node = 0
+        for ch in text:
+            while node and ch not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(ch, 0)
+            if self._out[node]:
+                found.update(self._out[node])
+        return found
+
+
 class LocationMapper:
     """
     case.locations.csv 기준으로 StatusEvent.location(문자열)을 location_code로 매핑
     - locations.csv 컬럼 예상: location_code, name, hvdc_node
     """
 
-    def __init__(self, locations_csv: Optional[Path], alias_json: Optional[Path] = None):
+    def __init__(self, locations_csv: Optional[Path], alias_json: Optional[Path] = None, cache_size: int = 4096):
         self.locations_csv = locations_csv
         self.alias_json = alias_json
         self.enabled = False
 
+        # map() 결과 memo(LRU, key=normalized text)
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[str, Tuple[Optional[str], str, float]]" = OrderedDict()
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.cache_evictions = 0
+
         self.code_norm_to_code: Dict[str, str] = {}
         self.name_norm_to_code: Dict[str, str] = {}
         self.node_norm_to_code: Dict[str, str] = {}
@@ -255,8 +603,16 @@ class LocationMapper:
         # 후보 리스트(퍼지 매칭)
         self._name_candidates: List[Tuple[str, str]] = []  # (name_norm, code)
 
+        # 후보 인덱스(_build_name_index): substring automaton + trigram inverted index
+        self._name_patterns: List[str] = []  # distinct name_norm
+        self._pattern_first_idx: List[int] = []  # pattern -> 첫 후보 index(동률 시 선순위)
+        self._name_automaton: Optional[_AhoCorasick] = None
+        self._trigram_index: Dict[str, List[Tuple[int, int]]] = {}  # trigram -> [(후보 index, count)]
+        self._matchers: List[difflib.SequenceMatcher] = []  # 후보별 b=name_norm 사전 계산
+
         if locations_csv and locations_csv.exists():
             self._load_locations(locations_csv)
+            self._build_name_index()
             self.enabled = True
 
         # built-in alias (현장 데이터에서 자주 나오는 변형)
@@ -310,6 +666,87 @@ class LocationMapper:
                 if node:
                     self.node_norm_to_code[_norm_loc_text(node)] = code
 
+    def _build_name_index(self) -> None:
+        first_idx: Dict[str, int] = {}
+        for idx, (nn, _code) in enumerate(self._name_candidates):
+            if nn and nn not in first_idx:
+                first_idx[nn] = idx
+        self._name_patterns = list(first_idx.keys())
+        self._pattern_first_idx = list(first_idx.values())
+        self._name_automaton = _AhoCorasick(self._name_patterns)
+
+        self._trigram_index = {}
+        self._matchers = []
+        for idx, (nn, _code) in enumerate(self._name_candidates):
+            for g, c in _trigrams(nn).items():
+                self._trigram_index.setdefault(g, []).append((idx, c))
+            self._matchers.append(difflib.SequenceMatcher(None, "", nn))
+
+    def _match_substring(self, k: str) -> Tuple[Optional[str], int]:
+        """가장 긴 name_norm (name ⊂ text 또는 text ⊂ name), 동률이면 후보 순서 우선"""
+        best: Tuple[int, int] = (0, 0)  # (len, -idx)
+        # name ⊂ text
+        if self._name_automaton is not None:
+            for pid in self._name_automaton.find_all(k):
+                cand = (len(self._name_patterns[pid]), -self._pattern_first_idx[pid])
+                if cand > best:
+                    best = cand
+        # text ⊂ name: text의 trigram을 모두 가진 후보만 검사
+        if len(k) >= 3:
+            postings = [self._trigram_index.get(g) for g in _trigrams(k)]
+            if all(postings):
+                shortest = min(postings, key=len)
+                pool = sorted({idx for idx, _ in shortest})
+            else:
+                pool = []
+        else:
+            pool = range(len(self._name_candidates))
+        for idx in pool:
+            nn = self._name_candidates[idx][0]
+            if nn and k in nn:
+                cand = (len(nn), -idx)
+                if cand > best:
+                    best = cand
+        if not best[0]:
+            return None, 0
+        return self._name_candidates[-best[1]][1], best[0]
+
+    def _match_similarity(self, k: str, cutoff: float = 0.85) -> Tuple[Optional[str], float]:
+        """
+        SequenceMatcher ratio 최대 후보(동률이면 후보 순서 우선), cutoff 미만은 무시.
+        - q-gram lemma: ratio >= cutoff이면 공유 trigram >= max(la, lb) - 2 - 3*d
+          (d = 허용 indel 수 상한) → 미달 후보는 scoring 생략
+        - real_quick_ratio/quick_ratio 상한이 현재 best 이하인 후보도 생략
+        """
+        la = len(k)
+        shared: Counter = Counter()
+        for g, qc in _trigrams(k).items():
+            for idx, c in self._trigram_index.get(g, ()):
+                shared[idx] += min(qc, c)
+
+        best_ratio = 0.0
+        best_code: Optional[str] = None
+        for idx, (nn, code) in enumerate(self._name_candidates):
+            lb = len(nn)
+            total = la + lb
+            d_max = total - int(cutoff * total)
+            if shared[idx] < max(la, lb) - 2 - 3 * d_max:
+                continue
+            sm = self._matchers[idx]
+            sm.set_seq1(k)
+            floor = max(best_ratio, cutoff)
+            ub = sm.real_quick_ratio()
+            if ub < floor or (best_code is not None and ub <= best_ratio):
+                continue
+            ub = sm.quick_ratio()
+            if ub < floor or (best_code is not None and ub <= best_ratio):
+                continue
+            r = sm.ratio()
+            if r > best_ratio and r >= cutoff:
+                best_ratio = r
+                best_code = code
+        return best_code, best_ratio
+
     def _load_alias_json(self, path: Path) -> None:
         """
         지원 포맷:
@@ -339,6 +776,31 @@ class LocationMapper:
         if not k:
             return (None, "UNMATCHED", 0.0)
 
+        hit = self._cache.get(k)
+        if hit is not None:
+            self._cache.move_to_end(k)
+            self.cache_hits += 1
+            return hit
+
+        self.cache_misses += 1
+        result = self._map_norm(k)
+        if self.cache_size > 0:
+            self._cache[k] = result
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+                self.cache_evictions += 1
+        return result
+
+    def cache_info(self) -> Dict[str, int]:
+        return {
+            "hits": self.cache_hits,
+            "misses": self.cache_misses,
+            "evictions": self.cache_evictions,
+            "size": len(self._cache),
+            "maxsize": self.cache_size,
+        }
+
+    def _map_norm(self, k: str) -> Tuple[Optional[str], str, float]:
         # 1) alias
         if k in self.alias_norm_to_code:
             return (self.alias_norm_to_code[k], "ALIAS", 1.0)
@@ -356,27 +818,13 @@ class LocationMapper:
             return (self.node_norm_to_code[k], "NODE_EXACT", 1.0)
 
         # 5) substring match (가장 긴 name_norm)
-        best_code = None
-        best_len = 0
-        for nn, code in self._name_candidates:
-            if not nn:
-                continue
-            if nn in k or k in nn:
-                if len(nn) > best_len:
-                    best_len = len(nn)
-                    best_code = code
+        best_code, best_len = self._match_substring(k)
         if best_code:
             score = min(0.99, max(0.50, best_len / max(len(k), 1)))
             return (best_code, "NAME_SUBSTRING", float(score))
 
         # 6) similarity (SequenceMatcher)
-        best_ratio = 0.0
-        best_code2 = None
-        for nn, code in self._name_candidates:
-            r = difflib.SequenceMatcher(None, k, nn).ratio()
-            if r > best_ratio:
-                best_ratio = r
-                best_code2 = code
+        best_code2, best_ratio = self._match_similarity(k)
         if best_code2 and best_ratio >= 0.85:
             return (best_code2, "NAME_SIMILARITY", float(best_ratio))
 
@@ -386,7 +834,7 @@ class LocationMapper:
 # -----------------------------
 # Output models
 # -----------------------------
-@dataclass
+@dataclass(slots=True)
 class ShipmentOut:
     hvdc_code: str
     status_no: Optional[int]
@@ -410,10 +858,10 @@ class ShipmentOut:
     warehouse_last_location: Optional[str]
     warehouse_last_location_code: Optional[str]
     warehouse_last_date: Optional[date]
-    raw: Dict[str, Any]
+    raw: Dict[str, Any]  # 증분 실행 재사용분은 RawJsonText
 
 
-@dataclass
+@dataclass(slots=True)
 class EventOut:
     event_id: str
     hvdc_code: str
@@ -424,14 +872,14 @@ class EventOut:
     location_match_score: Optional[float]
     event_date: date
     source: str
-    raw: Dict[str, Any]
+    raw: Dict[str, Any]  # 증분 실행 재사용분은 RawJsonText
 
 
 # -----------------------------
 # Extractors
 # -----------------------------
 def get_status_hvdc_code(r: Dict[str, Any]) -> str:
-    k = detect_key(r, STATUS_HVDC_KEYS)
+    k = STATUS_RESOLVER.resolve(r)["hvdc_code"]
     if not k:
         raise ValueError(f"Status에서 HVDC 코드 키 탐지 실패. keys={list(r.keys())[:20]}")
     v = str(r.get(k, "")).strip()
@@ -441,7 +889,7 @@ def get_status_hvdc_code(r: Dict[str, Any]) -> str:
 
 
 def get_wh_hvdc_code(r: Dict[str, Any]) -> Optional[str]:
-    k = detect_key(r, WH_HVDC_KEYS)
+    k = WH_RESOLVER.resolve(r)["hvdc_code"]
     if not k:
         return None
     v = str(r.get(k, "")).strip()
@@ -449,21 +897,24 @@ def get_wh_hvdc_code(r: Dict[str, Any]) -> Optional[str]:
 
 
 def get_status_no(r: Dict[str, Any]) -> Optional[int]:
-    k = detect_key(r, STATUS_NO_KEYS)
+    k = STATUS_RESOLVER.resolve(r)["status_no"]
     return parse_int_maybe(r.get(k)) if k else None
 
 
-def get_str(r: Dict[str, Any], keys_norm: List[str]) -> Optional[str]:
-    k = detect_key(r, keys_norm)
-    if not k:
-        return None
-    v = r.get(k)
+def clean_str(v: Any) -> Optional[str]:
     if v is None:
         return None
     s = str(v).strip()
     return s if s and s.lower() != "nan" else None
 
 
+def get_str(r: Dict[str, Any], keys_norm: List[str]) -> Optional[str]:
+    k = detect_key(r, keys_norm)
+    if not k:
+        return None
+    return clean_str(r.get(k))
+
+
 def classify_event_type(loc: str) -> str:
     n = norm_key(loc)
     # SITE
@@ -498,6 +949,299 @@ def extract_location_dates_from_wh_row(row: Dict[str, Any]) -> List[Tuple[str, d
     return out
 
 
+# -----------------------------
+# WH columnar date extraction (NumPy)
+# -----------------------------
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+_MAX_EPOCH_DAY = date(9999, 12, 31).toordinal() - _EPOCH_ORDINAL
+_MS_PER_DAY = 86_400_000
+NO_DAY = np.iinfo(np.int64).min  # "날짜 아님" sentinel (epoch day)
+
+_CELL_POS_BITS = 16  # cell 순서 key = (row_idx << 16) | row 내 key 위치
+_SHORT_CELL = 24  # 이 길이 이하 문자열만 고정폭 배열로 일괄 판별
+_PLAIN_TYPES = frozenset({str, int, float, bool, type(None)})
+_DAYS_IN_MONTH = np.array([0, 31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31], dtype=np.int64)
+
+# WH 원본 키 -> location_text (META 키/빈 키는 None); 키별 1회만 분류, _WH_KEY_LOCATION_MAX개 도달 시 clear
+_WH_KEY_LOCATION: Dict[Any, Optional[str]] = {}
+_WH_KEY_LOCATION_MAX = 16384
+
+
+def epoch_day_to_date(day: int) -> date:
+    return date.fromordinal(_EPOCH_ORDINAL + int(day))
+
+
+def _scalar_epoch_day(v: Any) -> int:
+    d = parse_date_iso_maybe(v) or parse_epoch_ms_date(v)
+    return d.toordinal() - _EPOCH_ORDINAL if d else NO_DAY
+
+
+def wh_cell_epoch_days(values: List[Any]) -> np.ndarray:
+    """
+    WH location 컬럼 값 → epoch day(int64) 배열 (날짜 아님 = NO_DAY)
+    - `parse_date_iso_maybe(v) or parse_epoch_ms_date(v)`와 동일 결과
+    - ASCII ISO(YYYY-MM-DD)/숫자(epoch ms) 값은 NumPy로 일괄 변환, 그 외 숫자 포함 값만 셀 단위 fallback
+    """
+    n = len(values)
+    out = np.full(n, NO_DAY, dtype=np.int64)
+    if n == 0:
+        return out
+    if not set(map(type, values)) <= _PLAIN_TYPES:
+        return np.fromiter(map(_scalar_epoch_day, values), dtype=np.int64, count=n)
+
+    text = np.fromiter(values, dtype=object, count=n).astype(str)  # == str(v)
+    lengths = np.char.str_len(text)  # np.char: numpy 1.x/2.x 공통
+    short = np.flatnonzero(lengths <= _SHORT_CELL)
+    fallback = [np.flatnonzero(lengths > _SHORT_CELL)]
+
+    cells = text[short].astype(f"U{_SHORT_CELL}")
+    chars = cells.view(np.uint32).reshape(len(short), _SHORT_CELL)
+    # 비ASCII/제어문자/내부 NUL은 str.strip()/\d 의미가 달라질 수 있으므로 fallback
+    odd = ((chars > 126) | ((chars < 32) & (chars != 0))).any(axis=1)
+    odd |= ((chars[:, :-1] == 0) & (chars[:, 1:] != 0)).any(axis=1)
+    fallback.append(short[odd])
+    short = short[~odd]
+
+    cells = np.char.strip(text[short].astype(f"U{_SHORT_CELL}"), " ").astype(f"U{_SHORT_CELL}")
+    chars = cells.view(np.uint32).reshape(len(short), _SHORT_CELL).astype(np.int64)
+    size = (chars != 0).sum(axis=1)
+    digit = (chars >= 48) & (chars <= 57)
+    dot = chars == 46
+    inside = np.arange(_SHORT_CELL) < size[:, None]
+    has_digit = digit.any(axis=1)
+
+    # ISO: ####-##-##
+    iso = (size == 10) & (chars[:, 4] == 45) & (chars[:, 7] == 45) & digit[:, [0, 1, 2, 3, 5, 6, 8, 9]].all(axis=1)
+    val = chars - 48
+    y = val[:, 0] * 1000 + val[:, 1] * 100 + val[:, 2] * 10 + val[:, 3]
+    m = val[:, 5] * 10 + val[:, 6]
+    d = val[:, 8] * 10 + val[:, 9]
+    month_ok = (m >= 1) & (m <= 12)
+    leap = (y % 4 == 0) & ((y % 100 != 0) | (y % 400 == 0))
+    dim = _DAYS_IN_MONTH[np.where(month_ok, m, 0)] + (leap & (m == 2))
+    iso_ok = iso & (y >= 1) & month_ok & (d >= 1) & (d <= dim)
+    out[short[iso_ok]] = cells[iso_ok].astype("datetime64[D]").astype(np.int64)
+
+    # epoch ms: 숫자(소수부 허용) → 정수부
+    int_len = np.where(dot.any(axis=1), dot.argmax(axis=1), size)
+    numeric = has_digit & ~iso & (digit | dot | ~inside).all(axis=1) & (dot.sum(axis=1) <= 1)
+    numeric &= (int_len >= 1) & (int_len <= 18) & ((int_len == size) | (int_len < size - 1))
+    exp = int_len[:, None] - 1 - np.arange(_SHORT_CELL)
+    ms = np.where(exp >= 0, val * (10 ** np.clip(exp, 0, 18)), 0).sum(axis=1)
+    days = ms // _MS_PER_DAY
+    epoch_ok = numeric & (ms >= 10**11) & (days <= _MAX_EPOCH_DAY)
+    out[short[epoch_ok]] = days[epoch_ok]
+
+    fallback.append(short[has_digit & ~iso & ~numeric])
+    for i in np.concatenate(fallback):
+        out[i] = _scalar_epoch_day(values[i])
+    return out
+
+
+def _wh_key_location(k: Any) -> Optional[str]:
+    loc = _WH_KEY_LOCATION.get(k, "")
+    if loc == "":
+        loc = None if norm_key(k) in META_KEYS else (str(k).strip() or None)
+        if len(_WH_KEY_LOCATION) >= _WH_KEY_LOCATION_MAX:
+            _WH_KEY_LOCATION.clear()
+        _WH_KEY_LOCATION[k] = loc
+    return loc
+
+
+def extract_location_days_columnar(rows: List[Dict[str, Any]]) -> Tuple[List[str], np.ndarray, np.ndarray, np.ndarray]:
+    """
+    WH row 묶음 → (locs, row_idx, loc_idx, days)
+    - key shape별 location 컬럼 위치를 1회 분류한 뒤 location 컬럼 값만 모아 컬럼 단위로 일괄 변환
+    - 결과는 cell 순서(row, row 내 key 순서)로 정렬: row마다 extract_location_dates_from_wh_row를 호출한 결과와 동일
+    """
+    locs: List[str] = []
+    loc_ids: Dict[str, int] = {}
+    plans: Dict[Tuple[Any, ...], List[Tuple[int, int]]] = {}  # shape -> [(pos, loc_id)]
+    col_vals: List[List[Any]] = []
+    col_cells: List[List[int]] = []
+
+    for i, row in enumerate(rows):
+        shape = tuple(row)
+        plan = plans.get(shape)
+        if plan is None:
+            plan = []
+            for pos, k in enumerate(shape):
+                loc = _wh_key_location(k)
+                if loc is None:
+                    continue
+                if loc not in loc_ids:
+                    loc_ids[loc] = len(locs)
+                    locs.append(loc)
+                    col_vals.append([])
+                    col_cells.append([])
+                plan.append((pos, loc_ids[loc]))
+            if len(plans) >= 4096:
+                plans.clear()
+            plans[shape] = plan
+        if not plan:
+            continue
+        vals = tuple(row.values())
+        base = i << _CELL_POS_BITS
+        for pos, lid in plan:
+            col_vals[lid].append(vals[pos])
+            col_cells[lid].append(base | pos)
+
+    parts_cell: List[np.ndarray] = []
+    parts_loc: List[np.ndarray] = []
+    parts_day: List[np.ndarray] = []
+    for lid, vals in enumerate(col_vals):
+        days = wh_cell_epoch_days(vals)
+        hit = days != NO_DAY
+        if not hit.any():
+            continue
+        parts_cell.append(np.asarray(col_cells[lid], dtype=np.int64)[hit])
+        parts_loc.append(np.full(int(hit.sum()), lid, dtype=np.int64))
+        parts_day.append(days[hit])
+
+    if not parts_cell:
+        empty = np.zeros(0, dtype=np.int64)
+        return locs, empty, empty, empty
+    cells = np.concatenate(parts_cell)
+    order = np.argsort(cells, kind="stable")
+    return locs, cells[order] >> _CELL_POS_BITS, np.concatenate(parts_loc)[order], np.concatenate(parts_day)[order]
+
+
+# -----------------------------
+# WH overlay aggregation
+# -----------------------------
+class LocationAcc:
+    """(hvdc_code, location_text) 집계값: epoch day 기준 min/max + count"""
+
+    __slots__ = ("min_day", "max_day", "count")
+
+    def __init__(self, min_day: int, max_day: int, count: int):
+        self.min_day = min_day
+        self.max_day = max_day
+        self.count = count
+
+    def merge(self, other: "LocationAcc") -> None:
+        if other.min_day < self.min_day:
+            self.min_day = other.min_day
+        if other.max_day > self.max_day:
+            self.max_day = other.max_day
+        self.count += other.count
+
+
+class LastLocation:
+    """hvdc_code별 마지막 위치(최대 날짜, 동률이면 먼저 나온 cell)"""
+
+    __slots__ = ("day", "location")
+
+    def __init__(self, day: int, location: str):
+        self.day = day
+        self.location = location
+
+
+class WhOverlayAgg:
+    """
+    WH overlay 집계를 한 구조로 보관
+    - groups: (hvdc_code, location_text) -> LocationAcc (첫 등장 순서)
+    - last: hvdc_code -> LastLocation
+    - codes/rows_in/rows_skipped: QA용 입력 통계
+    merge()는 먼저 처리된 shard 쪽에 나중 shard를 합치는 순서로 호출하면 순차 처리와 동일한 결과
+    """
+
+    def __init__(self) -> None:
+        self.groups: Dict[Tuple[str, str], LocationAcc] = {}
+        self.last: Dict[str, LastLocation] = {}
+        self.codes: set = set()
+        self.rows_in = 0
+        self.rows_skipped = 0
+
+    def add_rows(self, chunk: List[Dict[str, Any]]) -> None:
+        """WH row 묶음을 컬럼 단위로 변환하여 (hvdc_code, location) 그룹 reduction"""
+        self.rows_in += len(chunk)
+        rows: List[Dict[str, Any]] = []
+        row_codes: List[str] = []
+        for row in chunk:
+            code = get_wh_hvdc_code(row)
+            if not code:
+                self.rows_skipped += 1
+                continue
+            self.codes.add(code)
+            rows.append(row)
+            row_codes.append(code)
+
+        locs, row_idx, loc_idx, days = extract_location_days_columnar(rows)
+        if not len(days):
+            return
+        code_ids: Dict[str, int] = {}
+        row_cid = np.fromiter((code_ids.setdefault(c, len(code_ids)) for c in row_codes), dtype=np.int64, count=len(row_codes))
+        codes = list(code_ids)
+        cid = row_cid[row_idx]
+
+        groups, first, inv = np.unique(cid * len(locs) + loc_idx, return_index=True, return_inverse=True)
+        g_min = np.full(len(groups), np.iinfo(np.int64).max, dtype=np.int64)
+        g_max = np.full(len(groups), NO_DAY, dtype=np.int64)
+        np.minimum.at(g_min, inv, days)
+        np.maximum.at(g_max, inv, days)
+        g_cnt = np.bincount(inv, minlength=len(groups))
+        for g in np.argsort(first, kind="stable"):  # 첫 등장 순서 유지
+            key = (codes[groups[g] // len(locs)], locs[groups[g] % len(locs)])
+            self._merge_group(key, LocationAcc(int(g_min[g]), int(g_max[g]), int(g_cnt[g])))
+
+        # 최대 날짜, 동률이면 먼저 나온 cell
+        cell = np.arange(len(days))
+        order = np.lexsort((cell, -days, cid))
+        head = order[np.r_[True, cid[order][1:] != cid[order][:-1]]]
+        first_cell = np.full(len(codes), len(days), dtype=np.int64)
+        np.minimum.at(first_cell, cid, cell)
+        for i in head[np.argsort(first_cell[cid[head]], kind="stable")]:
+            self._merge_last(codes[cid[i]], LastLocation(int(days[i]), locs[loc_idx[i]]))
+
+    def merge(self, other: "WhOverlayAgg") -> None:
+        """다른 shard(이 shard 이후에 처리된 것으로 간주)의 집계를 합침"""
+        for key, acc in other.groups.items():
+            self._merge_group(key, LocationAcc(acc.min_day, acc.max_day, acc.count))
+        for code, last in other.last.items():
+            self._merge_last(code, last)
+        self.codes |= other.codes
+        self.rows_in += other.rows_in
+        self.rows_skipped += other.rows_skipped
+
+    def pack_shards(self, n_shards: int) -> List[bytes]:
+        """
+        hvdc_code shard별 부분 집계를 pickle bytes로 분리 (병렬 build의 구간 worker → shard worker 전달용)
+        - 각 bytes: (groups [(code, loc, min_day, max_day, count)], last [(code, day, loc)], codes)
+        """
+        parts: List[Tuple[list, list, list]] = [([], [], []) for _ in range(n_shards)]
+        shard_ids: Dict[str, int] = {}
+        for code in self.codes:
+            shard = shard_ids[code] = shard_of(code, n_shards)
+            parts[shard][2].append(code)
+        for (code, loc), acc in self.groups.items():
+            parts[shard_ids[code]][0].append((code, loc, acc.min_day, acc.max_day, acc.count))
+        for code, last in self.last.items():
+            parts[shard_ids[code]][1].append((code, last.day, last.location))
+        return [pickle.dumps(part, protocol=pickle.HIGHEST_PROTOCOL) for part in parts]
+
+    def merge_packed(self, packed: bytes) -> None:
+        """pack_shards() 결과 1개를 합침 (merge()와 같은 순서 규칙; rows_in/rows_skipped는 별도 집계)"""
+        groups, last, codes = pickle.loads(packed)
+        for code, loc, min_day, max_day, count in groups:
+            self._merge_group((code, loc), LocationAcc(min_day, max_day, count))
+        for code, day, loc in last:
+            self._merge_last(code, LastLocation(day, loc))
+        self.codes.update(codes)
+
+    def _merge_group(self, key: Tuple[str, str], acc: LocationAcc) -> None:
+        cur = self.groups.get(key)
+        if cur is None:
+            self.groups[key] = acc
+        else:
+            cur.merge(acc)
+
+    def _merge_last(self, code: str, last: LastLocation) -> None:
+        cur = self.last.get(code)
+        if cur is None or last.day > cur.day:
+            self.last[code] = last
+
+
 # -----------------------------
 # DDL generator (status schema)
 # -----------------------------
@@ -568,53 +1312,119 @@ alter table status.events_status add column if not exists location_match_score n
 # -----------------------------
 # TTL writers
 # -----------------------------
-def write_legacy_ttl(path: Path, shipments: List[ShipmentOut], events: List[EventOut]) -> None:
+class TurtleWriter:
+    """
+    Turtle 스트리밍 출력: subject block 단위로 파일에 바로 기록(문서 전체를 메모리에 두지 않음)
+    - 출력 바이트는 모든 line을 모아 "\n".join 하던 방식과 동일
+    - path가 .gz로 끝나면 gzip(mtime=0, 재실행 시 동일 바이트)
+    """
+
+    def __init__(self, path: Path, buffer_size: int = 1 << 20):
+        ensure_dir(path.parent)
+        self.path = path
+        self._raw = path.open("wb", buffering=buffer_size)
+        self._gz: Optional[gzip.GzipFile] = None
+        sink: Any = self._raw
+        if path.suffix == ".gz":
+            self._gz = gzip.GzipFile(filename=path.stem, mode="wb", fileobj=self._raw, mtime=0)
+            sink = self._gz
+        self._f = io.TextIOWrapper(sink, encoding="utf-8", write_through=False)
+        self._first = True
+
+    def write_lines(self, lines: List[str]) -> None:
+        if not lines:
+            return
+        if not self._first:
+            self._f.write("\n")
+        self._first = False
+        self._f.write("\n".join(lines))
+
+    def close(self) -> None:
+        self._f.flush()
+        self._f.detach()
+        if self._gz is not None:
+            self._gz.close()
+        self._raw.close()
+
+    def __enter__(self) -> "TurtleWriter":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+
+def write_legacy_ttl(
+    path: Path,
+    shipments: Iterable[ShipmentOut],
+    events: Iterable[EventOut],
+    raw_json: Optional[RawJsonCache] = None,
+    include_raw: bool = True,
+) -> None:
     """
     기존 hvdc.ttl 호환(간단)
+    - include_raw=False: hvdc:rawJson 생략
     """
-    ensure_dir(path.parent)
-    lines: List[str] = []
-    lines.append("@prefix hvdc: <https://example.com/hvdc#> .")
-    lines.append("@prefix xsd:  <http://www.w3.org/2001/XMLSchema#> .")
-    lines.append("")
-
-    for sh in shipments:
-        subj = f"hvdc:Shipment_{ttl_escape(sh.hvdc_code)}"
-        lines.append(f"{subj} a hvdc:Shipment ;")
-        lines.append(f'  hvdc:hvdcCode "{ttl_escape(sh.hvdc_code)}" ;')
-        if sh.status_no is not None:
-            lines.append(f'  hvdc:statusNo "{sh.status_no}"^^xsd:integer ;')
-        lines.append(f'  hvdc:warehouseFlag "{str(sh.warehouse_flag).lower()}"^^xsd:boolean ;')
-        if sh.warehouse_last_location:
-            lines.append(f'  hvdc:warehouseLastLocation "{ttl_escape(sh.warehouse_last_location)}" ;')
-        if sh.warehouse_last_date:
-            lines.append(f'  hvdc:warehouseLastDate "{sh.warehouse_last_date.isoformat()}"^^xsd:date ;')
-        lines.append(f'  hvdc:rawJson """{json.dumps(sh.raw, ensure_ascii=False)}""" .')
-        lines.append("")
-
-    for ev in events:
-        subj = f"hvdc:Event_{ttl_escape(ev.event_id)}"
-        sh_ref = f"hvdc:Shipment_{ttl_escape(ev.hvdc_code)}"
-        lines.append(f"{subj} a hvdc:LogisticsEvent ;")
-        lines.append(f"  hvdc:forShipment {sh_ref} ;")
-        lines.append(f'  hvdc:eventType "{ttl_escape(ev.event_type)}" ;')
-        lines.append(f'  hvdc:location "{ttl_escape(ev.location)}" ;')
-        lines.append(f'  hvdc:eventDate "{ev.event_date.isoformat()}"^^xsd:date ;')
-        lines.append(f'  hvdc:source "{ttl_escape(ev.source)}" ;')
-        lines.append(f'  hvdc:rawJson """{json.dumps(ev.raw, ensure_ascii=False)}""" .')
-        lines.append("")
-
-    path.write_text("\n".join(lines), encoding="utf-8")
-
-
-def write_ops_ttl_status(path: Path, shipments: List[ShipmentOut], events: List[EventOut], base_iri: str, locations_csv: Optional[Path]) -> None:
+    raw_json = raw_json or RawJsonCache()
+    with TurtleWriter(path) as out:
+        out.write_lines([
+            "@prefix hvdc: <https://example.com/hvdc#> .",
+            "@prefix xsd:  <http://www.w3.org/2001/XMLSchema#> .",
+            "",
+        ])
+
+        for sh in shipments:
+            subj = f"hvdc:Shipment_{ttl_escape(sh.hvdc_code)}"
+            lines = [f"{subj} a hvdc:Shipment ;"]
+            lines.append(f'  hvdc:hvdcCode "{ttl_escape(sh.hvdc_code)}" ;')
+            if sh.status_no is not None:
+                lines.append(f'  hvdc:statusNo "{sh.status_no}"^^xsd:integer ;')
+            lines.append(f'  hvdc:warehouseFlag "{str(sh.warehouse_flag).lower()}"^^xsd:boolean ;')
+            if sh.warehouse_last_location:
+                lines.append(f'  hvdc:warehouseLastLocation "{ttl_escape(sh.warehouse_last_location)}" ;')
+            if sh.warehouse_last_date:
+                lines.append(f'  hvdc:warehouseLastDate "{sh.warehouse_last_date.isoformat()}"^^xsd:date ;')
+            if include_raw:
+                lines.append(f'  hvdc:rawJson """{raw_json.dumps(sh.raw)}""" .')
+            else:
+                lines[-1] = lines[-1].rstrip(" ;") + " ."
+            lines.append("")
+            out.write_lines(lines)
+
+        for ev in events:
+            subj = f"hvdc:Event_{ttl_escape(ev.event_id)}"
+            sh_ref = f"hvdc:Shipment_{ttl_escape(ev.hvdc_code)}"
+            lines = [f"{subj} a hvdc:LogisticsEvent ;"]
+            lines.append(f"  hvdc:forShipment {sh_ref} ;")
+            lines.append(f'  hvdc:eventType "{ttl_escape(ev.event_type)}" ;')
+            lines.append(f'  hvdc:location "{ttl_escape(ev.location)}" ;')
+            lines.append(f'  hvdc:eventDate "{ev.event_date.isoformat()}"^^xsd:date ;')
+            lines.append(f'  hvdc:source "{ttl_escape(ev.source)}" ;')
+            if include_raw:
+                lines.append(f'  hvdc:rawJson """{raw_json.dumps(ev.raw)}""" .')
+            else:
+                lines[-1] = lines[-1].rstrip(" ;") + " ."
+            lines.append("")
+            out.write_lines(lines)
+
+
+def write_ops_ttl_status(
+    path: Path,
+    shipments: Iterable[ShipmentOut],
+    events: Iterable[EventOut],
+    base_iri: str,
+    locations_csv: Optional[Path],
+    raw_json: Optional[RawJsonCache] = None,
+    include_raw: bool = True,
+) -> None:
     """
     OPS TTL (hvdc_ops_ontology.ttl 정렬) — Status 레이어 인스턴스
     - Location 인스턴스(옵션): locations_csv가 있으면 함께 출력
     - StatusEvent는 locationText 유지 + 매핑되면 hvdc:atLocation 링크 추가
+    - include_raw=False: hvdc:rawJson 생략
     """
-    ensure_dir(path.parent)
     hvdc_ns = base_iri.rstrip("/") + "#"
+    iri = IriFactory(base_iri)
+    raw_json = raw_json or RawJsonCache()
 
     # load locations rows for instance export
     loc_rows: List[Dict[str, str]] = []
@@ -622,94 +1432,111 @@ def write_ops_ttl_status(path: Path, shipments: List[ShipmentOut], events: List[
         with locations_csv.open("r", encoding="utf-8", errors="replace", newline="") as f:
             loc_rows = list(csv.DictReader(f))
 
-    lines: List[str] = []
-    lines.append(f"@prefix hvdc: <{hvdc_ns}> .")
-    lines.append("@prefix xsd:  <http://www.w3.org/2001/XMLSchema#> .")
-    lines.append("")
-    lines.append("# Instance data (Status SSOT layer)")
-    lines.append("")
-
-    # Locations
-    for r in loc_rows:
-        code = str(r.get("location_code") or "").strip()
-        if not code:
-            continue
-        loc_iri = f"<{_iri(base_iri, 'Location', code)}>"
-        lines.append(f"{loc_iri} a hvdc:Location ;")
-        lines.append(f'  hvdc:locationCode "{ttl_escape(code)}" ;')
-        name = str(r.get("name") or "").strip()
-        if name:
-            lines.append(f'  hvdc:locationName "{ttl_escape(name)}" ;')
-        cat = str(r.get("category") or "").strip()
-        if cat:
-            lines.append(f'  hvdc:locationCategory "{ttl_escape(cat)}" ;')
-        node = str(r.get("hvdc_node") or "").strip()
-        if node:
-            lines.append(f'  hvdc:hvdcNode "{ttl_escape(node)}" ;')
-        # bools
-        for k, pred in [("is_mosb","hvdc:isMosb"),("is_site","hvdc:isSite"),("is_port","hvdc:isPort"),("active","hvdc:active")]:
-            v = str(r.get(k) or "").strip().lower()
-            if v in ("true","false","1","0","yes","no","y","n","t","f"):
-                b = "true" if v in ("true","1","yes","y","t") else "false"
-                lines.append(f'  {pred} "{b}"^^xsd:boolean ;')
-        lines[-1] = lines[-1].rstrip(" ;") + " ."
-        lines.append("")
-
-    # Shipments
-    for sh in shipments:
-        ship_iri = f"<{_iri(base_iri, 'Shipment', sh.hvdc_code)}>"
-        lines.append(f"{ship_iri} a hvdc:Shipment ;")
-        lines.append(f'  hvdc:hvdcCode "{ttl_escape(sh.hvdc_code)}" ;')
-        if sh.status_no is not None:
-            lines.append(f'  hvdc:statusNo "{int(sh.status_no)}"^^xsd:integer ;')
-        if sh.vendor:
-            lines.append(f'  hvdc:vendor "{ttl_escape(sh.vendor)}" ;')
-        if sh.band:
-            lines.append(f'  hvdc:band "{ttl_escape(sh.band)}" ;')
-        if sh.incoterms:
-            lines.append(f'  hvdc:incoterms "{ttl_escape(sh.incoterms)}" ;')
-        if sh.currency:
-            lines.append(f'  hvdc:currency "{ttl_escape(sh.currency)}" ;')
-        if sh.pol:
-            lines.append(f'  hvdc:pol "{ttl_escape(sh.pol)}" ;')
-        if sh.pod:
-            lines.append(f'  hvdc:pod "{ttl_escape(sh.pod)}" ;')
-        lines.append(f'  hvdc:warehouseFlag "{str(sh.warehouse_flag).lower()}"^^xsd:boolean ;')
-        if sh.warehouse_last_location:
-            lines.append(f'  hvdc:warehouseLastLocation "{ttl_escape(sh.warehouse_last_location)}" ;')
-        if sh.warehouse_last_date:
-            lines.append(f'  hvdc:warehouseLastDate "{sh.warehouse_last_date.isoformat()}"^^xsd:date ;')
-        lines.append(f'  hvdc:rawJson """{json.dumps(sh.raw, ensure_ascii=False)}""" .')
-        lines.append("")
-
-    # Events
-    for ev in events:
-        ev_iri = f"<{_iri(base_iri, 'StatusEvent', ev.event_id)}>"
-        ship_iri = f"<{_iri(base_iri, 'Shipment', ev.hvdc_code)}>"
-        lines.append(f"{ev_iri} a hvdc:StatusEvent ;")
-        lines.append(f'  hvdc:eventId "{ttl_escape(ev.event_id)}" ;')
-        lines.append(f'  hvdc:eventType "{ttl_escape(ev.event_type)}" ;')
-        lines.append(f'  hvdc:eventDate "{ev.event_date.isoformat()}"^^xsd:date ;')
-        lines.append(f'  hvdc:sourceSystem "{ttl_escape(ev.source)}" ;')
-        if ev.location:
-            lines.append(f'  hvdc:locationText "{ttl_escape(ev.location)}" ;')
-        if ev.location_code:
-            loc_iri = f"<{_iri(base_iri, 'Location', ev.location_code)}>"
-            lines.append(f"  hvdc:atLocation {loc_iri} ;")
-        lines.append(f"  hvdc:forShipment {ship_iri} ;")
-        lines.append(f'  hvdc:rawJson """{json.dumps(ev.raw, ensure_ascii=False)}""" .')
-        lines.append("")
-        # link from Shipment
-        lines.append(f"{ship_iri} hvdc:hasStatusEvent {ev_iri} .")
-        lines.append("")
-
-    path.write_text("\n".join(lines), encoding="utf-8")
+    with TurtleWriter(path) as out:
+        out.write_lines([
+            f"@prefix hvdc: <{hvdc_ns}> .",
+            "@prefix xsd:  <http://www.w3.org/2001/XMLSchema#> .",
+            "",
+            "# Instance data (Status SSOT layer)",
+            "",
+        ])
+
+        # Locations
+        for r in loc_rows:
+            code = str(r.get("location_code") or "").strip()
+            if not code:
+                continue
+            loc_iri = iri.ref("Location", code)
+            lines = [f"{loc_iri} a hvdc:Location ;"]
+            lines.append(f'  hvdc:locationCode "{ttl_escape(code)}" ;')
+            name = str(r.get("name") or "").strip()
+            if name:
+                lines.append(f'  hvdc:locationName "{ttl_escape(name)}" ;')
+            cat = str(r.get("category") or "").strip()
+            if cat:
+                lines.append(f'  hvdc:locationCategory "{ttl_escape(cat)}" ;')
+            node = str(r.get("hvdc_node") or "").strip()
+            if node:
+                lines.append(f'  hvdc:hvdcNode "{ttl_escape(node)}" ;')
+            # bools
+            for k, pred in [("is_mosb","hvdc:isMosb"),("is_site","hvdc:isSite"),("is_port","hvdc:isPort"),("active","hvdc:active")]:
+                v = str(r.get(k) or "").strip().lower()
+                if v in ("true","false","1","0","yes","no","y","n","t","f"):
+                    b = "true" if v in ("true","1","yes","y","t") else "false"
+                    lines.append(f'  {pred} "{b}"^^xsd:boolean ;')
+            lines[-1] = lines[-1].rstrip(" ;") + " ."
+            lines.append("")
+            out.write_lines(lines)
+
+        # Shipments
+        for sh in shipments:
+            ship_iri = iri.ref("Shipment", sh.hvdc_code)
+            lines = [f"{ship_iri} a hvdc:Shipment ;"]
+            lines.append(f'  hvdc:hvdcCode "{ttl_escape(sh.hvdc_code)}" ;')
+            if sh.status_no is not None:
+                lines.append(f'  hvdc:statusNo "{int(sh.status_no)}"^^xsd:integer ;')
+            if sh.vendor:
+                lines.append(f'  hvdc:vendor "{ttl_escape(sh.vendor)}" ;')
+            if sh.band:
+                lines.append(f'  hvdc:band "{ttl_escape(sh.band)}" ;')
+            if sh.incoterms:
+                lines.append(f'  hvdc:incoterms "{ttl_escape(sh.incoterms)}" ;')
+            if sh.currency:
+                lines.append(f'  hvdc:currency "{ttl_escape(sh.currency)}" ;')
+            if sh.pol:
+                lines.append(f'  hvdc:pol "{ttl_escape(sh.pol)}" ;')
+            if sh.pod:
+                lines.append(f'  hvdc:pod "{ttl_escape(sh.pod)}" ;')
+            lines.append(f'  hvdc:warehouseFlag "{str(sh.warehouse_flag).lower()}"^^xsd:boolean ;')
+            if sh.warehouse_last_location:
+                lines.append(f'  hvdc:warehouseLastLocation "{ttl_escape(sh.warehouse_last_location)}" ;')
+            if sh.warehouse_last_date:
+                lines.append(f'  hvdc:warehouseLastDate "{sh.warehouse_last_date.isoformat()}"^^xsd:date ;')
+            if include_raw:
+                lines.append(f'  hvdc:rawJson """{raw_json.dumps(sh.raw)}""" .')
+            else:
+                lines[-1] = lines[-1].rstrip(" ;") + " ."
+            lines.append("")
+            out.write_lines(lines)
+
+        # Events
+        for ev in events:
+            ev_iri = iri.ref("StatusEvent", ev.event_id)
+            ship_iri = iri.ref("Shipment", ev.hvdc_code)
+            lines = [f"{ev_iri} a hvdc:StatusEvent ;"]
+            lines.append(f'  hvdc:eventId "{ttl_escape(ev.event_id)}" ;')
+            lines.append(f'  hvdc:eventType "{ttl_escape(ev.event_type)}" ;')
+            lines.append(f'  hvdc:eventDate "{ev.event_date.isoformat()}"^^xsd:date ;')
+            lines.append(f'  hvdc:sourceSystem "{ttl_escape(ev.source)}" ;')
+            if ev.location:
+                lines.append(f'  hvdc:locationText "{ttl_escape(ev.location)}" ;')
+            if ev.location_code:
+                loc_iri = iri.ref("Location", ev.location_code)
+                lines.append(f"  hvdc:atLocation {loc_iri} ;")
+            lines.append(f"  hvdc:forShipment {ship_iri} ;")
+            if include_raw:
+                lines.append(f'  hvdc:rawJson """{raw_json.dumps(ev.raw)}""" .')
+            else:
+                lines[-1] = lines[-1].rstrip(" ;") + " ."
+            lines.append("")
+            # link from Shipment
+            lines.append(f"{ship_iri} hvdc:hasStatusEvent {ev_iri} .")
+            lines.append("")
+            out.write_lines(lines)
 
 
 # -----------------------------
 # Reports
 # -----------------------------
-def write_qa_report(path: Path, status_in: int, ship_out: int, wh_in: int, wh_matched: int, orphan: int) -> None:
+def write_qa_report(
+    path: Path,
+    status_in: int,
+    ship_out: int,
+    wh_in: int,
+    wh_matched: int,
+    orphan: int,
+    location_cache: Optional[Dict[str, int]] = None,
+) -> None:
     ensure_dir(path.parent)
     coverage = (ship_out / status_in * 100.0) if status_in else 0.0
     orphan_rate = (orphan / wh_in * 100.0) if wh_in else 0.0
@@ -725,6 +1552,13 @@ def write_qa_report(path: Path, status_in: int, ship_out: int, wh_in: int, wh_ma
     md.append(f"- Warehouse 매칭 성공(hvdc_code): **{wh_matched:.2f}**")
     md.append(f"- Orphan WH(매칭 실패 hvdc_code): **{orphan:.2f}** (비율 {orphan_rate:.2f}%)")
     md.append("")
+    if location_cache is not None:
+        lookups = location_cache["hits"] + location_cache["misses"]
+        hit_rate = (location_cache["hits"] / lookups * 100.0) if lookups else 0.0
+        md.append("## Location 매핑 캐시")
+        md.append(f"- Lookup: **{lookups}** (hit {location_cache['hits']}, miss {location_cache['misses']}, hit rate {hit_rate:.2f}%)")
+        md.append(f"- Cache size: **{location_cache['size']}** / {location_cache['maxsize']} (evictions {location_cache['evictions']})")
+        md.append("")
     md.append("## 판정")
     md.append(f"- 결과: **{verdict}**")
     md.append("")
@@ -804,83 +1638,240 @@ def write_location_match_reports(rep_dir: Path, distinct_counts: Dict[str, int],
 
 
 # -----------------------------
-# Main
+# CSV rows (status.*)
 # -----------------------------
-def main() -> None:
-    ap = argparse.ArgumentParser()
-    ap.add_argument("--status", required=True, help="HVDC all status JSON 경로")
-    ap.add_argument("--warehouse", required=True, help="HVDC warehouse status JSON 경로(케이스 단위)")
-    ap.add_argument("--outdir", default="out", help="출력 폴더 (default: out)")
-    ap.add_argument("--base-iri", default="https://example.com/hvdc", help="OPS TTL instance base IRI (no #).")
-    ap.add_argument("--case-locations", default="", help="Option-C locations.csv 경로(있으면 StatusEvent location_code 매핑 + atLocation 생성).")
-    ap.add_argument("--location-alias-json", default="", help="(옵션) locationText->location_code alias JSON 경로")
-    ap.add_argument("--no-ops-ttl", action="store_true", help="OPS TTL(hvdc_ops_status.ttl) 생성 비활성화")
-    ap.add_argument("--no-legacy-ttl", action="store_true", help="legacy hvdc.ttl 생성 비활성화")
-    args = ap.parse_args()
+SHIP_HEADERS = [
+    "hvdc_code",
+    "status_no",
+    "vendor",
+    "band",
+    "incoterms",
+    "currency",
+    "pol",
+    "pod",
+    "bl_awb",
+    "vessel",
+    "ship_mode",
+    "pkg",
+    "qty_cntr",
+    "cbm",
+    "gwt_kg",
+    "etd",
+    "eta",
+    "ata",
+    "warehouse_flag",
+    "warehouse_last_location",
+    "warehouse_last_location_code",
+    "warehouse_last_date",
+    "raw",
+]
+
+EV_HEADERS = [
+    "event_id",
+    "hvdc_code",
+    "event_type",
+    "location",
+    "location_code",
+    "location_match_method",
+    "location_match_score",
+    "event_date",
+    "source",
+    "raw",
+]
+
+
+def shipment_csv_row(sh: ShipmentOut, raw_json: Optional[RawJsonCache] = None) -> Dict[str, Any]:
+    return {
+        "hvdc_code": sh.hvdc_code,
+        "status_no": sh.status_no if sh.status_no is not None else "",
+        "vendor": sh.vendor or "",
+        "band": sh.band or "",
+        "incoterms": sh.incoterms or "",
+        "currency": sh.currency or "",
+        "pol": sh.pol or "",
+        "pod": sh.pod or "",
+        "bl_awb": sh.bl_awb or "",
+        "vessel": sh.vessel or "",
+        "ship_mode": sh.ship_mode or "",
+        "pkg": sh.pkg if sh.pkg is not None else "",
+        "qty_cntr": sh.qty_cntr if sh.qty_cntr is not None else "",
+        "cbm": f"{sh.cbm:.4f}" if sh.cbm is not None else "",
+        "gwt_kg": f"{sh.gwt_kg:.2f}" if sh.gwt_kg is not None else "",
+        "etd": sh.etd.isoformat() if sh.etd else "",
+        "eta": sh.eta.isoformat() if sh.eta else "",
+        "ata": sh.ata.isoformat() if sh.ata else "",
+        "warehouse_flag": "true" if sh.warehouse_flag else "false",
+        "warehouse_last_location": sh.warehouse_last_location or "",
+        "warehouse_last_location_code": sh.warehouse_last_location_code or "",
+        "warehouse_last_date": sh.warehouse_last_date.isoformat() if sh.warehouse_last_date else "",
+        "raw": raw_json.dumps(sh.raw) if raw_json else _raw_json_text(sh.raw),
+    }
+
+
+def event_csv_row(ev: EventOut, raw_json: Optional[RawJsonCache] = None) -> Dict[str, Any]:
+    return {
+        "event_id": ev.event_id,
+        "hvdc_code": ev.hvdc_code,
+        "event_type": ev.event_type,
+        "location": ev.location,
+        "location_code": ev.location_code or "",
+        "location_match_method": ev.location_match_method or "",
+        "location_match_score": f"{(ev.location_match_score or 0.0):.4f}",
+        "event_date": ev.event_date.isoformat(),
+        "source": ev.source,
+        "raw": raw_json.dumps(ev.raw) if raw_json else _raw_json_text(ev.raw),
+    }
+
+
+def shipment_record(sh: ShipmentOut, raw_json: Optional[RawJsonCache] = None) -> Dict[str, Any]:
+    """typed row (Parquet/Arrow용): CSV와 같은 컬럼, 숫자/날짜/bool은 원래 타입 유지"""
+    rec = {name: getattr(sh, name) for name in SHIP_HEADERS[:-1]}
+    rec["raw"] = raw_json.dumps(sh.raw) if raw_json else _raw_json_text(sh.raw)
+    return rec
+
+
+def event_record(ev: EventOut, raw_json: Optional[RawJsonCache] = None) -> Dict[str, Any]:
+    rec = {name: getattr(ev, name) for name in EV_HEADERS[:-1]}
+    rec["raw"] = raw_json.dumps(ev.raw) if raw_json else _raw_json_text(ev.raw)
+    return rec
 
-    status_path = Path(args.status).expanduser().resolve()
-    wh_path = Path(args.warehouse).expanduser().resolve()
-    outdir = Path(args.outdir).expanduser().resolve()
 
-    locations_csv = Path(args.case_locations).expanduser().resolve() if args.case_locations else None
-    alias_json = Path(args.location_alias_json).expanduser().resolve() if args.location_alias_json else None
+# -----------------------------
+# Shipments/Events build (shard 단위)
+# -----------------------------
+@dataclass
+class ShardResult:
+    shipments: List[Tuple[int, ShipmentOut]]  # (Status 입력 순번, shipment), 순번 오름차순
+    events: List[EventOut]  # (hvdc_code, event_date, location) 정렬
+    status_codes: set
+    status_in: int
+    status_dups: int
+    wh_codes: set
+    wh_in: int
+    distinct_loc_counts: Dict[str, int]
+    location_cache: Optional[Dict[str, int]] = None
+
+
+def sum_cache_info(infos: Iterable[Optional[Dict[str, int]]]) -> Optional[Dict[str, int]]:
+    """LocationMapper.cache_info() 합계 (maxsize는 mapper별 동일)"""
+    infos = [i for i in infos if i is not None]
+    if not infos:
+        return None
+    out = {k: sum(i[k] for i in infos) for k in ("hits", "misses", "evictions", "size")}
+    out["maxsize"] = infos[0]["maxsize"]
+    return out
 
-    # LocationMapper 준비(있으면)
-    mapper = LocationMapper(locations_csv=locations_csv, alias_json=alias_json)
 
-    status_records = to_records(load_json_any(status_path))
-    wh_records = to_records(load_json_any(wh_path))
+def shard_of(hvdc_code: str, n_shards: int) -> int:
+    """hvdc_code -> shard 번호 (프로세스/실행 간 고정: crc32)"""
+    return zlib.crc32(hvdc_code.encode("utf-8")) % n_shards
+
 
-    # Status: hvdc_code index(중복은 마지막 값 유지)
-    status_by_code: Dict[str, Dict[str, Any]] = {}
+def _in_build(code: Optional[str], shard: int, n_shards: int, only_codes: Optional[set]) -> bool:
+    """build 대상 여부 (hvdc_code 없는 WH row는 shard 0에서만 skip 집계)"""
+    if code is None:
+        return shard == 0
+    if only_codes is not None and code not in only_codes:
+        return False
+    return n_shards <= 1 or shard_of(code, n_shards) == shard
+
+
+def build_shard(
+    status_path: Path,
+    wh_path: Path,
+    mapper: LocationMapper,
+    chunk_rows: int,
+    shard: int = 0,
+    n_shards: int = 1,
+    only_codes: Optional[set] = None,
+) -> ShardResult:
+    """
+    shard에 속한 hvdc_code의 Status/WH 레코드로 ShipmentOut/EventOut 생성
+    - 같은 hvdc_code의 Status/WH는 항상 같은 shard → shard별 결과는 서로 독립
+    - only_codes: 지정 시 해당 hvdc_code만 build (증분 실행; shipments 순번은 전체 Status 기준)
+    """
+    filtered = n_shards > 1 or only_codes is not None
+    wh_rows: Iterable[Dict[str, Any]] = iter_json_records(wh_path)
+    status_rows: Iterable[Tuple[int, Dict[str, Any]]] = enumerate(iter_json_records(status_path))
+    if filtered:
+        wh_rows = (row for row in wh_rows if _in_build(get_wh_hvdc_code(row), shard, n_shards, only_codes))
+        status_rows = (
+            (idx, r) for idx, r in status_rows
+            if _in_build(get_status_hvdc_code(r), shard, n_shards, only_codes)
+        )
+    return build_rows(status_rows, wh_rows, mapper, chunk_rows)
+
+
+def build_rows(
+    status_rows: Iterable[Tuple[int, Dict[str, Any]]],
+    wh_rows: Iterable[Dict[str, Any]],
+    mapper: LocationMapper,
+    chunk_rows: int,
+) -> ShardResult:
+    """(Status 입력 순번, Status 레코드) / WH 레코드 스트림으로 ShipmentOut/EventOut 생성"""
+    # WH: hvdc_code 기준 스트리밍 집계(케이스 단위 row는 보관하지 않음)
+    # 집계 이벤트: (hvdc_code, location_text) -> min_date, max_date, count / hvdc_code별 last event (max date)
+    wh_agg = WhOverlayAgg()
+    for chunk in iter_chunks(wh_rows, chunk_rows):
+        wh_agg.add_rows(chunk)
+
+    events, distinct_loc_counts = build_wh_events(wh_agg, mapper)
+
+    # Shipments_status 생성(SSOT 전량)
+    # (중복 hvdc_code는 경고만, 레코드는 전량 출력)
+    shipments: List[Tuple[int, ShipmentOut]] = []  # (Status 입력 순번, shipment)
+    status_codes: set = set()
+    status_in = 0
     status_dups = 0
-    for r in status_records:
-        code = get_status_hvdc_code(r)
-        if code in status_by_code:
+    for idx, r in status_rows:
+        head = shipment_head(r)
+        hvdc_code = head[0]
+        status_in += 1
+        if hvdc_code in status_codes:
             status_dups += 1
-        status_by_code[code] = r
-
-    # WH: hvdc_code -> rows (케이스 단위 다건)
-    wh_by_code: Dict[str, List[Dict[str, Any]]] = {}
-    wh_rows_skipped = 0
-    for r in wh_records:
-        code = get_wh_hvdc_code(r)
-        if not code:
-            wh_rows_skipped += 1
-            continue
-        wh_by_code.setdefault(code, []).append(r)
-
-    # WH 집계 이벤트: (hvdc_code, location_text) -> min_date, max_date, count
-    agg_min: Dict[Tuple[str, str], date] = {}
-    agg_max: Dict[Tuple[str, str], date] = {}
-    agg_cnt: Dict[Tuple[str, str], int] = {}
-
-    # hvdc_code별 last event (max date)
-    last_by_code: Dict[str, Tuple[date, str]] = {}  # hvdc_code -> (date, location_text)
-
-    for code, rows in wh_by_code.items():
-        for row in rows:
-            for loc, d in extract_location_dates_from_wh_row(row):
-                key = (code, loc)
-                # min
-                if key not in agg_min or d < agg_min[key]:
-                    agg_min[key] = d
-                # max
-                if key not in agg_max or d > agg_max[key]:
-                    agg_max[key] = d
-                agg_cnt[key] = agg_cnt.get(key, 0) + 1
-
-                # last per hvdc_code
-                if code not in last_by_code or d > last_by_code[code][0]:
-                    last_by_code[code] = (d, loc)
-
-    # Events_status 생성(집계: location별 "min date"를 event_date로 사용)
+        status_codes.add(hvdc_code)
+
+        last = wh_agg.last.get(hvdc_code)
+        last_loc = last.location if last else None
+        last_loc_code, _, _ = mapper.map(last_loc) if (last_loc and mapper.enabled) else (None, "NONE", 0.0)
+        shipments.append((idx, ShipmentOut(
+            *head,
+            warehouse_flag=last is not None,
+            warehouse_last_location=last_loc,
+            warehouse_last_location_code=last_loc_code,
+            warehouse_last_date=epoch_day_to_date(last.day) if last else None,
+            raw=r,
+        )))
+
+    return ShardResult(
+        shipments=shipments,
+        events=events,
+        status_codes=status_codes,
+        status_in=status_in,
+        status_dups=status_dups,
+        wh_codes=wh_agg.codes,
+        wh_in=wh_agg.rows_in,
+        distinct_loc_counts=distinct_loc_counts,
+    )
+
+
+def build_wh_events(
+    wh_agg: WhOverlayAgg,
+    mapper: LocationMapper,
+    raw_json: Optional[RawJsonCache] = None,
+) -> Tuple[List[EventOut], Dict[str, int]]:
+    """
+    WH 집계 → Events_status (location별 "min date"를 event_date로 사용) + location_text별 cell 수
+    - raw_json: 지정 시 EventOut.raw를 직렬화된 문자열로 보관
+    - 정렬: hvdc_code, event_date, location
+    """
     events: List[EventOut] = []
     distinct_loc_counts: Dict[str, int] = {}
 
-    for (code, loc), min_d in agg_min.items():
-        max_d = agg_max.get((code, loc), min_d)
-        cnt = agg_cnt.get((code, loc), 1)
+    for (code, loc), acc in wh_agg.groups.items():
+        min_d = epoch_day_to_date(acc.min_day)
+        max_d = epoch_day_to_date(acc.max_day)
+        cnt = acc.count
         distinct_loc_counts[loc] = distinct_loc_counts.get(loc, 0) + cnt
 
         # location_code mapping
@@ -889,6 +1880,7 @@ def main() -> None:
         safe_code = re.sub(r"[^0-9A-Za-z]+", "", code)[:24]
         safe_loc = re.sub(r"[^0-9A-Za-z]+", "", loc)[:24]
         event_id = f"sev_{safe_code}_{safe_loc}_{min_d.isoformat()}"
+        ev_raw = {"agg": "min", "max_date": max_d.isoformat(), "count": cnt, "field": loc}
         events.append(EventOut(
             event_id=event_id,
             hvdc_code=code,
@@ -899,79 +1891,745 @@ def main() -> None:
             location_match_score=score,
             event_date=min_d,
             source="warehouse_overlay(min)",
-            raw={"agg": "min", "max_date": max_d.isoformat(), "count": cnt, "field": loc},
+            raw=raw_json.text(ev_raw) if raw_json is not None else ev_raw,
         ))
 
-    # 정렬: hvdc_code, event_date
     events.sort(key=lambda x: (x.hvdc_code, x.event_date, x.location))
+    return events, distinct_loc_counts
+
+
+def shipment_head(r: Dict[str, Any]) -> Tuple[Any, ...]:
+    """Status 레코드 → ShipmentOut의 WH overlay 앞 필드(hvdc_code ~ ata) tuple"""
+    v = STATUS_RESOLVER.values(r)
+    return (
+        get_status_hvdc_code(r),
+        parse_int_maybe(v["status_no"]),
+        clean_str(v["vendor"]),
+        clean_str(v["band"]),
+        clean_str(v["incoterms"]),
+        clean_str(v["currency"]),
+        clean_str(v["pol"]),
+        clean_str(v["pod"]),
+        clean_str(v["bl_awb"]),
+        clean_str(v["vessel"]),
+        clean_str(v["ship_mode"]),
+        parse_int_maybe(v["pkg"]),
+        parse_int_maybe(v["qty_cntr"]),
+        parse_num_maybe(v["cbm"]),
+        parse_num_maybe(v["gwt_kg"]),
+        parse_date_iso_maybe(v["etd"]),
+        parse_date_iso_maybe(v["eta"]),
+        parse_date_iso_maybe(v["ata"]),
+    )
 
-    # Shipments_status 생성(SSOT 전량)
-    shipments: List[ShipmentOut] = []
-    for r in status_records:
-        hvdc_code = get_status_hvdc_code(r)
-        status_no = get_status_no(r)
-
-        vendor = get_str(r, STATUS_VENDOR_KEYS)
-        band = get_str(r, STATUS_BAND_KEYS)
-
-        incoterms = get_str(r, list(map(norm_key, ["INCOTERMS"])))
-        currency = get_str(r, list(map(norm_key, ["CURRENCY"])))
-        pol = get_str(r, list(map(norm_key, ["POL"])))
-        pod = get_str(r, list(map(norm_key, ["POD"])))
-        bl_awb = get_str(r, list(map(norm_key, ["B/L No.AWB No.", "B/L No.AWB No"])))
-        vessel = get_str(r, list(map(norm_key, ["VESSEL NAME/ FLIGHT No.", "VESSEL NAME/\\nFLIGHT No.", "VESSEL NAME/ FLIGHT No"])))
-        ship_mode = get_str(r, list(map(norm_key, ["SHIP MODE"])))
-
-        # 숫자/날짜 필드
-        pkg = parse_int_maybe(r.get(detect_key(r, [norm_key("PKG")]) or "")) if detect_key(r, [norm_key("PKG")]) else parse_int_maybe(r.get("PKG"))
-        qty_cntr = parse_int_maybe(r.get(detect_key(r, [norm_key("QTY OF CNTR")]) or "")) if detect_key(r, [norm_key("QTY OF CNTR")]) else parse_int_maybe(r.get("QTY OF CNTR"))
-        cbm = parse_num_maybe(r.get(detect_key(r, [norm_key("CBM")]) or "")) if detect_key(r, [norm_key("CBM")]) else parse_num_maybe(r.get("CBM"))
-        gwt_kg = parse_num_maybe(r.get(detect_key(r, [norm_key("GWT(KG)")]) or "")) if detect_key(r, [norm_key("GWT(KG)")]) else parse_num_maybe(r.get("GWT(KG)"))
-
-        etd = parse_date_iso_maybe(r.get(detect_key(r, [norm_key("ETD")]) or "")) if detect_key(r, [norm_key("ETD")]) else parse_date_iso_maybe(r.get("ETD"))
-        eta = parse_date_iso_maybe(r.get(detect_key(r, [norm_key("ETA")]) or "")) if detect_key(r, [norm_key("ETA")]) else parse_date_iso_maybe(r.get("ETA"))
-        ata = parse_date_iso_maybe(r.get(detect_key(r, [norm_key("ATA")]) or "")) if detect_key(r, [norm_key("ATA")]) else parse_date_iso_maybe(r.get("ATA"))
-
-        warehouse_flag = hvdc_code in wh_by_code and hvdc_code in last_by_code
-        last_loc = last_by_code[hvdc_code][1] if warehouse_flag else None
-        last_dt = last_by_code[hvdc_code][0] if warehouse_flag else None
-        last_loc_code, _, _ = mapper.map(last_loc) if (last_loc and mapper.enabled) else (None, "NONE", 0.0)
 
-        shipments.append(ShipmentOut(
-            hvdc_code=hvdc_code,
-            status_no=status_no,
-            vendor=vendor,
-            band=band,
-            incoterms=incoterms,
-            currency=currency,
-            pol=pol,
-            pod=pod,
-            bl_awb=bl_awb,
-            vessel=vessel,
-            ship_mode=ship_mode,
-            pkg=pkg,
-            qty_cntr=qty_cntr,
-            cbm=cbm,
-            gwt_kg=gwt_kg,
-            etd=etd,
-            eta=eta,
-            ata=ata,
-            warehouse_flag=warehouse_flag,
-            warehouse_last_location=last_loc,
-            warehouse_last_location_code=last_loc_code,
-            warehouse_last_date=last_dt,
-            raw=r,
-        ))
 
-    # Orphan WH: WH에는 있는데 Status에 없는 hvdc_code
-    status_codes = set(status_by_code.keys())
-    wh_codes = set(wh_by_code.keys())
-    orphan_wh_codes = sorted(list(wh_codes - status_codes))
+# -----------------------------
+# 병렬 build (--workers): 입력 byte 구간 분할 → 구간별 파싱/집계 → hvdc_code shard별 이벤트
+# -----------------------------
+SPLIT_SCAN_BYTES = 1 << 22  # 경계 탐색 read 단위
+
+
+@dataclass(frozen=True)
+class RecordRange:
+    """
+    입력 파일의 레코드 경계 byte 구간 (split_record_ranges 결과)
+    - kind: "array"(최상위 JSON 배열 원소들) / "jsonl"(줄 단위) / "whole"(분할 불가 → iter_json_records 전체)
+    - pos: array는 start의 파일 내 문자 위치, jsonl은 start의 줄 번호 (오류 메시지용)
+    - last: 마지막 구간(array는 닫는 ']' 포함)
+    """
+
+    path: Path
+    kind: str
+    start: int
+    end: int
+    pos: int = 0
+    last: bool = True
+
+
+class _ByteRange(io.RawIOBase):
+    """열린 binary 파일의 현재 위치부터 length byte만 읽고, 이어서 tail을 돌려주는 raw stream"""
+
+    def __init__(self, f: Any, length: int, tail: bytes = b""):
+        self._f = f
+        self._left = length
+        self._tail = tail
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, b: Any) -> int:
+        if self._left > 0:
+            n = self._f.readinto(memoryview(b)[: min(len(b), self._left)])
+            if n:
+                self._left -= n
+                return n
+            self._left = 0
+        n = min(len(b), len(self._tail))
+        b[:n] = self._tail[:n]
+        self._tail = self._tail[n:]
+        return n
+
+
+def _array_boundaries(path: Path, targets: List[int]) -> List[Tuple[int, int]]:
+    """
+    최상위 JSON 배열에서 각 target(byte, 오름차순) 이후 첫 원소 구분자 ','의 (byte 위치, 문자 위치)
+    - 문자열 안(escape된 '"' 포함)의 ','/괄호는 제외하고 깊이 1의 ','만 경계로 사용
+    - 파싱 없이 NumPy로 chunk 단위 계산: 구조 문자(" \\ , [ ] { })만 모아 문자열 상태/깊이 누적,
+      역슬래시 run/문자열 상태/깊이/UTF-8 continuation 수는 chunk 간 이월
+    """
+    out: List[Tuple[int, int]] = []
+    ti = 0
+    base = 0
+    carry_bs = carry_q = carry_depth = carry_cont = 0
+    with path.open("rb") as f:
+        while ti < len(targets):
+            chunk = f.read(SPLIT_SCAN_BYTES)
+            if not chunk:
+                break
+            a = np.frombuffer(chunk, dtype=np.uint8)
+            n = len(a)
+            # 구조 문자 후보: & 0xDF로 [/{, \/|, ]/} 를 한 구간(0x5B..0x5D)에 모음 ('|'는 아래에서 무시)
+            struct = (a & 0xDF) - np.uint8(0x5B) <= 2
+            struct |= a == 34
+            struct |= a == 44
+            pos = np.flatnonzero(struct)
+            ch = a[pos]
+            # '"' 직전 역슬래시 run 길이가 홀수면 escape → run(끝 위치, 길이)을 chunk 앞 이월분 포함해 계산
+            bs = pos[ch == 92]
+            if len(bs) or carry_bs:
+                starts = np.r_[True, np.diff(bs) != 1] if len(bs) else np.zeros(0, dtype=bool)
+                run_start = bs[starts]
+                run_end = np.r_[bs[:-1][starts[1:]], bs[-1:]] if len(bs) else bs
+                run_len = run_end - run_start + 1
+                if len(run_start) and run_start[0] == 0:
+                    run_len[0] += carry_bs
+                elif carry_bs:
+                    run_end = np.r_[-1, run_end]
+                    run_len = np.r_[carry_bs, run_len]
+                odd_end = run_end[run_len % 2 == 1]
+                is_quote = ch == 34
+                quote_pos = pos[is_quote]
+                escaped = np.isin(quote_pos - 1, odd_end, assume_unique=True)
+                real = np.zeros(len(ch), dtype=bool)
+                real[np.flatnonzero(is_quote)[~escaped]] = True
+                carry_bs = int(run_len[-1]) if len(run_end) and run_end[-1] == n - 1 else 0
+            else:
+                real = ch == 34
+            quotes = np.cumsum(real, dtype=np.int32) + carry_q
+            outside = (quotes & 1) == 0
+            step = (((ch == 123) | (ch == 91)) & outside).astype(np.int32) - (((ch == 125) | (ch == 93)) & outside)
+            depth = np.cumsum(step, dtype=np.int32) + carry_depth
+            commas = pos[(ch == 44) & outside & (depth == 1)]
+            while ti < len(targets) and targets[ti] < base + n:
+                j = int(np.searchsorted(commas, targets[ti] - base))
+                if j == len(commas):
+                    break  # 이 chunk 안에 경계 없음 → 다음 chunk의 첫 경계
+                p = int(commas[j])
+                cont = carry_cont + int(np.count_nonzero((a[:p] & 0xC0) == 0x80))
+                out.append((base + p, base + p - cont))
+                ti += 1
+            if len(ch):
+                carry_q = int(quotes[-1]) & 1
+                carry_depth = int(depth[-1])
+            carry_cont += int(np.count_nonzero((a & 0xC0) == 0x80))
+            base += n
+    return out
+
+
+def _count_newlines(f: Any, start: int, end: int) -> int:
+    f.seek(start)
+    count = 0
+    left = end - start
+    while left > 0:
+        chunk = f.read(min(left, SPLIT_SCAN_BYTES))
+        if not chunk:
+            break
+        count += chunk.count(b"\n")
+        left -= len(chunk)
+    return count
+
+
+def split_record_ranges(path: Path, n_ranges: int) -> List[RecordRange]:
+    """
+    입력 파일을 레코드 경계에 맞춘 최대 n_ranges개의 byte 구간으로 분할(레코드 파싱 없음)
+    - JSONL: 목표 위치 다음 줄바꿈에서 분할
+    - JSON 배열: 목표 위치 다음 최상위 ','에서 분할 (_array_boundaries)
+    - 그 밖의 형식(객체 래퍼 등)은 분할하지 않음: "whole" 구간 1개
+    """
+    size = path.stat().st_size
+    whole = [RecordRange(path, "whole", 0, size)]
+    if n_ranges <= 1 or size == 0:
+        return whole
+    targets = [size * i // n_ranges for i in range(1, n_ranges)]
+
+    if _is_jsonl(path):
+        starts = [0]
+        with path.open("rb") as f:
+            for t in targets:
+                f.seek(max(t - 1, starts[-1]))
+                f.readline()
+                p = f.tell()
+                if starts[-1] < p < size:
+                    starts.append(p)
+            lines = [1]
+            for a, b in zip(starts, starts[1:]):
+                lines.append(lines[-1] + _count_newlines(f, a, b))
+        ends = starts[1:] + [size]
+        return [
+            RecordRange(path, "jsonl", a, b, line, b == size)
+            for a, b, line in zip(starts, ends, lines)
+        ]
+
+    first = 0
+    with path.open("rb") as f:
+        while True:
+            head = f.read(SPLIT_SCAN_BYTES)
+            lead = head.lstrip(b" \t\r\n")
+            if lead or not head:
+                break
+            first += len(head)
+    if not lead.startswith(b"["):
+        return whole
+    first += len(head) - len(lead) + 1
+    bounds = [(b, c) for b, c in _array_boundaries(path, targets) if b >= first]
+    bounds = [bc for i, bc in enumerate(bounds) if i == 0 or bc[0] != bounds[i - 1][0]]
+    starts = [(first, first)] + [(b + 1, c + 1) for b, c in bounds]
+    ends = [b for b, _ in bounds] + [size]
+    return [
+        RecordRange(path, "array", start, end, pos, end == size)
+        for (start, pos), end in zip(starts, ends)
+    ]
+
+
+def iter_range_records(rr: RecordRange, chunk_size: int = 1 << 20) -> Iterator[Dict[str, Any]]:
+    """RecordRange 구간의 레코드 순회 (구간들을 순서대로 이으면 iter_json_records와 동일)"""
+    if rr.kind == "whole":
+        yield from iter_json_records(rr.path, chunk_size)
+        return
+    with rr.path.open("rb") as raw:
+        raw.seek(rr.start)
+        # 중간 array 구간은 원소 구분자 ',' 직전에서 끝나므로 ']'를 이어 붙여 배열로 닫음
+        tail = b"]" if rr.kind == "array" and not rr.last else b""
+        reader = io.BufferedReader(_ByteRange(raw, rr.end - rr.start, tail))
+        with io.TextIOWrapper(reader, encoding="utf-8", errors="replace") as f:
+            if rr.kind == "jsonl":
+                items = _iter_jsonl_lines(f, rr.path, first_line=rr.pos)
+            else:
+                items = _iter_json_array(f, rr.path, "", chunk_size, offset=rr.pos)
+            for x in items:
+                if not isinstance(x, dict):
+                    raise ValueError("리스트 내부가 dict가 아닙니다.")
+                yield x
+
+
+@dataclass
+class RangeScan:
+    """_scan_range_worker 결과 (WH/Status 입력 구간 1쌍)"""
+
+    wh_parts: List[bytes]  # hvdc_code shard별 WhOverlayAgg.pack_shards() 결과
+    wh_in: int
+    status_records: int  # 구간 내 Status 레코드 수(only_codes 필터 전, 전체 순번 계산용)
+    shipments: List[Tuple[int, Tuple[Any, ...]]]  # (구간 내 순번, shipment_head + raw 문자열)
+
+
+@dataclass
+class EventShard:
+    """_event_shard_worker 결과 (hvdc_code shard 1개)"""
+
+    events: List[Tuple[Any, ...]]  # EventOut 필드 tuple(raw는 직렬화된 문자열), 정렬 순서
+    last: Dict[str, Tuple[int, str, Optional[str]]]  # hvdc_code -> (day, location, location_code)
+    codes: set
+    distinct_loc_counts: Dict[str, int]
+    location_cache: Optional[Dict[str, int]]
+
+
+def _row_fields(cls: type) -> Any:
+    """raw(마지막 필드)를 뺀 필드 getter — ShipmentOut/EventOut 공통"""
+    names = [f.name for f in fields(cls)]
+    assert names[-1] == "raw"
+    return attrgetter(*names[:-1])
+
+
+def _scan_range_worker(
+    task: Tuple[Optional[RecordRange], Optional[RecordRange], int, int, Optional[set], bool],
+) -> RangeScan:
+    """WH 구간 → shard별 부분 집계, Status 구간 → shipment 앞 필드 (구간 파싱은 worker에서만)"""
+    wh_range, status_range, n_shards, chunk_rows, only_codes, fast_json = task
+    wh_agg = WhOverlayAgg()
+    if wh_range is not None:
+        rows: Iterable[Dict[str, Any]] = iter_range_records(wh_range)
+        if only_codes is not None:
+            rows = (row for row in rows if _in_build(get_wh_hvdc_code(row), 0, 1, only_codes))
+        for chunk in iter_chunks(rows, chunk_rows):
+            wh_agg.add_rows(chunk)
+
+    raw_json = RawJsonCache(fast=fast_json)
+    shipments: List[Tuple[int, Tuple[Any, ...]]] = []
+    records = 0
+    if status_range is not None:
+        for idx, r in enumerate(iter_range_records(status_range)):
+            records += 1
+            if only_codes is None or get_status_hvdc_code(r) in only_codes:
+                shipments.append((idx, shipment_head(r) + (raw_json.text(r),)))
+    return RangeScan(wh_agg.pack_shards(n_shards), wh_agg.rows_in, records, shipments)
+
+
+def _event_shard_worker(
+    task: Tuple[List[bytes], Optional[Path], Optional[Path], int, bool],
+) -> EventShard:
+    """구간 순서대로 부분 집계 병합(순차 처리와 동일) → shard의 EventOut + 마지막 위치"""
+    parts, locations_csv, alias_json, cache_size, fast_json = task
+    wh_agg = WhOverlayAgg()
+    for packed in parts:
+        wh_agg.merge_packed(packed)
+    mapper = LocationMapper(locations_csv=locations_csv, alias_json=alias_json, cache_size=cache_size)
+    events, distinct_loc_counts = build_wh_events(wh_agg, mapper, RawJsonCache(fast=fast_json))
+    last = {
+        code: (v.day, v.location, mapper.map(v.location)[0] if mapper.enabled else None)
+        for code, v in wh_agg.last.items()
+    }
+    get = _row_fields(EventOut)
+    return EventShard(
+        events=[get(ev) + (ev.raw,) for ev in events],
+        last=last,
+        codes=wh_agg.codes,
+        distinct_loc_counts=distinct_loc_counts,
+        location_cache=mapper.cache_info() if mapper.enabled else None,
+    )
+
+
+def build_sharded(
+    status_path: Path,
+    wh_path: Path,
+    workers: int,
+    chunk_rows: int,
+    locations_csv: Optional[Path],
+    alias_json: Optional[Path],
+    cache_size: int,
+    only_codes: Optional[set] = None,
+    fast_json: bool = False,
+) -> ShardResult:
+    """
+    process pool 2단계 build (결과는 단일 프로세스 build_shard와 동일)
+    1) 부모는 입력을 레코드 경계 byte 구간으로만 나눔(split_record_ranges, 파싱 없음)
+       → worker가 구간별로 파싱: WH는 hvdc_code shard별 부분 집계, Status는 shipment 앞 필드
+    2) shard별 worker가 부분 집계를 구간 순서대로 병합해 EventOut/마지막 위치 생성
+    - 부분 집계는 pickle bytes로 부모를 그대로 통과(부모에서 역직렬화 없음), 레코드 자체는 프로세스 간 전달하지 않음
+    - shipments: 구간 순서대로 이어 붙임 = Status 입력 순서, WH 필드는 shard 결과의 마지막 위치로 채움
+    - events: shard별 정렬 결과를 (hvdc_code, event_date, location) 기준 merge (event_id 동일)
+    - location_cache: shard별 LocationMapper 캐시 통계 합계
+    - fast_json: raw 직렬화 형식(RawJsonCache(fast=...)와 동일해야 CSV/TTL raw 출력이 같음)
+    """
+    wh_ranges = split_record_ranges(wh_path, workers)
+    status_ranges = split_record_ranges(status_path, workers)
+    scan_tasks = [
+        (
+            wh_ranges[i] if i < len(wh_ranges) else None,
+            status_ranges[i] if i < len(status_ranges) else None,
+            workers, chunk_rows, only_codes, fast_json,
+        )
+        for i in range(max(len(wh_ranges), len(status_ranges)))
+    ]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        scans = list(pool.map(_scan_range_worker, scan_tasks))
+        shard_tasks = [
+            ([scan.wh_parts[shard] for scan in scans], locations_csv, alias_json, cache_size, fast_json)
+            for shard in range(workers)
+        ]
+        shards = list(pool.map(_event_shard_worker, shard_tasks))
+    return merge_sharded(scans, shards)
+
+
+def merge_sharded(scans: List[RangeScan], shards: List[EventShard]) -> ShardResult:
+    """구간 결과(입력 순서)와 shard 결과 → 단일 프로세스 build_shard와 같은 ShardResult"""
+    last: Dict[str, Tuple[int, str, Optional[str]]] = {}
+    for part in shards:
+        last.update(part.last)
+    shipments: List[Tuple[int, ShipmentOut]] = []
+    offset = 0
+    for scan in scans:
+        for idx, t in scan.shipments:
+            wl = last.get(t[0])
+            shipments.append((offset + idx, ShipmentOut(
+                *t[:-1],
+                warehouse_flag=wl is not None,
+                warehouse_last_location=wl[1] if wl else None,
+                warehouse_last_location_code=wl[2] if wl else None,
+                warehouse_last_date=epoch_day_to_date(wl[0]) if wl else None,
+                raw=t[-1],
+            )))
+        offset += scan.status_records
+    status_codes = {sh.hvdc_code for _, sh in shipments}
+
+    distinct_loc_counts: Dict[str, int] = {}
+    for part in shards:
+        for loc, cnt in part.distinct_loc_counts.items():
+            distinct_loc_counts[loc] = distinct_loc_counts.get(loc, 0) + cnt
+    # shard별 정렬된 (EventOut 필드..., raw 문자열) tuple을 병합 후 1회만 EventOut 생성
+    events = [
+        EventOut(*t)
+        for t in heapq.merge(*(part.events for part in shards), key=itemgetter(1, 7, 3))  # hvdc_code, event_date, location
+    ]
+
+    return ShardResult(
+        shipments=shipments,
+        events=events,
+        status_codes=status_codes,
+        status_in=len(shipments),
+        status_dups=len(shipments) - len(status_codes),
+        wh_codes=set().union(*(part.codes for part in shards)),
+        wh_in=sum(scan.wh_in for scan in scans),
+        distinct_loc_counts=distinct_loc_counts,
+        location_cache=sum_cache_info(part.location_cache for part in shards),
+    )
+
+
+# -----------------------------
+# 증분 실행 (hvdc_code별 content hash state)
+# -----------------------------
+STATE_VERSION = 1
+DELETE_SHIP_HEADERS = ["hvdc_code"]
+DELETE_EV_HEADERS = ["event_id", "hvdc_code"]
+
+
+@dataclass
+class InputDigest:
+    """입력 1회 스캔 결과: hvdc_code별 content hash + QA용 입력 통계"""
+    hashes: Dict[str, str]  # hvdc_code -> hash(Status record(s) + WH rows, 입력 순서 포함)
+    status_order: List[str]  # Status 입력 순번별 hvdc_code
+    status_counts: Dict[str, int]
+    wh_codes: set
+    wh_in: int
+
+
+def _record_bytes(r: Dict[str, Any]) -> bytes:
+    # JSON 파싱 결과(dict/list/str/number/None)의 repr은 결정적이며 json.dumps보다 빠름 (state 비교 전용)
+    return repr(r).encode("utf-8", "surrogatepass")
+
+
+def digest_inputs(status_path: Path, wh_path: Path) -> InputDigest:
+    """Status/WH를 스트리밍으로 1회 읽어 hvdc_code별 content hash 계산 (build 없음)"""
+    wh_h: Dict[str, Any] = {}
+    wh_in = 0
+    for row in iter_json_records(wh_path):
+        wh_in += 1
+        code = get_wh_hvdc_code(row)
+        if code is None:
+            continue
+        h = wh_h.get(code)
+        if h is None:
+            h = wh_h[code] = hashlib.blake2b(digest_size=16)
+        h.update(_record_bytes(row))
+        h.update(b"\n")
+
+    st_h: Dict[str, Any] = {}
+    status_order: List[str] = []
+    for r in iter_json_records(status_path):
+        code = get_status_hvdc_code(r)
+        status_order.append(code)
+        h = st_h.get(code)
+        if h is None:
+            h = st_h[code] = hashlib.blake2b(digest_size=16)
+        h.update(_record_bytes(r))
+        h.update(b"\n")
+
+    hashes: Dict[str, str] = {}
+    for code in st_h.keys() | wh_h.keys():
+        h = hashlib.blake2b(digest_size=16)
+        h.update(st_h[code].digest() if code in st_h else b"-")
+        h.update(wh_h[code].digest() if code in wh_h else b"-")
+        hashes[code] = h.hexdigest()
+    return InputDigest(
+        hashes=hashes,
+        status_order=status_order,
+        status_counts=dict(Counter(status_order)),
+        wh_codes=set(wh_h),
+        wh_in=wh_in,
+    )
+
+
+def config_fingerprint(locations_csv: Optional[Path], alias_json: Optional[Path], fast_json: bool) -> str:
+    """build 결과에 영향을 주는 설정(location 매핑 입력, raw JSON 형식) — 바뀌면 전체 재계산"""
+    h = hashlib.blake2b(digest_size=16)
+    h.update(f"v{STATE_VERSION}|fast_json={int(fast_json)}".encode("utf-8"))
+    for p in (locations_csv, alias_json):
+        h.update(b"|")
+        if p is not None and p.exists():
+            h.update(p.read_bytes())
+    return h.hexdigest()
+
+
+def load_state(path: Path) -> Optional[Dict[str, Any]]:
+    """state 파일 로드 (없거나 버전/형식 불일치면 None → 전체 재계산)"""
+    if not path.exists():
+        return None
+    try:
+        state = json.loads(path.read_text(encoding="utf-8"))
+    except ValueError:
+        return None
+    if not isinstance(state, dict) or state.get("version") != STATE_VERSION or not isinstance(state.get("codes"), dict):
+        return None
+    return state
+
+
+def save_state(path: Path, fingerprint: str, hashes: Dict[str, str]) -> None:
+    ensure_dir(path.parent)
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(
+        json.dumps({"version": STATE_VERSION, "fingerprint": fingerprint, "codes": dict(sorted(hashes.items()))}, ensure_ascii=False),
+        encoding="utf-8",
+    )
+    tmp.replace(path)
+
+
+def _date_or_none(s: str) -> Optional[date]:
+    return date.fromisoformat(s) if s else None
+
+
+def shipment_from_csv_row(row: Dict[str, str]) -> ShipmentOut:
+    """shipment_csv_row 역변환 (이전 snapshot 재사용; 다시 쓰면 같은 CSV row, raw는 직렬화된 그대로)"""
+    return ShipmentOut(
+        hvdc_code=row["hvdc_code"],
+        status_no=int(row["status_no"]) if row["status_no"] else None,
+        vendor=row["vendor"] or None,
+        band=row["band"] or None,
+        incoterms=row["incoterms"] or None,
+        currency=row["currency"] or None,
+        pol=row["pol"] or None,
+        pod=row["pod"] or None,
+        bl_awb=row["bl_awb"] or None,
+        vessel=row["vessel"] or None,
+        ship_mode=row["ship_mode"] or None,
+        pkg=int(row["pkg"]) if row["pkg"] else None,
+        qty_cntr=int(row["qty_cntr"]) if row["qty_cntr"] else None,
+        cbm=float(row["cbm"]) if row["cbm"] else None,
+        gwt_kg=float(row["gwt_kg"]) if row["gwt_kg"] else None,
+        etd=_date_or_none(row["etd"]),
+        eta=_date_or_none(row["eta"]),
+        ata=_date_or_none(row["ata"]),
+        warehouse_flag=row["warehouse_flag"] == "true",
+        warehouse_last_location=row["warehouse_last_location"] or None,
+        warehouse_last_location_code=row["warehouse_last_location_code"] or None,
+        warehouse_last_date=_date_or_none(row["warehouse_last_date"]),
+        raw=RawJsonText(row["raw"]),
+    )
+
+
+def event_from_csv_row(row: Dict[str, str]) -> EventOut:
+    """event_csv_row 역변환"""
+    return EventOut(
+        event_id=row["event_id"],
+        hvdc_code=row["hvdc_code"],
+        event_type=row["event_type"],
+        location=row["location"],
+        location_code=row["location_code"] or None,
+        location_match_method=row["location_match_method"] or None,
+        location_match_score=float(row["location_match_score"]),
+        event_date=date.fromisoformat(row["event_date"]),
+        source=row["source"],
+        raw=RawJsonText(row["raw"]),
+    )
+
+
+def read_snapshot(supa_dir: Path) -> Optional[Tuple[Dict[str, List[ShipmentOut]], List[EventOut]]]:
+    """이전 실행의 shipments_status.csv / events_status.csv (없으면 None)"""
+    ship_path = supa_dir / "shipments_status.csv"
+    ev_path = supa_dir / "events_status.csv"
+    if not (ship_path.exists() and ev_path.exists()):
+        return None
+    shipments: Dict[str, List[ShipmentOut]] = {}
+    with ship_path.open("r", encoding="utf-8", newline="") as f:
+        for row in csv.DictReader(f):
+            sh = shipment_from_csv_row(row)
+            shipments.setdefault(sh.hvdc_code, []).append(sh)
+    with ev_path.open("r", encoding="utf-8", newline="") as f:
+        events = [event_from_csv_row(row) for row in csv.DictReader(f)]
+    return shipments, events
+
+
+@dataclass
+class IncrementalPlan:
+    """이번 실행에서 build할 hvdc_code와 재사용할 이전 snapshot"""
+    changed: set  # 신규 + 내용 변경 (build 대상)
+    new: set
+    deleted: set  # 이전 state에는 있으나 입력에서 사라진 hvdc_code
+    prev_shipments: Dict[str, List[ShipmentOut]]
+    prev_events: List[EventOut]
+    full: bool  # state/snapshot 사용 불가 → 전체 재계산
+
+
+def plan_incremental(digest: InputDigest, state: Optional[Dict[str, Any]], fingerprint: str, supa_dir: Path) -> IncrementalPlan:
+    snapshot = read_snapshot(supa_dir) if state is not None else None
+    prev_shipments, prev_events = snapshot if snapshot is not None else ({}, [])
+    prev_codes: Dict[str, str] = state["codes"] if state is not None else {}
+    full = snapshot is None or state.get("fingerprint") != fingerprint
+    if full:
+        changed = set(digest.hashes)
+    else:
+        changed = {code for code, h in digest.hashes.items() if prev_codes.get(code) != h}
+        # snapshot이 state와 어긋난 hvdc_code(수동 편집 등)는 다시 build
+        for code, n in digest.status_counts.items():
+            if code not in changed and len(prev_shipments.get(code, ())) != n:
+                changed.add(code)
+    return IncrementalPlan(
+        changed=changed,
+        new={code for code in digest.hashes if code not in prev_codes},
+        deleted=set(prev_codes) - set(digest.hashes),
+        prev_shipments=prev_shipments,
+        prev_events=prev_events,
+        full=full,
+    )
+
+
+def merge_incremental(res: ShardResult, digest: InputDigest, plan: IncrementalPlan) -> ShardResult:
+    """
+    build된 hvdc_code(plan.changed) 결과 + 이전 snapshot(나머지)을 합쳐 전체 snapshot 구성
+    - shipments: Status 입력 순번 / events: (hvdc_code, event_date, location) — 전체 build와 같은 순서
+    - distinct_loc_counts: 재사용 event의 raw count 포함
+    """
+    built = dict(res.shipments)
+    reuse = {code: iter(rows) for code, rows in plan.prev_shipments.items() if code not in plan.changed}
+    shipments = [
+        (idx, built[idx] if code in plan.changed else next(reuse[code]))
+        for idx, code in enumerate(digest.status_order)
+    ]
+
+    kept = [ev for ev in plan.prev_events if ev.hvdc_code in digest.hashes and ev.hvdc_code not in plan.changed]
+    events = list(heapq.merge(res.events, kept, key=lambda x: (x.hvdc_code, x.event_date, x.location)))
+
+    distinct_loc_counts = dict(res.distinct_loc_counts)
+    for ev in kept:
+        cnt = int(json.loads(ev.raw).get("count", 0))
+        distinct_loc_counts[ev.location] = distinct_loc_counts.get(ev.location, 0) + cnt
+
+    status_codes = set(digest.status_counts)
+    return ShardResult(
+        shipments=shipments,
+        events=events,
+        status_codes=status_codes,
+        status_in=len(digest.status_order),
+        status_dups=len(digest.status_order) - len(status_codes),
+        wh_codes=digest.wh_codes,
+        wh_in=digest.wh_in,
+        distinct_loc_counts=distinct_loc_counts,
+        location_cache=res.location_cache,
+    )
+
+
+def write_delta(
+    delta_dir: Path,
+    plan: IncrementalPlan,
+    shipments: List[ShipmentOut],
+    events: List[EventOut],
+    raw_json: Optional[RawJsonCache] = None,
+) -> Dict[str, int]:
+    """
+    downstream loader용 delta CSV
+    - *_upsert.csv: build된 hvdc_code의 shipments/events (전체 snapshot과 같은 컬럼)
+    - *_delete.csv: 사라진 shipments(hvdc_code) / events(event_id)
+    """
+    ship_up = [sh for sh in shipments if sh.hvdc_code in plan.changed]
+    ev_up = [ev for ev in events if ev.hvdc_code in plan.changed]
+    current = {sh.hvdc_code for sh in shipments}
+    ship_del = sorted(code for code in plan.prev_shipments if code not in current)
+    event_ids = {ev.event_id for ev in events}
+    ev_del = [ev for ev in plan.prev_events if ev.event_id not in event_ids]
+
+    write_csv(delta_dir / "shipments_status_upsert.csv", SHIP_HEADERS, (shipment_csv_row(sh, raw_json) for sh in ship_up))
+    write_csv(delta_dir / "events_status_upsert.csv", EV_HEADERS, (event_csv_row(ev, raw_json) for ev in ev_up))
+    write_csv(delta_dir / "shipments_status_delete.csv", DELETE_SHIP_HEADERS, ({"hvdc_code": c} for c in ship_del))
+    write_csv(delta_dir / "events_status_delete.csv", DELETE_EV_HEADERS,
+              ({"event_id": ev.event_id, "hvdc_code": ev.hvdc_code} for ev in ev_del))
+    return {
+        "shipments_upsert": len(ship_up),
+        "events_upsert": len(ev_up),
+        "shipments_delete": len(ship_del),
+        "events_delete": len(ev_del),
+    }
+
+
+# -----------------------------
+# Main
+# -----------------------------
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--status", required=True, help="HVDC all status JSON 경로")
+    ap.add_argument("--warehouse", required=True, help="HVDC warehouse status JSON 경로(케이스 단위)")
+    ap.add_argument("--outdir", default="out", help="출력 폴더 (default: out)")
+    ap.add_argument("--base-iri", default="https://example.com/hvdc", help="OPS TTL instance base IRI (no #).")
+    ap.add_argument("--case-locations", default="", help="Option-C locations.csv 경로(있으면 StatusEvent location_code 매핑 + atLocation 생성).")
+    ap.add_argument("--location-alias-json", default="", help="(옵션) locationText->location_code alias JSON 경로")
+    ap.add_argument("--location-cache-size", type=int, default=4096, help="LocationMapper memo 캐시 크기(LRU, 0=비활성)")
+    ap.add_argument("--workers", type=int, default=1, help="병렬 프로세스 수: 입력 byte 구간 파싱 + hvdc_code hash shard (1=단일 프로세스)")
+    ap.add_argument("--wh-chunk-rows", type=int, default=50000, help="WH 컬럼 변환/집계 단위 row 수")
+    ap.add_argument("--alias-mode", choices=ALIAS_MODES, default="link", help="호환용 복제본 출력 방식: link(hardlink, 불가 시 copy) / copy / tee")
+    ap.add_argument("--no-ops-ttl", action="store_true", help="OPS TTL(hvdc_ops_status.ttl) 생성 비활성화")
+    ap.add_argument("--no-legacy-ttl", action="store_true", help="legacy hvdc.ttl 생성 비활성화")
+    ap.add_argument("--ttl-gzip", action="store_true", help="TTL을 gzip(.ttl.gz)으로 출력")
+    ap.add_argument("--no-ttl-raw-json", action="store_true", help="TTL에서 hvdc:rawJson 생략(빠른 실행용)")
+    ap.add_argument("--fast-json", action="store_true", help="raw JSON 직렬화에 orjson 사용(설치 시; 출력 형식이 json.dumps와 다름)")
+    ap.add_argument("--columnar", choices=COLUMNAR_FORMATS, default=None, help="CSV와 함께 typed Parquet/Arrow IPC 테이블 출력(pyarrow 필요)")
+    ap.add_argument("--incremental", action="store_true", help="hvdc_code별 content hash로 변경분만 재계산 + supabase/delta/ upsert/delete CSV 출력")
+    ap.add_argument("--state-file", default="", help="증분 실행 state 경로 (default: <outdir>/state/status_state.json)")
+    args = ap.parse_args()
+    if args.columnar:
+        from columnar_io import dataclass_columns, require_pyarrow, write_table  # type: ignore
+        try:
+            require_pyarrow(args.columnar)
+        except RuntimeError as e:
+            ap.error(str(e))
+
+    status_path = Path(args.status).expanduser().resolve()
+    wh_path = Path(args.warehouse).expanduser().resolve()
+    outdir = Path(args.outdir).expanduser().resolve()
+
+    locations_csv = Path(args.case_locations).expanduser().resolve() if args.case_locations else None
+    alias_json = Path(args.location_alias_json).expanduser().resolve() if args.location_alias_json else None
 
     # Output paths
     supa_dir = outdir / "supabase"
     onto_dir = outdir / "ontology"
     rep_dir = outdir / "report"
+
+    # LocationMapper 준비(있으면)
+    mapper = LocationMapper(locations_csv=locations_csv, alias_json=alias_json, cache_size=args.location_cache_size)
+    raw_json = RawJsonCache(fast=args.fast_json)
+
+    # 증분 실행: content hash가 바뀐(신규 포함) hvdc_code만 build, 나머지는 이전 snapshot 재사용
+    digest: Optional[InputDigest] = None
+    plan: Optional[IncrementalPlan] = None
+    if args.incremental:
+        state_path = Path(args.state_file).expanduser().resolve() if args.state_file else outdir / "state" / "status_state.json"
+        fingerprint = config_fingerprint(locations_csv, alias_json, raw_json.fast)
+        digest = digest_inputs(status_path, wh_path)
+        plan = plan_incremental(digest, load_state(state_path), fingerprint, supa_dir)
+    only_codes = plan.changed if plan is not None else None
+
+    if only_codes is not None and not only_codes:
+        res = ShardResult([], [], set(), 0, 0, set(), 0, {})  # 변경 없음: 입력 재스캔 생략
+    elif args.workers > 1:
+        res = build_sharded(
+            status_path, wh_path, args.workers, args.wh_chunk_rows,
+            locations_csv=locations_csv, alias_json=alias_json, cache_size=args.location_cache_size,
+            only_codes=only_codes, fast_json=args.fast_json,
+        )
+    else:
+        res = build_shard(status_path, wh_path, mapper, args.wh_chunk_rows, only_codes=only_codes)
+    if plan is not None:
+        res = merge_incremental(res, digest, plan)
+    shipments = [sh for _, sh in res.shipments]
+    events = res.events
+    status_codes = res.status_codes
+    status_in = res.status_in
+    status_dups = res.status_dups
+    wh_codes = res.wh_codes
+    wh_in = res.wh_in
+    distinct_loc_counts = res.distinct_loc_counts
+
+    # Orphan WH: WH에는 있는데 Status에 없는 hvdc_code
+    orphan_wh_codes = sorted(list(wh_codes - status_codes))
+
     ensure_dir(supa_dir)
     ensure_dir(onto_dir)
     ensure_dir(rep_dir)
@@ -979,115 +2637,57 @@ def main() -> None:
     # schema.sql
     (supa_dir / "schema.sql").write_text(gen_schema_sql(), encoding="utf-8")
 
-    # shipments_status.csv
-    ship_headers = [
-        "hvdc_code",
-        "status_no",
-        "vendor",
-        "band",
-        "incoterms",
-        "currency",
-        "pol",
-        "pod",
-        "bl_awb",
-        "vessel",
-        "ship_mode",
-        "pkg",
-        "qty_cntr",
-        "cbm",
-        "gwt_kg",
-        "etd",
-        "eta",
-        "ata",
-        "warehouse_flag",
-        "warehouse_last_location",
-        "warehouse_last_location_code",
-        "warehouse_last_date",
-        "raw",
-    ]
-    ship_rows = []
-    for sh in shipments:
-        ship_rows.append({
-            "hvdc_code": sh.hvdc_code,
-            "status_no": sh.status_no if sh.status_no is not None else "",
-            "vendor": sh.vendor or "",
-            "band": sh.band or "",
-            "incoterms": sh.incoterms or "",
-            "currency": sh.currency or "",
-            "pol": sh.pol or "",
-            "pod": sh.pod or "",
-            "bl_awb": sh.bl_awb or "",
-            "vessel": sh.vessel or "",
-            "ship_mode": sh.ship_mode or "",
-            "pkg": sh.pkg if sh.pkg is not None else "",
-            "qty_cntr": sh.qty_cntr if sh.qty_cntr is not None else "",
-            "cbm": f"{sh.cbm:.4f}" if sh.cbm is not None else "",
-            "gwt_kg": f"{sh.gwt_kg:.2f}" if sh.gwt_kg is not None else "",
-            "etd": sh.etd.isoformat() if sh.etd else "",
-            "eta": sh.eta.isoformat() if sh.eta else "",
-            "ata": sh.ata.isoformat() if sh.ata else "",
-            "warehouse_flag": "true" if sh.warehouse_flag else "false",
-            "warehouse_last_location": sh.warehouse_last_location or "",
-            "warehouse_last_location_code": sh.warehouse_last_location_code or "",
-            "warehouse_last_date": sh.warehouse_last_date.isoformat() if sh.warehouse_last_date else "",
-            "raw": json.dumps(sh.raw, ensure_ascii=False),
-        })
-    write_csv(supa_dir / "shipments_status.csv", ship_headers, ship_rows)
-
-    # events_status.csv
-    ev_headers = [
-        "event_id",
-        "hvdc_code",
-        "event_type",
-        "location",
-        "location_code",
-        "location_match_method",
-        "location_match_score",
-        "event_date",
-        "source",
-        "raw",
-    ]
-    ev_rows = []
-    for ev in events:
-        ev_rows.append({
-            "event_id": ev.event_id,
-            "hvdc_code": ev.hvdc_code,
-            "event_type": ev.event_type,
-            "location": ev.location,
-            "location_code": ev.location_code or "",
-            "location_match_method": ev.location_match_method or "",
-            "location_match_score": f"{(ev.location_match_score or 0.0):.4f}",
-            "event_date": ev.event_date.isoformat(),
-            "source": ev.source,
-            "raw": json.dumps(ev.raw, ensure_ascii=False),
-        })
-    write_csv(supa_dir / "events_status.csv", ev_headers, ev_rows)
-
-    # 호환용 복제본
-    (supa_dir / "shipments.csv").write_text((supa_dir / "shipments_status.csv").read_text(encoding="utf-8"), encoding="utf-8")
-    (supa_dir / "logistics_events.csv").write_text((supa_dir / "events_status.csv").read_text(encoding="utf-8"), encoding="utf-8")
-
-    # TTL
+    # shipments_status.csv / events_status.csv (row dict는 쓰는 시점에 1건씩 생성)
+    # raw JSON은 레코드당 1회 직렬화하여 CSV/TTL에서 공유 (TTL 미출력 시 캐시 불필요)
+    ttl_raw = not (args.no_legacy_ttl and args.no_ops_ttl) and not args.no_ttl_raw_json
+    csv_raw_json = raw_json if (ttl_raw or args.fast_json or plan is not None or args.columnar) else None
+    # 호환용 복제본(shipments.csv / logistics_events.csv)은 alias로 함께 출력
+    write_csv(
+        supa_dir / "shipments_status.csv", SHIP_HEADERS, (shipment_csv_row(sh, csv_raw_json) for sh in shipments),
+        aliases=[supa_dir / "shipments.csv"], alias_mode=args.alias_mode,
+    )
+    write_csv(
+        supa_dir / "events_status.csv", EV_HEADERS, (event_csv_row(ev, csv_raw_json) for ev in events),
+        aliases=[supa_dir / "logistics_events.csv"], alias_mode=args.alias_mode,
+    )
+    if args.columnar:
+        write_table(supa_dir / "shipments_status", dataclass_columns(ShipmentOut),
+                    (shipment_record(sh, csv_raw_json) for sh in shipments), args.columnar)
+        write_table(supa_dir / "events_status", dataclass_columns(EventOut),
+                    (event_record(ev, csv_raw_json) for ev in events), args.columnar)
+
+    # TTL (subject block 단위 스트리밍)
+    ttl_ext = ".gz" if args.ttl_gzip else ""
     if not args.no_legacy_ttl:
-        write_legacy_ttl(onto_dir / "hvdc.ttl", shipments, events)
+        write_legacy_ttl(onto_dir / f"hvdc.ttl{ttl_ext}", shipments, events, raw_json=raw_json, include_raw=not args.no_ttl_raw_json)
     if not args.no_ops_ttl:
         write_ops_ttl_status(
-            onto_dir / "hvdc_ops_status.ttl",
+            onto_dir / f"hvdc_ops_status.ttl{ttl_ext}",
             shipments,
             events,
             base_iri=str(args.base_iri),
             locations_csv=locations_csv if (locations_csv and locations_csv.exists()) else None,
+            raw_json=raw_json,
+            include_raw=not args.no_ttl_raw_json,
         )
+    delta_counts: Optional[Dict[str, int]] = None
+    if plan is not None:
+        delta_counts = write_delta(supa_dir / "delta", plan, shipments, events, raw_json=raw_json)
+    raw_json.clear()
+
+    # location mapping (리포트용; QA 캐시 통계에 포함되도록 먼저 계산)
+    mapped = {loc: mapper.map(loc) for loc in distinct_loc_counts.keys()} if mapper.enabled else {}
 
     # QA
-    wh_matched = sum(1 for code in wh_by_code.keys() if code in status_codes)
+    wh_matched = sum(1 for code in wh_codes if code in status_codes)
     write_qa_report(
         rep_dir / "qa_report.md",
-        status_in=len(status_records),
+        status_in=status_in,
         ship_out=len(shipments),
-        wh_in=len(wh_records),
+        wh_in=wh_in,
         wh_matched=wh_matched,
         orphan=len(orphan_wh_codes),
+        location_cache=sum_cache_info([res.location_cache, mapper.cache_info() if mapper.enabled else None]),
     )
     (rep_dir / "orphan_wh.json").write_text(
         json.dumps({"orphan_hvdc_code": orphan_wh_codes}, ensure_ascii=False, indent=2),
@@ -1096,7 +2696,6 @@ def main() -> None:
 
     # location mapping reports (if mapper enabled)
     if mapper.enabled:
-        mapped = {loc: mapper.map(loc) for loc in distinct_loc_counts.keys()}
         write_location_match_reports(rep_dir, distinct_loc_counts, mapped)
 
     # console
@@ -1108,6 +2707,19 @@ def main() -> None:
     print(f"- {rep_dir / 'orphan_wh.json'}")
     if mapper.enabled:
         print(f"- {rep_dir / 'location_match_report.md'}")
+    if plan is not None and digest is not None and delta_counts is not None:
+        save_state(state_path, fingerprint, digest.hashes)
+        mode = "full" if plan.full else "incremental"
+        print(f"- {supa_dir / 'delta'}/ ({mode})")
+        print(
+            f"  hvdc_code: recomputed {len(plan.changed)} (new {len(plan.new)}), "
+            f"reused {len(digest.hashes) - len(plan.changed)}, deleted {len(plan.deleted)}"
+        )
+        print(
+            f"  delta rows: shipments +{delta_counts['shipments_upsert']}/-{delta_counts['shipments_delete']}, "
+            f"events +{delta_counts['events_upsert']}/-{delta_counts['events_delete']}"
+        )
+        print(f"- {state_path}")
     if status_dups > 0:
         print(f"WARNING: Status duplicate hvdc_code detected: {status_dups}")
 
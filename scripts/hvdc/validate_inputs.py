@@ -7,6 +7,7 @@ It checks:
 - Source JSON presence (Status/Warehouse/Customs)
 - ETL scripts presence (Untitled-4, Untitled-3)
 - Optional Flow Code script presence (flow_code_calculator.py)
+- ETL sibling modules presence (output_alias.py, iri_factory.py; columnar_io.py optional)
 - Python dependencies import (pandas, numpy)
 
 Usage:
@@ -46,6 +47,13 @@ CUSTOMS_CANDIDATES = [
     "HVDC_STATUS.json".lower(),
 ]
 
+# Modules the ETL scripts import from their own folder: (file, required, used for)
+ETL_SIBLING_MODULES = [
+    ("output_alias.py", True, "compatibility alias CSVs"),
+    ("iri_factory.py", True, "Status OPS TTL / Option-C --export-ttl"),
+    ("columnar_io.py", False, "--columnar / --input-format parquet|arrow only"),
+]
+
 
 def _first_existing(base: Path, candidates: Iterable[str]) -> Path | None:
     for name in candidates:
@@ -108,6 +116,9 @@ def main() -> int:
         missing.append(f"Missing ETL script: {etl4}")
     if not etl3.exists():
         missing.append(f"Missing ETL script: {etl3}")
+    for name, required, _ in ETL_SIBLING_MODULES:
+        if required and not (src / name).exists():
+            missing.append(f"Missing ETL module: {src / name}")
 
     print("\n[inputs]")
     print("- status_json:", status_json if status_json else "(missing)")
@@ -116,6 +127,10 @@ def main() -> int:
     print("- etl4:", etl4 if etl4.exists() else "(missing)")
     print("- etl3:", etl3 if etl3.exists() else "(missing)")
     print("- flow_code_calculator:", flow_calc if flow_calc.exists() else "(missing)")
+    for name, required, used_for in ETL_SIBLING_MODULES:
+        p = src / name
+        status = p if p.exists() else ("(missing)" if required else "(optional, missing)")
+        print(f"- {name} ({used_for}):", status)
 
     print("\n[python deps]")
     for pkg in ["pandas", "numpy"]:
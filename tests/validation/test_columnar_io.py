@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import ast
+import importlib.util
+import sys
+from dataclasses import asdict, dataclass
+from datetime import date
+from pathlib import Path
+from typing import Optional
+
+import pytest
+
+
+def _load_columnar_module():
+    repo_root = Path(__file__).resolve().parents[2]
+    module_path = repo_root / "scripts" / "etl" / "columnar_io.py"
+    spec = importlib.util.spec_from_file_location("etl_columnar_io", module_path)
+    if spec is None or spec.loader is None:
+        raise RuntimeError(f"Unable to load module: {module_path}")
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+@dataclass
+class _Row:
+    hvdc_code: str
+    pkg: Optional[int]
+    cbm: Optional[float]
+    flag: bool
+    eta: Optional[date]
+    raw: dict
+
+
+def test_dataclass_columns_and_coerce():
+    mod = _load_columnar_module()
+    assert mod.dataclass_columns(_Row) == [
+        ("hvdc_code", "str"), ("pkg", "int"), ("cbm", "float"), ("flag", "bool"), ("eta", "date"), ("raw", "str"),
+    ]
+    assert [mod._coerce("int", v) for v in (None, "", float("nan"), 3.0, "4")] == [None, None, None, 3, 4]
+    assert mod._coerce("str", 12) == "12" and mod._coerce("str", "") == ""
+    assert mod._coerce("float", float("nan")) is None
+
+
+@pytest.mark.parametrize("fmt", ["parquet", "arrow"])
+def test_write_table_round_trip(tmp_path: Path, fmt: str):
+    pytest.importorskip("pyarrow")
+    mod = _load_columnar_module()
+    rows = [
+        _Row("HVDC-A-1", 3, 1.5, True, date(2024, 3, 1), {"No": 1}),
+        _Row("HVDC-A-2", None, None, False, None, {}),
+    ]
+    out = mod.write_table(
+        tmp_path / "shipments.csv", mod.dataclass_columns(_Row), (asdict(r) for r in rows), fmt, batch_rows=1,
+    )
+    assert out.name == f"shipments{mod.SUFFIXES[fmt]}"
+    table = mod.read_table(out)
+    assert table.column("pkg").to_pylist() == [3, None]
+    assert table.column("eta").to_pylist() == [date(2024, 3, 1), None]
+    assert mod.read_text_rows(out)[0] == {
+        "hvdc_code": "HVDC-A-1", "pkg": "3", "cbm": "1.5", "flag": "true", "eta": "2024-03-01", "raw": "{'No': 1}",
+    }
+
+
+def test_etl_scripts_import_columnar_io_lazily():
+    repo_root = Path(__file__).resolve().parents[2]
+    mod = _load_columnar_module()
+    for name in ("status_etl.py", "optionc_etl.py", "export_hvdc_ops_ttl.py"):
+        tree = ast.parse((repo_root / "scripts" / "etl" / name).read_text(encoding="utf-8"))
+        top_imports = {n.module for n in tree.body if isinstance(n, ast.ImportFrom)}
+        assert "columnar_io" not in top_imports
+        formats = [
+            ast.literal_eval(n.value) for n in tree.body
+            if isinstance(n, ast.Assign) and any(getattr(t, "id", None) == "COLUMNAR_FORMATS" for t in n.targets)
+        ]
+        assert formats == [mod.COLUMNAR_FORMATS]
@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+import importlib.util
+import sys
+from decimal import Decimal
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+
+def _load_calc_module():
+    repo_root = Path(__file__).resolve().parents[2]
+    module_path = repo_root / "scripts" / "etl" / "flow_code_calculator.py"
+    spec = importlib.util.spec_from_file_location("etl_flow_code_calculator", module_path)
+    if spec is None or spec.loader is None:
+        raise RuntimeError(f"Unable to load module: {module_path}")
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_present_mask_matches_string_reference_for_each_dtype():
+    calc = _load_calc_module()
+    epoch = 1_709_914_532_082
+    series = [
+        pd.Series([epoch, 0, -1, epoch], dtype="int64"),
+        pd.Series([epoch, 0, None, 5], dtype="Int64"),
+        pd.Series([1.5, 0.0, -0.0, np.nan, np.inf, float(epoch)]),
+        pd.Series([1.5, None, 0.0], dtype="Float64"),
+        pd.Series([True, False, True]),
+        pd.Series(pd.to_datetime(["2024-03-01", None])),
+        pd.Series(["2024-03-07", "", " ", "0", "0.0", "O", "o", "nan", "NaN", "NaT", "None", "-",
+                   "N/A", "n/a", " x ", None]),
+        pd.Series(["2024-03-07", " - ", "N/A", None], dtype="string"),
+        pd.Series([epoch, "2024-03-07", 0, 0.0, -0.0, False, True, 1, 1.0, "0", None, np.nan,
+                   Decimal("0.00"), np.float64(0.0), "", " 5 "], dtype=object),
+        pd.Series([False, 0, 0.0, "x"], dtype=object),
+        pd.Series(["a", "", "-", None], dtype="category"),
+        pd.Series([[1], [], "x"], dtype=object),
+    ]
+    for s in series:
+        expected = calc._present_mask_str(s)
+        got = calc._present_mask(s)
+        assert got.dtype == bool, s.dtype
+        assert got.tolist() == expected.tolist(), (s.dtype, s.tolist())
+        assert got.index.equals(s.index)
+
+    shifted = pd.Series([0, epoch, 3], index=[10, 11, 12])
+    assert calc._present_mask(shifted).tolist() == [False, True, True]
+
+
+def _legacy_calculate_flow_code_v35(calc, df, warehouse_columns, site_columns, final_location_col="Final_Location"):
+    """calculate_flow_code_v35 before the presence-matrix kernel (np.where chain on Series)."""
+    def count(cols):
+        cnt = pd.Series(0, index=df.index)
+        for c in cols:
+            if c in df.columns:
+                cnt = cnt + calc._present_mask_str(df[c]).astype(int)
+        return cnt
+
+    wh_cnt = count([c for c in warehouse_columns if c != "MOSB"])
+    has_mosb = calc._present_mask_str(df["MOSB"]) if "MOSB" in df.columns else pd.Series(False, index=df.index)
+    has_site = count(site_columns) > 0
+    flow = pd.Series(0, index=df.index, dtype="int64")
+    flow = np.where(has_site & ~has_mosb & (wh_cnt == 0), 1, flow)
+    flow = np.where(has_site & ~has_mosb & (wh_cnt >= 1), 2, flow)
+    flow = np.where(has_site & has_mosb & (wh_cnt == 0), 3, flow)
+    flow = np.where(has_site & has_mosb & (wh_cnt >= 1), 4, flow)
+    flow = np.where(~has_site & has_mosb, 5, flow)
+    flow = np.where(~has_site & ~has_mosb & (wh_cnt >= 2), 5, flow)
+    reason = [None] * len(df)
+    flow_over = flow
+    if final_location_col in df.columns:
+        loc = df[final_location_col].astype(str).str.strip().str.upper()
+        forced = loc.isin(["AGI", "DAS"]).to_numpy() & (flow < 3)
+        flow_over = np.where(forced, 3, flow)
+        reason = np.where(forced, "AGI/DAS requires MOSB leg", None).tolist()
+    return flow_over.tolist(), flow.tolist(), reason
+
+
+def test_flow_code_kernel_matches_legacy_calculator():
+    import random
+
+    calc = _load_calc_module()
+    rnd = random.Random(23)
+    epoch = 1_709_914_532_082
+    values = [epoch, 0, None, np.nan, "2024-03-07", "", "-", "N/A", " x "]
+    wh_cols = ["DSV Indoor", "DSV Outdoor", "DSV Indoor", "MOSB", "Missing WH"]
+    site_cols = ["MIR", "SHU", "DAS", "AGI"]
+    df = pd.DataFrame({
+        c: [rnd.choice(values) for _ in range(400)]
+        for c in ["DSV Indoor", "DSV Outdoor", "MOSB", "MIR", "SHU", "DAS", "AGI"]
+    })
+    df["Final_Location"] = [rnd.choice(["AGI", " das ", "MIR", "", None, np.nan, 3]) for _ in range(len(df))]
+    before = df.copy()
+
+    for frame, fl_col in ((df, "Final_Location"), (df.drop(columns=["MOSB"]), "Final_Location"), (df, "Nope")):
+        expected = _legacy_calculate_flow_code_v35(calc, frame, wh_cols, site_cols, fl_col)
+        flow, flow_orig, reason = calc.flow_code_v35_arrays(frame, wh_cols, site_cols, fl_col)
+        assert flow.dtype == np.int64 and flow_orig.dtype == np.int64
+        assert (flow.tolist(), flow_orig.tolist(), reason.tolist()) == expected
+
+        out = calc.calculate_flow_code_v35(frame, wh_cols, site_cols, fl_col)
+        assert out["FLOW_CODE"].tolist() == expected[0]
+        assert out["FLOW_CODE_ORIG"].tolist() == expected[1]
+        assert out["FLOW_DESCRIPTION"].tolist() == [calc.FLOW_DESCRIPTIONS[v] for v in expected[0]]
+    pd.testing.assert_frame_equal(df, before)
+
+    empty = np.zeros((3, 0), dtype=bool)
+    flow, flow_orig, reason = calc.flow_code_v35_kernel(empty, [], [], [], np.array([True, False, True]))
+    assert flow.tolist() == [3, 0, 3] and flow_orig.tolist() == [0, 0, 0]
+    assert reason.tolist() == ["AGI/DAS requires MOSB leg", None, "AGI/DAS requires MOSB leg"]
+
+
+def test_flow_columns_only_and_no_copy_normalize():
+    calc = _load_calc_module()
+    df = pd.DataFrame({
+        "DSV Indoor": [1, 0, 0], "MOSB": [0, 1, 0], "MIR": [1, 1, 0],
+        "Final_Location": ["MIR", "AGI", "DAS"], "raw": ["a", "b", "c"],
+    }, index=[5, 6, 7])
+    assert calc.normalize_column_names(df, copy=False) is df
+    assert calc.normalize_column_names(df) is not df
+
+    full = calc.calculate_flow_code_v35(df, ["DSV Indoor", "MOSB"], ["MIR"])
+    cols = calc.calculate_flow_code_v35(df, ["DSV Indoor", "MOSB"], ["MIR"], columns_only=True)
+    assert list(cols.columns) == ["FLOW_CODE_ORIG", "FLOW_CODE", "FLOW_OVERRIDE_REASON", "FLOW_DESCRIPTION"]
+    pd.testing.assert_frame_equal(cols, full[cols.columns])
+    assert cols["FLOW_CODE"].tolist() == [2, 3, 3]
+    assert "FLOW_CODE" not in df.columns
+
+
+def test_flow_code_incremental_reuses_only_unchanged_rows():
+    import random
+
+    calc = _load_calc_module()
+    rnd = random.Random(25)
+    values = [1_709_914_532_082, 0, None, "2024-03-07", "-"]
+    wh_cols, site_cols = ["DSV Indoor", "DSV Outdoor", "MOSB"], ["MIR", "SHU", "DAS", "AGI"]
+    df = pd.DataFrame({c: [rnd.choice(values) for _ in range(200)] for c in wh_cols + site_cols})
+    df["Final_Location"] = [rnd.choice(["AGI", "das", "MIR", None]) for _ in range(len(df))]
+    keys = [f"case-{i}" for i in range(len(df) - 1)] + [None]
+
+    *first, state, recomputed = calc.flow_code_v35_incremental(df, wh_cols, site_cols, keys)
+    assert recomputed.all() and len(state["keys"]) == len(df) - 1
+
+    changed = df.copy()
+    changed.loc[3, "MOSB"] = "2024-04-01" if changed.loc[3, "MOSB"] in (None, 0, "-") else None
+    changed.loc[7, "Final_Location"] = "SHU" if changed.loc[7, "Final_Location"] != "SHU" else "AGI"
+    changed.loc[9, "DSV Indoor"] = changed.loc[9, "DSV Indoor"]  # same value: reused
+    reordered = (list(reversed(wh_cols)), list(reversed(site_cols)))
+    *second, state2, recomputed2 = calc.flow_code_v35_incremental(changed, *reordered, keys, previous=state)
+    assert np.flatnonzero(recomputed2).tolist() == [3, 7, len(df) - 1]
+
+    for got, want in zip(second, calc.flow_code_v35_arrays(changed, wh_cols, site_cols)):
+        assert got.tolist() == want.tolist()
+    for got, want in zip(first, calc.flow_code_v35_arrays(df, wh_cols, site_cols)):
+        assert got.tolist() == want.tolist()
+
+    *_, recomputed3 = calc.flow_code_v35_incremental(df, wh_cols + ["DSV MZD"], site_cols, keys, previous=state2)
+    assert recomputed3.all()  # another layout: state ignored
+
+
+def test_flow_code_incremental_ignores_truncated_state():
+    calc = _load_calc_module()
+    wh_cols, site_cols = ["DSV Indoor", "MOSB"], ["MIR", "AGI"]
+    df = pd.DataFrame({
+        "DSV Indoor": ["2024-03-01", None, "2024-03-02", None],
+        "MOSB": [None, "2024-03-05", "2024-03-06", None],
+        "MIR": ["2024-03-09", None, None, None],
+        "AGI": [None, "2024-03-10", None, None],
+        "Final_Location": ["MIR", "AGI", "DAS", None],
+    })
+    keys = ["a", "b", "c", "d"]
+    *_, state, _ = calc.flow_code_v35_incremental(df, wh_cols, site_cols, keys)
+    words = len(state["bitmask"]) // len(keys)
+
+    broken = [
+        {**state, "bitmask": state["bitmask"][:-1]},
+        {**state, "bitmask": state["bitmask"] + [0] * words},
+        {**state, "flow_code": state["flow_code"][:2]},
+        {**state, "final_location": state["final_location"][1:]},
+        {**state, "override_reason": None},
+        {**state, "keys": ["a", "a", "c", "d"]},
+        {k: v for k, v in state.items() if k != "flow_code_orig"},
+    ]
+    want = calc.flow_code_v35_arrays(df, wh_cols, site_cols)
+    for previous in broken:
+        *got, _, recomputed = calc.flow_code_v35_incremental(df, wh_cols, site_cols, keys, previous=previous)
+        assert recomputed.all()
+        for g, w in zip(got, want):
+            assert g.tolist() == w.tolist()
@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import importlib.util
+import re
+import sys
+from pathlib import Path
+
+
+def _load_iri_module():
+    repo_root = Path(__file__).resolve().parents[2]
+    module_path = repo_root / "scripts" / "etl" / "iri_factory.py"
+    spec = importlib.util.spec_from_file_location("etl_iri_factory", module_path)
+    if spec is None or spec.loader is None:
+        raise RuntimeError(f"Unable to load module: {module_path}")
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def _legacy_iri(base: str, *parts) -> str:
+    def slug(x) -> str:
+        x = str(x).strip()
+        x = re.sub(r"\s+", "_", x)
+        x = re.sub(r"[^0-9A-Za-z._\-]+", "-", x)
+        return x[:180] if len(x) > 180 else x
+    return base.rstrip("/") + "/" + "/".join(slug(p) for p in parts)
+
+
+def test_iri_factory_matches_legacy_iri_and_slugs_once():
+    mod = _load_iri_module()
+    base = "https://example.com/hvdc/"
+    keys = [
+        ("Shipment", "HVDC-ADOPT-SCT-0001"),
+        ("Case", "HVDC-ADOPT-SCT-0001", "12"),
+        ("Case", "HVDC-ADOPT-SCT-0001", 12),
+        ("Location", "  DSV Indoor (M44) "),
+        ("CaseEvent", "HVDC/ADOPT 1", "x" * 300, "a\\b"),
+        ("Shipment", "HVDC-ADOPT-SCT-0001"),
+    ]
+    factory = mod.IriFactory(base)
+    for k in keys:
+        expected = _legacy_iri(base, *k)
+        assert mod.iri(base, *k) == expected
+        assert factory.ref(*k) == f"<{expected}>"
+        assert factory.iri(*k) == expected
+
+    segments = {str(p) for k in keys for p in k}
+    assert factory.slug_calls == len(segments)
+    assert factory.misses == len({tuple(map(str, k)) for k in keys})
+
+    # 1 / 1.0 / True hash alike but must not share a cached slug
+    assert factory.ref("Case", "X", 1) != factory.ref("Case", "X", True)
+    assert factory.ref("Case", "X", 1.0).endswith("/Case/X/1.0>")
+
+
+def test_iri_factory_bounded_cache():
+    mod = _load_iri_module()
+    factory = mod.IriFactory("https://example.com/hvdc", maxsize=4)
+    refs = [factory.ref("Shipment", f"S{i}") for i in range(10)]
+    assert refs == [f"<https://example.com/hvdc/Shipment/S{i}>" for i in range(10)]
+    assert len(factory._refs) <= 4 and len(factory._slugs) <= 4
@@ -0,0 +1,332 @@
+from __future__ import annotations
+
+import importlib.util
+import sys
+from dataclasses import asdict, fields
+from pathlib import Path
+
+
+def _load_etl_module():
+    repo_root = Path(__file__).resolve().parents[2]
+    etl_path = repo_root / "scripts" / "etl" / "optionc_etl.py"
+    sys.path.insert(0, str(etl_path.parent))
+    spec = importlib.util.spec_from_file_location("etl_optionc", etl_path)
+    if spec is None or spec.loader is None:
+        raise RuntimeError(f"Unable to load ETL module: {etl_path}")
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_event_record_projects_to_event_and_debug_rows():
+    etl = _load_etl_module()
+    locations = {
+        "DSV_INDOOR": etl.LocationRow(1, "DSV_INDOOR", "DSV Indoor", "WAREHOUSE"),
+        "MIR_SITE": etl.LocationRow(2, "MIR_SITE", "MIR", "SITE", "MIR", is_site=True),
+    }
+    record = {
+        "HVDC CODE": "HVDC-ADOPT-SCT-0001",
+        "Case No.": "1",
+        "DSV Indoor": 1_706_745_600_000,  # 2024-02-01
+        "MIR": 1_709_251_200_000,  # 2024-03-01
+    }
+    events = list(etl.iter_events(record, "all.json", ["DSV Indoor"], ["MIR"], locations))
+    events += etl.derive_out_events(events, locations)
+
+    rows = list(etl.project_events(events, etl.EVENT_COLUMNS))
+    debug = list(etl.project_events(events, etl.EVENT_DEBUG_COLUMNS))
+    assert [e.event_type for e in events] == ["WH_IN", "SITE_ARRIVAL", "WH_OUT_DERIVED"]
+    for e, row, dbg in zip(events, rows, debug):
+        assert list(row) == [f.name for f in fields(etl.EventRow)]
+        assert list(dbg) == [f.name for f in fields(etl.EventDebugRow)]
+        assert row == asdict(etl.EventRow(*(getattr(e, k) for k in etl.EVENT_COLUMNS)))
+        assert dbg == asdict(etl.EventDebugRow(*(getattr(e, k) for k in etl.EVENT_DEBUG_COLUMNS)))
+        assert row["location_id"] == locations[dbg["location_code"]].location_id
+
+
+def test_flow_keys_match_case_keys_for_mixed_case_columns():
+    etl = _load_etl_module()
+    records = [
+        {"HVDC CODE": "HVDC-ADOPT-SCT-0001", "Case No.": 7, "No.": "1", "Final_Location": "MIR"},
+        {"HVDC CODE": "HVDC-ADOPT-SCT-0002", "No.": "2", "Final_Location": "MIR"},
+        {"No.": "3"},
+    ]
+    assert etl.attach_ids(records) == 1
+    merged, _ = etl.left_merge_all_wh(records)
+    dedup, _ = etl.dedup_by_case_key(merged)
+    cases = etl.build_cases(dedup)
+    flows = etl.build_flows_option_c(dedup, wh_cols=[], site_cols=["MIR"], customs_by_hvdc={})
+
+    expected = [("HVDC-ADOPT-SCT-0001", "7"), ("HVDC-ADOPT-SCT-0002", "NA-2")]
+    assert [(c.hvdc_code, c.case_no) for c in cases] == expected
+    assert [(f.hvdc_code, f.case_no) for f in flows] == expected
+
+
+def _legacy_pick(etl, a, b):
+    a_ms, b_ms = etl.compute_row_last_ms(a), etl.compute_row_last_ms(b)
+    if a_ms != b_ms:
+        return a if a_ms > b_ms else b
+    a_sd = int(a.get("Status_Location_Date") or 0) if etl._is_epoch_ms(a.get("Status_Location_Date")) else 0
+    b_sd = int(b.get("Status_Location_Date") or 0) if etl._is_epoch_ms(b.get("Status_Location_Date")) else 0
+    if a_sd != b_sd:
+        return a if a_sd > b_sd else b
+    a_src, b_src = str(a.get("_source") or ""), str(b.get("_source") or "")
+    if a_src != b_src:
+        if b_src == "WH":
+            return b
+        if a_src == "WH":
+            return a
+    return a
+
+
+def test_best_per_key_matches_sequential_pick_best_record():
+    import random
+
+    etl = _load_etl_module()
+    rnd = random.Random(3)
+    base = 1_700_000_000_000
+    records = []
+    for i in range(400):
+        r = {
+            "HVDC CODE": f"HVDC-ADOPT-SCT-{rnd.randrange(40):04d}",
+            "Case No.": str(rnd.randrange(3)),
+            "_source": rnd.choice(["ALL", "WH", ""]),
+            "row": i,
+        }
+        for col in rnd.sample(["DSV Indoor", "MOSB", "MIR", "ETA/ATA"], rnd.randrange(4)):
+            r[col] = rnd.choice([base, base + 1, base + 2, str(base + 2), "2024-01-01", None])
+        if rnd.random() < 0.7:
+            r["Status_Location_Date"] = rnd.choice([base, base + 5, "", None, 12])
+        records.append(r)
+
+    expected = {}
+    for r in records:
+        k = etl._extract_ids(r)
+        expected[k] = _legacy_pick(etl, expected[k], r) if k in expected else r
+
+    keys = [etl._extract_ids(r) for r in records]
+    best = etl.best_per_key(records, keys)
+    assert list(best) == list(expected)
+    assert all(best[k] is expected[k] for k in expected)
+
+    dedup, dup = etl.dedup_by_case_key(records)
+    assert dup == len(records) - len(expected)
+    assert [r["row"] for r in dedup] == [expected[k]["row"] for k in sorted(expected)]
+
+
+def test_compute_report_agi_das_uses_first_flow_per_case():
+    etl = _load_etl_module()
+
+    def flow(code, case_no, fc):
+        return etl.FlowRow(code, case_no, fc, None, None, None, 0, False, False, None, None, None, None, False)
+
+    cases = [
+        etl.CaseRow("H-1", "1", final_location="AGI"),  # flow 2 -> violation
+        etl.CaseRow("H-1", "2", final_location="das"),  # first flow 3 wins over later 1
+        etl.CaseRow("H-2", "1", final_location="DAS"),  # no flow -> 0 -> violation
+        etl.CaseRow("H-3", "1", final_location="MIR"),
+    ]
+    flows = [flow("H-1", "2", 3), flow("H-1", "1", 2), flow("H-1", "2", 1), flow("H-3", "1", 0)]
+    stats = {"all_rows": 4, "wh_rows": 0, "wh_matched": 0, "wh_unmatched": 0}
+    report = etl.compute_report(
+        merge_stats=stats, all_invalid=0, all_unique=4, wh_invalid=0, wh_unique=0,
+        merged_rows=4, dedup_rows=4, dup_cnt=0, shipments=[], cases=cases, flows=flows,
+        events=[], wh_cols=[], site_cols=[], customs_hvdc_keys=0,
+    )
+    assert report["agi_das_violation_cnt"] == 2
+    assert report["flows_missing_case_fk"] == 0
+    assert report["ssot_cases_minus_all_unique"] == 0
+
+
+def _legacy_derive_out(etl, events, locations):
+    out = []
+    by_case = {}
+    for e in events:
+        by_case.setdefault((e.hvdc_code, e.case_no), []).append(e)
+    for (code, case_no), evs in by_case.items():
+        evs_sorted = sorted(evs, key=lambda x: x.event_time_iso)
+        for i, e in enumerate(evs_sorted):
+            if e.event_type not in ("WH_IN", "MOSB_IN"):
+                continue
+            next_time = None
+            for e2 in evs_sorted[i + 1:]:
+                if e2.event_time_iso <= e.event_time_iso:
+                    continue
+                if e2.location_code != e.location_code or e2.event_type == "SITE_ARRIVAL":
+                    next_time = e2.event_time_iso
+                    break
+            if next_time and e.location_code in locations:
+                etype = "WH_OUT_DERIVED" if e.event_type == "WH_IN" else "MOSB_OUT_DERIVED"
+                out.append((code, case_no, etype, next_time, e.location_code, e.source_field))
+    return out
+
+
+def test_derive_out_events_sweep_matches_forward_scan():
+    import random
+
+    etl = _load_etl_module()
+    rnd = random.Random(20)
+    codes = ["DSV_INDOOR", "DSV_OUTDOOR", "MOSB", "MIR_SITE", "EDAS"]
+    locations = {c: etl.LocationRow(i, c, c, "X") for i, c in enumerate(codes[:-1])}
+    types = ["WH_IN", "WH_IN", "MOSB_IN", "YARD_SHIFT", "SITE_ARRIVAL", "CUSTOMS_START"]
+    base = 1_706_745_600_000
+    events = []
+    for n in range(300):
+        case = (f"H-{n % 60}", str(n % 2))
+        for _ in range(rnd.randrange(1, 12)):
+            if rnd.random() < 0.2:  # date-only source (customs), no raw epoch
+                iso = etl._date_str_to_iso(f"2024-02-{rnd.randrange(1, 6):02d}")
+                raw = None
+            else:
+                raw = base + rnd.randrange(5) * 86_400_000 + rnd.choice([0, 0, 1, 3_600_000])
+                iso = etl._epoch_ms_to_iso(raw)
+            loc = rnd.choice(codes)
+            events.append(etl.EventRecord(*case, rnd.choice(types), iso, 0, loc, loc, "src", raw))
+
+    got = [(e.hvdc_code, e.case_no, e.event_type, e.event_time_iso, e.location_code, e.source_field)
+           for e in etl.derive_out_events(events, locations)]
+    assert got == _legacy_derive_out(etl, events, locations)
+    assert got
+
+
+def _legacy_flow_rows(etl, records, wh_cols, site_cols, customs_by_hvdc):
+    """build_flows_option_c before the column-wise rewrite (iterrows + to_dict per row)."""
+    import numpy as np
+    import pandas as pd
+
+    df = pd.DataFrame(records)
+    status = df.get("Status_Current")
+    status = status.astype(str).str.lower() if status is not None else pd.Series("", index=df.index)
+    ata = pd.to_numeric(df["ETA/ATA"], errors="coerce")
+    has_any = pd.Series(False, index=df.index)
+    for c in wh_cols + site_cols:
+        if c in df.columns:
+            has_any = has_any | pd.to_numeric(df[c], errors="coerce").notna()
+    df["ATA"] = ata.where(~status.str.contains("pre arrival", na=False) | has_any, np.nan)
+    from flow_code_calculator import calculate_flow_code_v35
+
+    calc = calculate_flow_code_v35(df, warehouse_columns=wh_cols, site_columns=site_cols)
+
+    def notna(c):
+        return pd.to_numeric(calc[c], errors="coerce").notna() if c in calc.columns else pd.Series(False, index=calc.index)
+
+    wh_cnt = sum(notna(c).astype(int) for c in wh_cols if c != "MOSB")
+    has_mosb = notna("MOSB")
+    has_site = pd.Series(False, index=calc.index)
+    for c in site_cols:
+        has_site = has_site | notna(c)
+    flow_source = pd.to_numeric(calc["_FLOW_CODE_SOURCE"], errors="coerce")
+
+    out = []
+    for i, row in calc.iterrows():
+        code, case_key = etl._extract_ids(row.to_dict())
+        fc = int(row.get("FLOW_CODE") or 0)
+        src = int(flow_source.iloc[i]) if pd.notna(flow_source.iloc[i]) else None
+        reason = None
+        if row.get("FLOW_OVERRIDE_REASON") not in (None, "", np.nan):
+            reason = str(row.get("FLOW_OVERRIDE_REASON"))
+        if src is not None and src != fc and not reason:
+            reason = "FLOW_RECALC_MISMATCH"
+        cjoin = customs_by_hvdc.get(code, {})
+        out.append(etl.FlowRow(
+            code, case_key, fc, src, int(row.get("FLOW_CODE_ORIG")), reason, int(wh_cnt.iloc[i]),
+            bool(has_mosb.iloc[i]), bool(has_site.iloc[i]),
+            etl._as_str_or_none(cjoin.get("Custom Code") or cjoin.get("Customs Code")),
+            etl._date_str_to_iso(str(cjoin["Attestation Date"])) if cjoin.get("Attestation Date") else None,
+            etl._date_str_to_iso(str(cjoin["Customs Close"])) if cjoin.get("Customs Close") else None,
+            etl._as_str_or_none(row.get("Status_Current") or row.get("Status_Storage") or row.get("Status_Location")),
+            fc == 5,
+        ))
+    out.sort(key=lambda x: (x.hvdc_code, x.case_no))
+    return out
+
+
+def test_build_flows_matches_row_wise_flows():
+    import random
+
+    etl = _load_etl_module()
+    rnd = random.Random(21)
+    base = 1_706_745_600_000
+    wh_cols, site_cols = ["DSV Indoor", "DSV Outdoor", "MOSB"], ["MIR", "SHU", "DAS", "AGI"]
+    records = []
+    for i in range(300):
+        r = {
+            "HVDC CODE": f"HVDC-ADOPT-SCT-{i // 2:04d}",
+            "Case No.": str(i % 2 + 1),
+            "Status_Current": rnd.choice(["Pre Arrival", "site", "warehouse", ""]),
+            "Status_Storage": rnd.choice(["", "indoor"]),
+            "Status_Location": "yard",
+            "Final_Location": rnd.choice(["AGI", "DAS", "MIR", "", None]),
+            "ETA/ATA": base,
+            "_FLOW_CODE_SOURCE": rnd.choice([None, 0, 1, 2, 3, 4, 5, "3"]),
+        }
+        for c in wh_cols + site_cols:
+            r[c] = rnd.choice([None, base + rnd.randrange(10**9), "2024-03-01"])
+        if i % 3:  # raw JSON columns the flow frame does not need, sparse site keys
+            r["Description"], r["Qty"] = f"PKG {i}", i
+            del r["SHU"]
+        records.append(r)
+    wh_cols = wh_cols + ["DSV MZD"]  # listed but absent from every record
+    customs = {
+        f"HVDC-ADOPT-SCT-{k:04d}": {
+            "Custom Code": rnd.choice([None, "47150", 47150]),
+            "Attestation Date": rnd.choice([None, "", "2023-11-29"]),
+            "Customs Close": rnd.choice([None, "2023-12-02", "bad date"]),
+        }
+        for k in range(0, 150, 3)
+    }
+    expected = _legacy_flow_rows(etl, [dict(r) for r in records], wh_cols, site_cols, customs)
+    got = etl.build_flows_option_c(records, wh_cols=wh_cols, site_cols=site_cols, customs_by_hvdc=customs)
+    assert [asdict(f) for f in got] == [asdict(f) for f in expected]
+    assert {f.override_reason for f in got} >= {None, "FLOW_RECALC_MISMATCH", "AGI/DAS requires MOSB leg"}
+
+
+def test_build_flows_with_flow_state_reuses_unchanged_cases(tmp_path):
+    etl = _load_etl_module()
+    base = 1_706_745_600_000
+    wh_cols, site_cols = ["DSV Indoor", "MOSB"], ["MIR", "AGI"]
+    records = [
+        {"HVDC CODE": f"HVDC-ADOPT-SCT-{i:04d}", "Case No.": "1", "Final_Location": "AGI" if i % 2 else "MIR",
+         "ETA/ATA": base, "_FLOW_CODE_SOURCE": 2, "DSV Indoor": base if i % 3 else None,
+         "MOSB": None, "MIR": base if i % 4 else None, "AGI": None}
+        for i in range(12)
+    ]
+    expected = etl.build_flows_option_c(records, wh_cols, site_cols, {})
+
+    path = tmp_path / "flow_state.json"
+    state = etl.load_flow_state(path)
+    assert etl.build_flows_option_c(records, wh_cols, site_cols, {}, flow_state=state) == expected
+    assert (state.recomputed, state.reused) == (12, 0)
+    etl.save_flow_state(path, state)
+
+    records[5]["MOSB"] = base
+    state = etl.load_flow_state(path)
+    got = etl.build_flows_option_c(records, wh_cols, site_cols, {}, flow_state=state)
+    assert got == etl.build_flows_option_c(records, wh_cols, site_cols, {})
+    assert (state.recomputed, state.reused) == (1, 11)
+
+
+def test_flow_state_keys_do_not_collide_on_separator(tmp_path):
+    etl = _load_etl_module()
+    base = 1_706_745_600_000
+    wh_cols, site_cols = ["DSV Indoor", "MOSB"], ["MIR", "AGI"]
+    records = [
+        {"HVDC CODE": "HVDC-ADOPT-SCT-0001|7", "Case No.": "1", "Final_Location": "MIR",
+         "DSV Indoor": base, "MOSB": None, "MIR": base, "AGI": None},
+        {"HVDC CODE": "HVDC-ADOPT-SCT-0001", "Case No.": "7|1", "Final_Location": "MIR",
+         "DSV Indoor": None, "MOSB": base, "MIR": base, "AGI": None},
+    ]
+    assert [etl._record_ids(r) for r in records] == [("HVDC-ADOPT-SCT-0001|7", "1"), ("HVDC-ADOPT-SCT-0001", "7|1")]
+
+    path = tmp_path / "flow_state.json"
+    state = etl.load_flow_state(path)
+    etl.build_flows_option_c(records, wh_cols, site_cols, {}, flow_state=state)
+    etl.save_flow_state(path, state)
+    assert len(state.current["keys"]) == 2
+    assert not list(tmp_path.glob("*.tmp"))
+
+    state = etl.load_flow_state(path)
+    got = etl.build_flows_option_c(records, wh_cols, site_cols, {}, flow_state=state)
+    assert got == etl.build_flows_option_c(records, wh_cols, site_cols, {})
+    assert (state.recomputed, state.reused) == (0, 2)
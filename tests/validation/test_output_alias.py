@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import importlib.util
+import sys
+from pathlib import Path
+
+import pytest
+
+
+def _load_alias_module():
+    repo_root = Path(__file__).resolve().parents[2]
+    module_path = repo_root / "scripts" / "etl" / "output_alias.py"
+    spec = importlib.util.spec_from_file_location("etl_output_alias", module_path)
+    if spec is None or spec.loader is None:
+        raise RuntimeError(f"Unable to load module: {module_path}")
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.mark.parametrize("mode", ["link", "copy", "tee"])
+def test_open_output_aliases_are_byte_identical(tmp_path: Path, mode: str):
+    alias_mod = _load_alias_module()
+    src = tmp_path / "shipments_status.csv"
+    alias = tmp_path / "compat" / "shipments.csv"
+    alias.parent.mkdir()
+    alias.write_text("stale", encoding="utf-8")
+
+    for payload in ("a,b\r\n1,2\r\n", "a,b\r\n3,4\r\n"):
+        with alias_mod.open_output(src, [alias], mode=mode) as f:
+            f.write(payload)
+        assert src.read_bytes() == alias.read_bytes() == payload.encode("utf-8")
+    assert not list(alias.parent.glob(".*alias-tmp"))
+
+
+def test_open_output_rejects_unknown_mode(tmp_path: Path):
+    alias_mod = _load_alias_module()
+    with pytest.raises(ValueError):
+        with alias_mod.open_output(tmp_path / "x.csv", [tmp_path / "y.csv"], mode="symlink"):
+            pass
+
+
+def test_open_output_failure_keeps_previous_linked_alias(tmp_path: Path):
+    alias_mod = _load_alias_module()
+    src = tmp_path / "events.csv"
+    alias = tmp_path / "events_case.csv"
+    with alias_mod.open_output(src, [alias], mode="link") as f:
+        f.write("old\n")
+    assert alias.stat().st_ino == src.stat().st_ino
+
+    with pytest.raises(RuntimeError):
+        with alias_mod.open_output(src, [alias], mode="link") as f:
+            f.write("new, partial")
+            assert alias.read_text(encoding="utf-8") == "old\n"
+            raise RuntimeError("writer failed")
+    assert src.read_text(encoding="utf-8") == alias.read_text(encoding="utf-8") == "old\n"
+    assert not list(tmp_path.glob(".*-tmp"))
+
+    with alias_mod.open_output(src, [alias], mode="link") as f:
+        f.write("new\n")
+    assert alias.read_text(encoding="utf-8") == "new\n"
+    assert alias.stat().st_ino == src.stat().st_ino
@@ -0,0 +1,367 @@
+from __future__ import annotations
+
+import importlib.util
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+
+def _load_etl_module():
+    repo_root = Path(__file__).resolve().parents[2]
+    etl_path = repo_root / "scripts" / "etl" / "status_etl.py"
+    sys.path.insert(0, str(etl_path.parent))
+    spec = importlib.util.spec_from_file_location("etl_status", etl_path)
+    if spec is None or spec.loader is None:
+        raise RuntimeError(f"Unable to load ETL module: {etl_path}")
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_schema_resolver_matches_detect_key_per_shape():
+    etl = _load_etl_module()
+    records = [
+        {"No": "1", "SCT SHIP NO.": "HVDC-A-0001", "VENDOR": "Hitachi", "PKG": "3"},
+        {"S No": "2", "hvdc_code": "HVDC-A-0002", "Supplier": "Siemens", "CBM": "1,290.89"},
+        {"no.": "3", "SCT  SHIP NO": "HVDC-A-0003", "VESSEL NAME/\nFLIGHT No.": "BBC ASIA"},
+    ]
+    for r in records:
+        keys = etl.STATUS_RESOLVER.resolve(r)
+        for name, candidates in etl.STATUS_FIELDS.items():
+            assert keys[name] == etl.detect_key(r, candidates), name
+
+
+def test_schema_resolver_reuses_cached_shape():
+    etl = _load_etl_module()
+    resolver = etl.SchemaResolver({"hvdc_code": etl.STATUS_HVDC_KEYS})
+    a = resolver.resolve({"SCT SHIP NO.": "HVDC-A-0001", "No": "1"})
+    b = resolver.resolve({"SCT SHIP NO.": "HVDC-A-0002", "No": "2"})
+    assert a is b
+    assert a["hvdc_code"] == "SCT SHIP NO."
+    assert resolver.values({"No": "9"}) == {"hvdc_code": None}
+
+
+def test_iter_json_records_matches_full_load(tmp_path: Path):
+    etl = _load_etl_module()
+    records = [
+        {"HVDC CODE": f"HVDC-A-{i:04d}", "note": "a], {b}", "ms": 1739577600000 + i, "nested": {"x": [1, 2]}}
+        for i in range(50)
+    ]
+    cases = {
+        "array.json": json.dumps(records, indent=2),
+        "compact.json": json.dumps(records),
+        "wrapped.json": json.dumps({"records": records}),
+        "lines.jsonl": "\n".join(json.dumps(r) for r in records) + "\n\n",
+    }
+    for name, text in cases.items():
+        p = tmp_path / name
+        p.write_text("\n" + text, encoding="utf-8")
+        expected = etl.to_records(etl.load_json_any(p))
+        for chunk_size in (7, 64, 1 << 20):
+            assert list(etl.iter_json_records(p, chunk_size=chunk_size)) == expected, (name, chunk_size)
+
+
+def test_location_mapper_index_matches_linear_scan(tmp_path: Path):
+    import difflib
+
+    etl = _load_etl_module()
+    names = ["DSV Indoor", "DSV Outdoor", "DSV Al Markaz", "Mina Zayed Port", "MOSB Yard",
+             "Khalifa Port Laydown", "AB", "Hauler DG Storage", "Jetty"]
+    loc_csv = tmp_path / "locations.csv"
+    lines = ["location_code,name,hvdc_node"] + [f"LOC_{i},{n}," for i, n in enumerate(names)]
+    loc_csv.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    mapper = etl.LocationMapper(loc_csv)
+
+    texts = ["DSV Indoor Warehouse", "indoor", "dsv outdor", "Mina Zayd Port", "mosb", "ab",
+             "Khalifa Port Laydwn Area", "hauler dg storag", "jety", "unknown place", "d", "port"]
+    for text in texts:
+        k = etl._norm_loc_text(text)
+        best_code, best_len = None, 0
+        for nn, code in mapper._name_candidates:
+            if nn and (nn in k or k in nn) and len(nn) > best_len:
+                best_code, best_len = code, len(nn)
+        assert mapper._match_substring(k) == (best_code, best_len), text
+
+        best_code, best_ratio = None, 0.0
+        for nn, code in mapper._name_candidates:
+            r = difflib.SequenceMatcher(None, k, nn).ratio()
+            if r > best_ratio:
+                best_code, best_ratio = code, r
+        if best_ratio < 0.85:
+            best_code = None
+        got_code, got_ratio = mapper._match_similarity(k)
+        assert got_code == best_code, text
+        if best_code:
+            assert got_ratio == best_ratio, text
+
+
+def test_location_mapper_memo_cache_counts_and_evicts(tmp_path: Path):
+    etl = _load_etl_module()
+    loc_csv = tmp_path / "locations.csv"
+    loc_csv.write_text("location_code,name,hvdc_node\nLOC_A,Mina Zayed Port,\nLOC_B,MOSB Yard,\n", encoding="utf-8")
+    mapper = etl.LocationMapper(loc_csv, cache_size=2)
+    uncached = etl.LocationMapper(loc_csv, cache_size=0)
+
+    texts = ["Mina Zayd Port", "mina  zayd port", "MOSB", "Mina Zayd Port", "unknown", "MOSB"]
+    assert [mapper.map(t) for t in texts] == [uncached.map(t) for t in texts]
+
+    info = mapper.cache_info()
+    assert (info["hits"], info["misses"], info["evictions"]) == (2, 4, 2)
+    assert info["size"] == 2
+    assert uncached.cache_info()["size"] == 0
+
+
+def test_wh_cell_epoch_days_matches_scalar_parsers():
+    etl = _load_etl_module()
+    values = [
+        None, True, "", " 2024-03-02 ", "2024-02-29", "2023-02-29", "0000-01-01", "2024-1-01",
+        1714914532082, 1714914532082.0, "1714914532082", "1714914532082.0", "1,714,914,532,082",
+        "ref 1714914532082", 99999999999, -1714914532082, 1e20, 2.5, "nan", "٢٠٢٤-٠١-٠١",
+        253402300799999, 253402300800000, "Le Havre", "2024-01-01T00:00", "x" * 40 + "1714914532082",
+    ]
+    got = etl.wh_cell_epoch_days(values).tolist()
+    expected = []
+    for v in values:
+        d = etl.parse_date_iso_maybe(v) or etl.parse_epoch_ms_date(v)
+        expected.append(d.toordinal() - etl._EPOCH_ORDINAL if d else etl.NO_DAY)
+    assert got == expected
+
+
+def test_extract_location_days_columnar_matches_row_extraction():
+    etl = _load_etl_module()
+    rows = [
+        {"HVDC CODE": "HVDC-A-1", "DSV Indoor": "2024-03-02", "MIR": 1714914532082, "Vendor": "2024-01-01"},
+        {"HVDC CODE": "HVDC-A-2", "DSV Indoor": None, "MIR": "2024-05-01", "Vendor": "x"},
+        {"MIR": "2024-06-01", "HVDC CODE": "HVDC-A-3", "MOSB": "2024-05-20", " ": "2024-01-01"},
+        {"HVDC CODE": "HVDC-A-4"},
+    ]
+    locs, row_idx, loc_idx, days = etl.extract_location_days_columnar(rows)
+    got = [(int(r), locs[l], etl.epoch_day_to_date(d)) for r, l, d in zip(row_idx, loc_idx, days)]
+    expected = [(i, loc, d) for i, row in enumerate(rows) for loc, d in etl.extract_location_dates_from_wh_row(row)]
+    assert got == expected
+
+
+
+def test_wh_key_location_cache_is_bounded(monkeypatch):
+    etl = _load_etl_module()
+    monkeypatch.setattr(etl, "_WH_KEY_LOCATION_MAX", 8)
+    rows = [{"HVDC CODE": f"HVDC-A-{i}", f"WH {i}": "2024-03-02", f"WH {i + 1}": "2024-03-03"} for i in range(40)]
+    locs, row_idx, loc_idx, days = etl.extract_location_days_columnar(rows)
+    assert len(etl._WH_KEY_LOCATION) <= 8
+    got = [(int(r), locs[l], etl.epoch_day_to_date(d)) for r, l, d in zip(row_idx, loc_idx, days)]
+    assert got == [(i, loc, d) for i, row in enumerate(rows) for loc, d in etl.extract_location_dates_from_wh_row(row)]
+
+def test_wh_overlay_agg_merge_matches_single_pass():
+    etl = _load_etl_module()
+    rows = [
+        {"HVDC CODE": f"HVDC-A-{i % 5}", "DSV Indoor": f"2024-03-{1 + i % 7:02d}", "MIR": f"2024-03-{1 + i % 3:02d}"}
+        for i in range(40)
+    ] + [{"No": "1"}, {"HVDC CODE": "HVDC-A-9", "MOSB": 1714914532082}]
+
+    def snapshot(agg):
+        return (
+            [(k, a.min_day, a.max_day, a.count) for k, a in agg.groups.items()],
+            {c: (x.day, x.location) for c, x in agg.last.items()},
+            agg.codes, agg.rows_in, agg.rows_skipped,
+        )
+
+    single = etl.WhOverlayAgg()
+    single.add_rows(rows)
+    merged = etl.WhOverlayAgg()
+    for chunk in etl.iter_chunks(rows, 9):
+        shard = etl.WhOverlayAgg()
+        shard.add_rows(chunk)
+        merged.merge(shard)
+    assert snapshot(merged) == snapshot(single)
+    assert single.rows_skipped == 1
+
+
+def test_build_sharded_matches_single_process(tmp_path: Path):
+    etl = _load_etl_module()
+    status = [{"SCT SHIP NO.": f"HVDC-A-{i:03d}", "No": i, "VENDOR": "Hitachi"} for i in range(30)]
+    status.append({"SCT SHIP NO.": "HVDC-A-005", "No": 99})
+    wh = [
+        {"HVDC CODE": f"HVDC-A-{i % 40:03d}", "DSV Indoor": f"2024-03-{1 + i % 9:02d}", "MOSB": f"2024-03-{1 + i % 4:02d}"}
+        for i in range(120)
+    ]
+    status_path = tmp_path / "status.json"
+    wh_path = tmp_path / "wh.json"
+    status_path.write_text(json.dumps(status), encoding="utf-8")
+    wh_path.write_text(json.dumps(wh), encoding="utf-8")
+
+    single = etl.build_shard(status_path, wh_path, etl.LocationMapper(None), chunk_rows=25)
+    sharded = etl.build_sharded(status_path, wh_path, 3, 25, locations_csv=None, alias_json=None, cache_size=0)
+
+    assert [sh.hvdc_code for _, sh in sharded.shipments] == [sh.hvdc_code for _, sh in single.shipments]
+    assert [sh.warehouse_last_location for _, sh in sharded.shipments] == [
+        sh.warehouse_last_location for _, sh in single.shipments
+    ]
+    assert [ev.event_id for ev in sharded.events] == [ev.event_id for ev in single.events]
+    assert (sharded.status_in, sharded.status_dups, sharded.wh_in) == (31, 1, 120)
+    assert sharded.wh_codes - sharded.status_codes == single.wh_codes - single.status_codes
+
+
+def test_csv_rows_stream_from_shipments():
+    etl = _load_etl_module()
+    sh = etl.ShipmentOut(
+        hvdc_code="HVDC-A-1", status_no=1, vendor=None, band=None, incoterms=None, currency=None, pol=None,
+        pod=None, bl_awb=None, vessel=None, ship_mode=None, pkg=None, qty_cntr=None, cbm=1.5, gwt_kg=None,
+        etd=None, eta=None, ata=None, warehouse_flag=True, warehouse_last_location="MOSB",
+        warehouse_last_location_code=None, warehouse_last_date=None, raw={"No": 1},
+    )
+    rows = map(etl.shipment_csv_row, iter([sh]))
+    row = next(rows)
+    assert list(row) == etl.SHIP_HEADERS
+    assert (row["cbm"], row["warehouse_flag"], row["raw"]) == ("1.5000", "true", '{"No": 1}')
+
+
+def test_raw_json_cache_serializes_each_record_once():
+    etl = _load_etl_module()
+    cache = etl.RawJsonCache()
+    raw = {"SCT SHIP NO.": "HVDC-A-1", "VENDOR": "히타치", "CBM": 1.5}
+    first = cache.dumps(raw)
+    assert first == json.dumps(raw, ensure_ascii=False)
+    assert cache.dumps(raw) is first
+    assert cache.dumps(dict(raw)) is not first
+
+
+def test_turtle_writer_matches_joined_lines_and_gzip(tmp_path: Path):
+    import gzip
+
+    etl = _load_etl_module()
+    blocks = [["@prefix hvdc: <https://example.com/hvdc#> .", ""], [], ["hvdc:A a hvdc:Shipment .", ""]]
+    expected = "\n".join(line for block in blocks for line in block)
+    for name in ("out.ttl", "out.ttl.gz"):
+        with etl.TurtleWriter(tmp_path / name) as out:
+            for block in blocks:
+                out.write_lines(block)
+    assert (tmp_path / "out.ttl").read_text(encoding="utf-8") == expected
+    assert gzip.decompress((tmp_path / "out.ttl.gz").read_bytes()).decode("utf-8") == expected
+
+
+def test_incremental_run_matches_full_run_and_emits_delta(tmp_path: Path, monkeypatch):
+    import csv
+
+    etl = _load_etl_module()
+    status = [{"SCT SHIP NO.": f"HVDC-A-{i:03d}", "No": i, "VENDOR": "Hitachi"} for i in range(20)]
+    wh = [
+        {"HVDC CODE": f"HVDC-A-{i % 24:03d}", "DSV Indoor": f"2024-03-{1 + i % 9:02d}", "MOSB": f"2024-04-{1 + i % 5:02d}"}
+        for i in range(60)
+    ]
+    status_path = tmp_path / "status.json"
+    wh_path = tmp_path / "wh.json"
+
+    def run(outdir: Path, *extra: str) -> None:
+        status_path.write_text(json.dumps(status), encoding="utf-8")
+        wh_path.write_text(json.dumps(wh), encoding="utf-8")
+        argv = ["status_etl.py", "--status", str(status_path), "--warehouse", str(wh_path), "--outdir", str(outdir), *extra]
+        monkeypatch.setattr(sys, "argv", argv)
+        etl.main()
+
+    def read(path: Path):
+        with path.open(encoding="utf-8", newline="") as f:
+            return list(csv.DictReader(f))
+
+    inc = tmp_path / "inc"
+    run(inc, "--incremental")
+    assert len(read(inc / "supabase" / "delta" / "shipments_status_upsert.csv")) == 20
+
+    status[3]["VENDOR"] = "Siemens"
+    del status[7]
+    status.insert(0, {"SCT SHIP NO.": "HVDC-A-100", "No": 100})
+    wh[5]["MOSB"] = "2024-05-30"  # HVDC-A-005
+    run(inc, "--incremental")
+    full = tmp_path / "full"
+    run(full)
+
+    for rel in ("supabase/shipments_status.csv", "supabase/events_status.csv", "ontology/hvdc_ops_status.ttl", "ontology/hvdc.ttl"):
+        assert (inc / rel).read_bytes() == (full / rel).read_bytes(), rel
+    delta = inc / "supabase" / "delta"
+    assert [r["hvdc_code"] for r in read(delta / "shipments_status_upsert.csv")] == ["HVDC-A-100", "HVDC-A-003", "HVDC-A-005"]
+    # HVDC-A-007 lost its Status record but keeps its WH rows (orphan): rebuilt, events kept
+    assert {r["hvdc_code"] for r in read(delta / "events_status_upsert.csv")} == {"HVDC-A-003", "HVDC-A-005", "HVDC-A-007"}
+    assert [r["hvdc_code"] for r in read(delta / "shipments_status_delete.csv")] == ["HVDC-A-007"]
+    assert {r["hvdc_code"] for r in read(delta / "events_status_delete.csv")} == {"HVDC-A-005"}
+    state = json.loads((inc / "state" / "status_state.json").read_text(encoding="utf-8"))
+    assert "HVDC-A-007" in state["codes"] and "HVDC-A-100" in state["codes"]
+
+
+def test_iter_json_records_reports_syntax_error_without_buffering(tmp_path: Path):
+    import pytest
+
+    etl = _load_etl_module()
+    text = json.dumps([{"k": i, "v": "x" * 50} for i in range(2000)])
+    bad = text.index('{"k": 5,') + len('{"k": 5, "v": ')
+    p = tmp_path / "bad.json"
+    p.write_text("\n\n" + text[:bad] + "oops" + text[bad + 52:], encoding="utf-8")
+
+    reads = []
+    real_open = Path.open
+
+    def counting_open(self, *a, **kw):
+        f = real_open(self, *a, **kw)
+        read = f.read
+        f.read = lambda n=-1: reads.append(n) or read(n)
+        return f
+
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(Path, "open", counting_open)
+        with pytest.raises(ValueError, match=f"char={bad + 2} "):
+            list(etl.iter_json_records(p, chunk_size=64))
+    assert reads and sum(reads) < 64 * 20  # stopped near the bad record, not at EOF (~130 KB)
+
+
+def test_split_record_ranges_matches_iter_json_records(tmp_path: Path, monkeypatch):
+    etl = _load_etl_module()
+    monkeypatch.setattr(etl, "SPLIT_SCAN_BYTES", 3)  # 앞 공백/chunk 경계에서 문자열/역슬래시/깊이 이월
+    records = [
+        {
+            "HVDC CODE": f"HVDC-A-{i:03d}",
+            "note": ["a, b", "x\\", 'q"],[{', "한글, 위치"][i % 4],
+            "nested": {"list": [i, [i + 1, {"k": "}]"}]], "s": "\\\"" * (i % 3)},
+        }
+        for i in range(60)
+    ]
+    array_path = tmp_path / "wh.json"
+    array_path.write_text("\n  " + json.dumps(records, ensure_ascii=False), encoding="utf-8")
+    jsonl_path = tmp_path / "wh.jsonl"
+    jsonl_path.write_text(
+        "".join(json.dumps(r, ensure_ascii=False) + ("\n\n" if i % 7 == 6 else "\r\n") for i, r in enumerate(records)),
+        encoding="utf-8",
+    )
+    wrapped_path = tmp_path / "wrapped.json"
+    wrapped_path.write_text(json.dumps({"data": records}), encoding="utf-8")
+
+    for path, kind in ((array_path, "array"), (jsonl_path, "jsonl"), (wrapped_path, "whole")):
+        for n in (1, 2, 5, 16):
+            ranges = etl.split_record_ranges(path, n)
+            assert 1 <= len(ranges) <= n
+            assert {rr.kind for rr in ranges} == {kind if n > 1 else "whole"}
+            assert [rr.last for rr in ranges] == [False] * (len(ranges) - 1) + [True]
+            got = [r for rr in ranges for r in etl.iter_range_records(rr)]
+            assert got == records
+        if kind != "whole":
+            assert len(etl.split_record_ranges(path, 5)) == 5
+
+
+def test_split_record_ranges_reports_file_offsets(tmp_path: Path):
+    etl = _load_etl_module()
+    good = [{"HVDC CODE": f"HVDC-A-{i}", "loc": "창고"} for i in range(40)]
+    text = json.dumps(good, ensure_ascii=False)
+    path = tmp_path / "wh.json"
+    path.write_text(text[:-1] + ', {"HVDC CODE": "HVDC-B", "x": tru}]', encoding="utf-8")
+    with pytest.raises(ValueError) as whole:
+        list(etl.iter_json_records(path))
+    with pytest.raises(ValueError) as ranged:
+        for rr in etl.split_record_ranges(path, 4):
+            list(etl.iter_range_records(rr))
+    assert str(ranged.value) == str(whole.value)
+
+    lines = tmp_path / "wh.jsonl"
+    lines.write_text("".join(json.dumps(r) + "\n" for r in good) + '{"HVDC CODE": \n', encoding="utf-8")
+    with pytest.raises(ValueError, match="line=41 "):
+        for rr in etl.split_record_ranges(lines, 4):
+            list(etl.iter_range_records(rr))